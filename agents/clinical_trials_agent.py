@@ -1,47 +1,45 @@
-import json
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, ClinicalTrialsData, PhaseDistribution
+from telemetry import instrument
+from datastore import get_store, get_drug_index
+from agents.cube import read_cube
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "clinical_trials_data.json"
+def load_clinical_data() -> Dict[str, Any]:
+    return get_store().get("clinical_trials")
 
 
-def load_clinical_data() -> Dict[str, Any]:
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+def clinical_trials_data(drug_data: Dict[str, Any]) -> ClinicalTrialsData:
+    trials = drug_data.get("trials", {})
+    
+    return ClinicalTrialsData(
+        total_trials=drug_data.get("total_trials", 0),
+        phase_distribution=PhaseDistribution(
+            phase_1=trials.get("phase_1", 0),
+            phase_2=trials.get("phase_2", 0),
+            phase_3=trials.get("phase_3", 0),
+            phase_4=trials.get("phase_4", 0)
+        ),
+        completion_rate=drug_data.get("completion_rate", 0),
+        competitive_trials=drug_data.get("competitive_trials", 0)
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "clinical_trials")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
     
-    raw_data = load_clinical_data()
+    # Precomputed outputs when the cube is built, else every requested drug
+    # in one multi-key lookup
+    data = read_cube("clinical_trials", drug_names)
+    if data is None:
+        records = get_drug_index("clinical_trials").lookup_many(drug_names)
+        data = [clinical_trials_data(record) if record is not None else None for record in records]
     
-    drug_data = None
-    for drug in raw_data.get("drugs", []):
-        if drug.get("name", "").lower() == drug_name.lower():
-            drug_data = drug
-            break
-    
-    if not drug_data:
-        drug_data = raw_data["drugs"][0] if raw_data.get("drugs") else {}
-    
-    trials = drug_data.get("trials", {})
-    
-    output = AgentOutput(
-        agent="clinical_trials",
-        data={
-            "total_trials": drug_data.get("total_trials", 0),
-            "phase_distribution": {
-                "phase_1": trials.get("phase_1", 0),
-                "phase_2": trials.get("phase_2", 0),
-                "phase_3": trials.get("phase_3", 0),
-                "phase_4": trials.get("phase_4", 0)
-            },
-            "completion_rate": drug_data.get("completion_rate", 0),
-            "competitive_trials": drug_data.get("competitive_trials", 0)
-        }
+    return AgentResult.for_drugs(
+        "clinical_trials",
+        drug_names,
+        data,
+        not_found="No clinical trials data found for {drug}"
     )
-    
-    return output.model_dump()
@@ -0,0 +1,321 @@
+"""Precomputed agent outputs: the analytics cube.
+
+Every agent's output for every drug in the datasets, and for EXIM every
+region selection a query can name, is materialized ahead of time into one
+JSON file (``data/cube/cube.json``). Agents then answer with a keyed read of
+``(agent, drug, regions)``. A timeframe is a slice of the precomputed
+output: dated items (prescription years, patent expiries) are stored sorted
+by year together with their years, so any timeframe is two bisects rather
+than one stored cell per year range, whose count grows with the square of
+the number of years.
+
+The cube is registered with the DataStore like a dataset, so a rebuilt or
+updated file is picked up by running processes. It records the version of
+each dataset it was built from and is bypassed (agents compute from the
+datasets) while any of them differs.
+
+    python -m datastore cube rebuild
+    python -m datastore cube update "Drug X" ["Drug A" ...]
+    python -m datastore cube status
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from itertools import permutations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from agents.timeframe import in_timeframe, item_years
+from contracts.results import AGENT_DATA_TYPES, AgentData
+from datastore import DATA_CHECK_INTERVAL, DATA_DIR, DATASETS, get_drug_index, get_store, normalize_name
+from datastore.exim import ALL_REGIONS
+
+
+CUBE_PATH = Path(os.environ.get("MEDNEXA_CUBE_PATH", DATA_DIR / "cube" / "cube.json"))
+USE_CUBE = os.environ.get("MEDNEXA_CUBE", "1") != "0"
+
+# Bump when the file layout changes so old cubes are ignored
+CUBE_FORMAT = 1
+# Name the cube file is registered under in the DataStore
+CUBE_DATASET = "cube"
+
+# Selected regions, in query order, or None for every region
+RegionKey = Optional[Tuple[str, ...]]
+
+
+class CubeError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class CubeCell:
+    drug: str
+    data: AgentData
+    years: Tuple[int, ...] = ()
+
+
+class Cube:
+    """Agent outputs keyed by (agent, normalized drug name or alias,
+    region key). Only EXIM has a region axis; other agents' cells have the
+    region key None."""
+
+    __slots__ = (
+        "path", "format", "built_at", "sources", "regions", "region_keys", "cells", "nbytes",
+        "_checked_at", "_fresh",
+    )
+
+    def __init__(self, path: Path, payload: Dict[str, Any], nbytes: int = 0):
+        self.path = path
+        self.format = payload.get("format")
+        self.built_at = payload.get("built_at", 0.0)
+        self.sources = {name: tuple(version) for name, version in payload.get("sources", {}).items()}
+        self.regions = frozenset(payload.get("regions", ()))
+        self.region_keys = frozenset(_region_key_from_json(key) for key in payload.get("region_keys", ()))
+        self.nbytes = nbytes
+        self.cells: Dict[Tuple[str, str, RegionKey], CubeCell] = {}
+        for agent, rows in payload.get("agents", {}).items():
+            data_type = AGENT_DATA_TYPES[agent]
+            for row in rows:
+                for region_key, data in row["cells"]:
+                    value = data_type.from_dict(data)
+                    cell = CubeCell(row["drug"], value, item_years(agent, value))
+                    region = _region_key_from_json(region_key)
+                    for key in row["keys"]:
+                        self.cells[(agent, key, region)] = cell
+        self._checked_at = 0.0
+        self._fresh: Optional[bool] = None
+
+    def region_key(self, regions: Iterable[str]) -> RegionKey:
+        """Cell key for a region selection, resolved the way ``TradeStore``
+        resolves it: every region if none or 'Global' is given, else the
+        known ones in order."""
+        wanted = [normalize_name(region) for region in regions or ()]
+        if not wanted or ALL_REGIONS.intersection(wanted):
+            return None
+        return tuple(region for region in dict.fromkeys(wanted) if region in self.regions)
+
+    def read(
+        self,
+        agent: str,
+        drug_names: Sequence[str],
+        regions: Iterable[str] = (),
+        timeframe: Optional[str] = None,
+    ) -> Optional[List[Optional[AgentData]]]:
+        """Each drug's output (None if the agent has no data for it), or None
+        if the cube does not cover this region selection."""
+        region = self.region_key(regions) if agent == "exim" else None
+        if region is not None and region not in self.region_keys:
+            return None
+        cells = self.cells
+        results: List[Optional[AgentData]] = []
+        for name in drug_names:
+            cell = cells.get((agent, normalize_name(name or ""), region))
+            results.append(in_timeframe(agent, cell.data, timeframe, cell.years) if cell is not None else None)
+        return results
+
+    def stale(self, versions: Dict[str, Any]) -> List[str]:
+        """Datasets whose current version differs from the one the cube was
+        built from."""
+        return [name for name in DATASETS if self.sources.get(name) != versions.get(name)]
+
+    def fresh(self) -> bool:
+        """Whether the cube matches the loaded datasets, checked at most every
+        ``DATA_CHECK_INTERVAL`` seconds."""
+        now = time.monotonic()
+        if now - self._checked_at < DATA_CHECK_INTERVAL:
+            return bool(self._fresh)
+        if self.format != CUBE_FORMAT:
+            stale = ["format"]
+        else:
+            try:
+                stale = self.stale(get_store().versions())
+            except FileNotFoundError:
+                stale = ["missing data"]
+        if stale and self._fresh is not False:
+            print(f"[Cube] {self.path.name} is out of date for: {', '.join(stale)}; agents read the datasets "
+                  f"until it is rebuilt (python -m datastore cube rebuild)")
+        self._fresh = not stale
+        self._checked_at = now
+        return self._fresh
+
+
+def load_cube(path: Path) -> Cube:
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        cube = Cube(path, json.loads(raw), nbytes=len(raw))
+    except (ValueError, KeyError, TypeError) as e:
+        # An unreadable cube is kept as an empty, never-fresh one so the
+        # DataStore does not re-read it on every request
+        print(f"[Cube] Cannot read {path}: {e}")
+        return Cube(path, {"format": None})
+    print(f"[Cube] Loaded {path.name} ({len(cube.cells)} cells)")
+    return cube
+
+
+_registered = False
+_checked_at = 0.0
+_register_lock = threading.Lock()
+
+
+def get_cube() -> Optional[Cube]:
+    """The cube, if enabled, built and up to date with the datasets."""
+    global _registered, _checked_at
+    if not USE_CUBE:
+        return None
+    store = get_store()
+    if not _registered:
+        # Look for a cube file at most every check interval
+        now = time.monotonic()
+        if now - _checked_at < DATA_CHECK_INTERVAL:
+            return None
+        _checked_at = now
+        if not CUBE_PATH.exists():
+            return None
+        with _register_lock:
+            if not _registered:
+                store.register(CUBE_DATASET, CUBE_PATH, load_cube, sizer=lambda cube: cube.nbytes)
+                _registered = True
+    try:
+        cube = store.get(CUBE_DATASET)
+    except FileNotFoundError:
+        return None
+    return cube if cube.fresh() else None
+
+
+def read_cube(
+    agent: str,
+    drug_names: Sequence[str],
+    regions: Iterable[str] = (),
+    timeframe: Optional[str] = None,
+) -> Optional[List[Optional[AgentData]]]:
+    """``Cube.read`` on the current cube, or None if there is no usable
+    cube; agents then compute from the datasets."""
+    cube = get_cube()
+    return cube.read(agent, drug_names, regions, timeframe) if cube is not None else None
+
+
+def build_cube(path: Path = CUBE_PATH) -> Path:
+    """Materialize every agent's output for every drug into ``path``."""
+    payload = _materialize(None)
+    _write(path, payload)
+    return path
+
+
+def update_cube(drug_names: Sequence[str], path: Path = CUBE_PATH) -> List[str]:
+    """Re-materialize the given drugs (names or aliases) in the cube at
+    ``path`` after their records changed, and record the datasets' current
+    versions. Other drugs are taken to be unchanged. Returns the canonical
+    (normalized) names updated."""
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        raise CubeError(f"No cube at {path}; build one with python -m datastore cube rebuild") from None
+    if payload.get("format") != CUBE_FORMAT:
+        raise CubeError(f"{path} has format {payload.get('format')}, expected {CUBE_FORMAT}; rebuild it")
+
+    wanted = {normalize_name(name) for name in drug_names}
+    drugs = set(wanted)
+    # Aliases resolve to the drug that held them before and to the one holding them now
+    for rows in payload["agents"].values():
+        drugs.update(row["drug"] for row in rows if wanted.intersection(row["keys"]))
+    for agent in _index_agents():
+        names = get_drug_index(agent).names()
+        drugs.update(normalize_name(names[key]) for key in wanted if key in names)
+
+    fresh = _materialize(drugs)
+    for agent, rows in fresh["agents"].items():
+        kept = [row for row in payload["agents"].get(agent, []) if row["drug"] not in drugs]
+        payload["agents"][agent] = kept + rows
+    payload.update(built_at=fresh["built_at"], sources=fresh["sources"])
+    _write(path, payload)
+    return sorted(drugs)
+
+
+def _index_agents() -> Dict[str, Any]:
+    """Agents reading a JSON dataset -> builder of their data from a record."""
+    from agents import clinical_trials_agent, internal_knowledge_agent, iqvia_agent, patent_agent, web_intelligence_agent
+    return {
+        "iqvia": iqvia_agent.iqvia_data,
+        "patent": patent_agent.patent_data,
+        "clinical_trials": clinical_trials_agent.clinical_trials_data,
+        "internal_knowledge": internal_knowledge_agent.internal_knowledge_data,
+        "web_intelligence": web_intelligence_agent.web_intelligence_data,
+    }
+
+
+def _region_selections(dataset_regions: Iterable[str]) -> List[RegionKey]:
+    """Every region selection a parsed query can produce over this dataset:
+    each ordering of each subset of the named regions it has, and None."""
+    from agents.master_agent import REGIONS
+    named = [
+        region for region in dict.fromkeys(normalize_name(r) for r in REGIONS.values())
+        if region not in ALL_REGIONS and region in dataset_regions
+    ]
+    selections: List[RegionKey] = [None]
+    for size in range(1, len(named) + 1):
+        selections.extend(permutations(named, size))
+    return selections
+
+
+def _materialize(drugs: Optional[Set[str]]) -> Dict[str, Any]:
+    """Cube payload for ``drugs`` (normalized canonical names), or for every
+    drug if None."""
+    from agents.exim_agent import exim_data
+
+    store = get_store()
+    # Versions before reading: a dataset changing mid-build leaves the cube stale, not wrong
+    versions = store.versions()
+    agents: Dict[str, List[Dict[str, Any]]] = {}
+
+    for agent, build in _index_agents().items():
+        index = get_drug_index(agent)
+        names = index.names()
+        keys = [key for key, canonical in names.items() if drugs is None or normalize_name(canonical) in drugs]
+        rows: Dict[str, Dict[str, Any]] = {}
+        for key, record in zip(keys, index.lookup_many(keys)):
+            drug = normalize_name(names[key])
+            row = rows.get(drug)
+            if row is None:
+                row = rows[drug] = {"drug": drug, "keys": [], "cells": [[None, build(record).to_dict()]]}
+            row["keys"].append(key)
+        agents[agent] = list(rows.values())
+
+    trade = store.get("exim")
+    dataset_regions = [normalize_name(str(region)) for region in trade.regions.tolist()]
+    selections = _region_selections(dataset_regions)
+    exim_drugs = [str(drug) for drug in trade.drugs.tolist() if drugs is None or normalize_name(str(drug)) in drugs]
+    rows = {drug: {"drug": normalize_name(drug), "keys": [normalize_name(drug)], "cells": []} for drug in exim_drugs}
+    for selection in selections:
+        for drug, summary in zip(exim_drugs, trade.query_many(exim_drugs, selection or ())):
+            rows[drug]["cells"].append([list(selection) if selection else None, exim_data(summary).to_dict()])
+    agents["exim"] = list(rows.values())
+
+    return {
+        "format": CUBE_FORMAT,
+        "built_at": time.time(),
+        "sources": {name: list(versions[name]) for name in DATASETS},
+        "regions": dataset_regions,
+        "region_keys": [list(selection) if selection else None for selection in selections],
+        "agents": agents,
+    }
+
+
+def _write(path: Path, payload: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    # One dumps() call uses the C encoder; dump() to a file encodes in Python
+    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    with open(tmp_path, "w") as f:
+        f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _region_key_from_json(value: Optional[List[str]]) -> RegionKey:
+    return tuple(value) if value is not None else None
@@ -1,44 +1,41 @@
-import pandas as pd
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, EXIMData
+from telemetry import instrument
+from datastore import get_store, TradeStore, TradeSummary
+from agents.cube import read_cube
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "exim_data.csv"
+def load_exim_data() -> TradeStore:
+    return get_store().get("exim")
 
 
-def load_exim_data() -> pd.DataFrame:
-    return pd.read_csv(DATA_FILE)
+def exim_data(trade: TradeSummary) -> EXIMData:
+    return EXIMData(
+        import_volume_kg=trade.import_volume_kg,
+        export_volume_kg=trade.export_volume_kg,
+        top_exporters=tuple(trade.top_exporters),
+        tariff_impact_pct=round(trade.tariff_impact_pct, 4),
+        trade_barriers=tuple(trade.trade_barriers) if trade.trade_barriers else ("None identified",),
+        regions=tuple(trade.regions)
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "exim")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
-    
-    df = load_exim_data()
-    
-    drug_df = df[df["drug_name"].str.lower() == drug_name.lower()]
-    
-    if drug_df.empty:
-        drug_df = df[df["drug_name"] == "Drug X"]
-    
-    total_import = int(drug_df["import_kg"].sum())
-    total_export = int(drug_df["export_kg"].sum())
-    avg_tariff = float(drug_df["tariff_pct"].mean())
-    
-    barriers = drug_df[drug_df["barriers"] != "None"]["barriers"].tolist()
-    
-    top_exporters = ["India", "China"]
-    
-    output = AgentOutput(
-        agent="exim",
-        data={
-            "import_volume_kg": total_import,
-            "export_volume_kg": total_export,
-            "top_exporters": top_exporters,
-            "tariff_impact_pct": round(avg_tariff, 4),
-            "trade_barriers": barriers if barriers else ["None identified"]
-        }
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
+    regions = entities.get("regions", [])
+    
+    # Precomputed outputs when the cube covers these regions, else every
+    # requested drug in one vectorized pass over the trade matrices
+    data = read_cube("exim", drug_names, regions)
+    if data is None:
+        trades = load_exim_data().query_many(drug_names, regions)
+        data = [exim_data(trade) if trade is not None else None for trade in trades]
+    
+    return AgentResult.for_drugs(
+        "exim",
+        drug_names,
+        data,
+        not_found="No EXIM trade data found for {drug}"
     )
-    
-    return output.model_dump()
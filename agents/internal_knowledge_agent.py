@@ -1,40 +1,38 @@
-import json
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, InternalKnowledgeData
+from telemetry import instrument
+from datastore import get_store, get_drug_index
+from agents.cube import read_cube
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "internal_knowledge.json"
+def load_internal_data() -> Dict[str, Any]:
+    return get_store().get("internal_knowledge")
 
 
-def load_internal_data() -> Dict[str, Any]:
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+def internal_knowledge_data(drug_data: Dict[str, Any]) -> InternalKnowledgeData:
+    return InternalKnowledgeData(
+        rd_budget_usd=drug_data.get("rd_budget", 0),
+        manufacturing_capacity_units_per_year=drug_data.get("capacity_units", 0),
+        forecast_revenue_2025_usd=drug_data.get("forecast_2025", 0),
+        strategic_priority=drug_data.get("priority", "medium")
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "internal_knowledge")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
     
-    raw_data = load_internal_data()
+    # Precomputed outputs when the cube is built, else every requested drug
+    # in one multi-key lookup
+    data = read_cube("internal_knowledge", drug_names)
+    if data is None:
+        records = get_drug_index("internal_knowledge").lookup_many(drug_names)
+        data = [internal_knowledge_data(record) if record is not None else None for record in records]
     
-    drug_data = None
-    for drug in raw_data.get("drugs", []):
-        if drug.get("name", "").lower() == drug_name.lower():
-            drug_data = drug
-            break
-    
-    if not drug_data:
-        drug_data = raw_data["drugs"][0] if raw_data.get("drugs") else {}
-    
-    output = AgentOutput(
-        agent="internal_knowledge",
-        data={
-            "rd_budget_usd": drug_data.get("rd_budget", 0),
-            "manufacturing_capacity_units_per_year": drug_data.get("capacity_units", 0),
-            "forecast_revenue_2025_usd": drug_data.get("forecast_2025", 0),
-            "strategic_priority": drug_data.get("priority", "medium")
-        }
+    return AgentResult.for_drugs(
+        "internal_knowledge",
+        drug_names,
+        data,
+        not_found="No internal knowledge data found for {drug}"
     )
-    
-    return output.model_dump()
@@ -1,45 +1,46 @@
-import json
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, IQVIAData, PrescriptionTrend
+from telemetry import instrument
+from datastore import get_store, get_drug_index
+from agents.cube import read_cube
+from agents.timeframe import in_timeframe, trend_year
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "iqvia_data.json"
+def load_iqvia_data() -> Dict[str, Any]:
+    return get_store().get("iqvia")
 
 
-def load_iqvia_data() -> Dict[str, Any]:
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+def iqvia_data(drug_data: Dict[str, Any]) -> IQVIAData:
+    # In year order, so a timeframe is a slice
+    prescription_trends = tuple(sorted(
+        (PrescriptionTrend(year=p["year"], prescriptions=p["count"]) for p in drug_data.get("prescriptions", [])),
+        key=trend_year
+    ))
+    
+    return IQVIAData(
+        market_size_usd=drug_data.get("market_size_usd", 0),
+        growth_rate_cagr=drug_data.get("growth_rate", 0),
+        prescription_trends=prescription_trends,
+        competitor_share=tuple(drug_data.get("competitors", {}).items())
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "iqvia")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
+    timeframe = entities.get("timeframe")
     
-    raw_data = load_iqvia_data()
+    # Precomputed outputs when the cube is built, else every requested drug
+    # in one multi-key lookup
+    data = read_cube("iqvia", drug_names, timeframe=timeframe)
+    if data is None:
+        records = get_drug_index("iqvia").lookup_many(drug_names)
+        data = [in_timeframe("iqvia", iqvia_data(record), timeframe) if record is not None else None for record in records]
     
-    drug_data = None
-    for drug in raw_data.get("drugs", []):
-        if drug.get("name", "").lower() == drug_name.lower():
-            drug_data = drug
-            break
-    
-    if not drug_data:
-        drug_data = raw_data["drugs"][0] if raw_data.get("drugs") else {}
-    
-    prescription_trends = [
-        {"year": p["year"], "prescriptions": p["count"]}
-        for p in drug_data.get("prescriptions", [])
-    ]
-    
-    output = AgentOutput(
-        agent="iqvia",
-        data={
-            "market_size_usd": drug_data.get("market_size_usd", 0),
-            "growth_rate_cagr": drug_data.get("growth_rate", 0),
-            "prescription_trends": prescription_trends,
-            "competitor_share": drug_data.get("competitors", {})
-        }
+    return AgentResult.for_drugs(
+        "iqvia",
+        drug_names,
+        data,
+        not_found="No IQVIA data found for {drug}"
     )
-    
-    return output.model_dump()
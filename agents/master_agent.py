@@ -1,14 +1,14 @@
-import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from contracts.schemas import QueryContext, ExtractedEntities
-from orchestration.router import route_query
+from datastore import normalize_name
+from orchestration.router import select_agents
+from orchestration.matcher import DRUG_PATTERNS, QueryMatch, get_matcher
 
 
-DRUG_PATTERNS = [
-    r'\b(Drug\s*[A-Z])\b',
-    r'\b([A-Z][a-z]+(?:mab|nib|lib|tib|zumab|tinib))\b',
-    r'\b([A-Z][a-z]+(?:cept|vir|pril|sartan))\b',
-]
+# Most drugs compared in one query (columns of the report's comparison tables);
+# further names are ignored
+MAX_COMPARED_DRUGS = 6
+
 
 THERAPEUTIC_AREAS = [
     "oncology", "cardiology", "neurology", "immunology", 
@@ -32,57 +32,70 @@ REGIONS = {
 }
 
 
-def extract_drug_name(query: str) -> str:
-    for pattern in DRUG_PATTERNS:
-        match = re.search(pattern, query, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    return "Drug X"
+def drug_from_match(match: QueryMatch) -> str:
+    return match.drugs[0] if match.drugs else "Drug X"
 
 
-def extract_therapeutic_area(query: str) -> str:
-    query_lower = query.lower()
-    for area in THERAPEUTIC_AREAS:
-        if area in query_lower:
-            return area
-    return "oncology"
+def drugs_from_match(match: QueryMatch) -> List[str]:
+    drugs: Dict[str, str] = {}
+    for drug in match.drugs:
+        drugs.setdefault(normalize_name(drug), drug)
+    return list(drugs.values())[:MAX_COMPARED_DRUGS] or [drug_from_match(match)]
 
 
-def extract_regions(query: str) -> List[str]:
-    query_lower = query.lower()
-    found_regions = []
-    
-    for keyword, region in REGIONS.items():
-        if keyword in query_lower and region not in found_regions:
-            found_regions.append(region)
-    
-    if not found_regions:
-        return ["US", "EU"]
-    
-    return found_regions
+def therapeutic_area_from_match(match: QueryMatch) -> str:
+    return match.areas[0] if match.areas else "oncology"
+
 
+def regions_from_match(match: QueryMatch) -> List[str]:
+    return match.regions or ["US", "EU"]
 
-def extract_timeframe(query: str) -> str:
-    year_pattern = r'\b(20\d{2})\b'
-    years = re.findall(year_pattern, query)
+
+def timeframe_from_match(match: QueryMatch) -> Optional[str]:
+    """The years the query names, as "2020-2025" or "2027"; None when it
+    names none, so agents don't filter on a timeframe nobody asked for."""
+    years = match.years
     
     if len(years) >= 2:
         return f"{min(years)}-{max(years)}"
     elif len(years) == 1:
-        return f"{years[0]}-2030"
+        return str(years[0])
     
-    return "2025-2030"
+    return None
+
+
+def extract_drug_name(query: str) -> str:
+    return drug_from_match(get_matcher().match(query))
+
+
+def extract_drug_names(query: str) -> List[str]:
+    return drugs_from_match(get_matcher().match(query))
+
+
+def extract_therapeutic_area(query: str) -> str:
+    return therapeutic_area_from_match(get_matcher().match(query))
+
+
+def extract_regions(query: str) -> List[str]:
+    return regions_from_match(get_matcher().match(query))
+
+
+def extract_timeframe(query: str) -> Optional[str]:
+    return timeframe_from_match(get_matcher().match(query))
 
 
 def parse_query(query: str) -> Dict[str, Any]:
-    drug_name = extract_drug_name(query)
-    therapeutic_area = extract_therapeutic_area(query)
-    regions = extract_regions(query)
-    timeframe = extract_timeframe(query)
-    required_agents = route_query(query)
+    # One pass over the query finds agents, area, regions, drugs and years
+    match = get_matcher().match(query)
+    drug_names = drugs_from_match(match)
+    therapeutic_area = therapeutic_area_from_match(match)
+    regions = regions_from_match(match)
+    timeframe = timeframe_from_match(match)
+    required_agents = select_agents(match.agents)
     
     extracted_entities = ExtractedEntities(
-        drug_name=drug_name,
+        drug_name=drug_names[0],
+        drug_names=drug_names,
         therapeutic_area=therapeutic_area,
         regions=regions,
         timeframe=timeframe
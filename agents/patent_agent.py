@@ -1,45 +1,46 @@
-import json
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, ExpiringPatent, PatentData
+from telemetry import instrument
+from datastore import get_store, get_drug_index
+from agents.cube import read_cube
+from agents.timeframe import in_timeframe, expiry_year
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "patent_data.json"
+def load_patent_data() -> Dict[str, Any]:
+    return get_store().get("patent")
 
 
-def load_patent_data() -> Dict[str, Any]:
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+def patent_data(drug_data: Dict[str, Any]) -> PatentData:
+    # In order of expiry year, so a timeframe is a slice
+    expiring_patents = tuple(sorted(
+        (ExpiringPatent(patent_id=p["id"], expiry_date=p["expiry"]) for p in drug_data.get("expiring_patents", [])),
+        key=expiry_year
+    ))
+    
+    return PatentData(
+        active_patents=drug_data.get("active_patents", 0),
+        expiring_soon=expiring_patents,
+        competitor_filings=drug_data.get("competitor_filings", 0),
+        exclusivity_window_years=drug_data.get("exclusivity_years", 0)
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "patent")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
+    timeframe = entities.get("timeframe")
     
-    raw_data = load_patent_data()
+    # Precomputed outputs when the cube is built, else every requested drug
+    # in one multi-key lookup
+    data = read_cube("patent", drug_names, timeframe=timeframe)
+    if data is None:
+        records = get_drug_index("patent").lookup_many(drug_names)
+        data = [in_timeframe("patent", patent_data(record), timeframe) if record is not None else None for record in records]
     
-    drug_data = None
-    for drug in raw_data.get("drugs", []):
-        if drug.get("name", "").lower() == drug_name.lower():
-            drug_data = drug
-            break
-    
-    if not drug_data:
-        drug_data = raw_data["drugs"][0] if raw_data.get("drugs") else {}
-    
-    expiring_patents = [
-        {"patent_id": p["id"], "expiry_date": p["expiry"]}
-        for p in drug_data.get("expiring_patents", [])
-    ]
-    
-    output = AgentOutput(
-        agent="patent",
-        data={
-            "active_patents": drug_data.get("active_patents", 0),
-            "expiring_soon": expiring_patents,
-            "competitor_filings": drug_data.get("competitor_filings", 0),
-            "exclusivity_window_years": drug_data.get("exclusivity_years", 0)
-        }
+    return AgentResult.for_drugs(
+        "patent",
+        drug_names,
+        data,
+        not_found="No patent data found for {drug}"
     )
-    
-    return output.model_dump()
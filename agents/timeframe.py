@@ -0,0 +1,62 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+
+def trend_year(item: Mapping[str, Any]) -> int:
+    return item["year"]
+
+
+def expiry_year(item: Mapping[str, Any]) -> int:
+    try:
+        return int(item["expiry_date"][:4])
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+# agent -> (field of its data holding dated items, year of an item). The
+# agent's builder sorts that field by year, so a timeframe is a slice of it.
+TIMEFRAME_FIELDS: Dict[str, Tuple[str, Callable[[Mapping[str, Any]], int]]] = {
+    "iqvia": ("prescription_trends", trend_year),
+    "patent": ("expiring_soon", expiry_year),
+}
+
+
+@lru_cache(maxsize=256)
+def parse_timeframe(timeframe: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(first year, last year) of a "2025-2030" or "2027" timeframe, or None
+    (no filtering) if there is none or it does not parse."""
+    if not timeframe:
+        return None
+    start, _, end = timeframe.partition("-")
+    try:
+        first, last = int(start), int(end or start)
+    except ValueError:
+        return None
+    return (first, last) if first <= last else (last, first)
+
+
+def item_years(agent: str, data: Any) -> Tuple[int, ...]:
+    """Year of each dated item in ``data``, in order; empty for agents
+    without dated items."""
+    if agent not in TIMEFRAME_FIELDS:
+        return ()
+    field_name, year = TIMEFRAME_FIELDS[agent]
+    return tuple(year(item) for item in getattr(data, field_name))
+
+
+def in_timeframe(agent: str, data: Any, timeframe: Optional[str], years: Optional[Sequence[int]] = None) -> Any:
+    """``data`` with its dated items cut to ``timeframe``. ``years`` (see
+    ``item_years``) can be passed when already known. Returns ``data``
+    itself when nothing falls outside the timeframe."""
+    span = parse_timeframe(timeframe)
+    if span is None or agent not in TIMEFRAME_FIELDS:
+        return data
+    if years is None:
+        years = item_years(agent, data)
+    lo, hi = bisect_left(years, span[0]), bisect_right(years, span[1])
+    if lo == 0 and hi == len(years):
+        return data
+    field_name, _ = TIMEFRAME_FIELDS[agent]
+    return replace(data, **{field_name: getattr(data, field_name)[lo:hi]})
@@ -1,40 +1,38 @@
-import json
 from typing import Dict, Any
-from pathlib import Path
-from contracts.schemas import AgentOutput
+from contracts.results import AgentResult, WebIntelligenceData
+from telemetry import instrument
+from datastore import get_store, get_drug_index
+from agents.cube import read_cube
 
 
-DATA_FILE = Path(__file__).parent.parent / "data" / "web_intelligence.json"
+def load_web_data() -> Dict[str, Any]:
+    return get_store().get("web_intelligence")
 
 
-def load_web_data() -> Dict[str, Any]:
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
+def web_intelligence_data(drug_data: Dict[str, Any]) -> WebIntelligenceData:
+    return WebIntelligenceData(
+        sentiment_score=drug_data.get("sentiment", 0),
+        news_mentions=drug_data.get("news_count", 0),
+        regulatory_updates=tuple(drug_data.get("regulatory", [])),
+        market_rumors=tuple(drug_data.get("rumors", []))
+    )
 
 
-def process(query_context: Dict[str, Any]) -> Dict[str, Any]:
+@instrument("agent", "web_intelligence")
+def process(query_context: Dict[str, Any]) -> AgentResult:
     entities = query_context.get("extracted_entities", {})
-    drug_name = entities.get("drug_name", "Drug X")
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "Drug X")]
     
-    raw_data = load_web_data()
+    # Precomputed outputs when the cube is built, else every requested drug
+    # in one multi-key lookup
+    data = read_cube("web_intelligence", drug_names)
+    if data is None:
+        records = get_drug_index("web_intelligence").lookup_many(drug_names)
+        data = [web_intelligence_data(record) if record is not None else None for record in records]
     
-    drug_data = None
-    for drug in raw_data.get("drugs", []):
-        if drug.get("name", "").lower() == drug_name.lower():
-            drug_data = drug
-            break
-    
-    if not drug_data:
-        drug_data = raw_data["drugs"][0] if raw_data.get("drugs") else {}
-    
-    output = AgentOutput(
-        agent="web_intelligence",
-        data={
-            "sentiment_score": drug_data.get("sentiment", 0),
-            "news_mentions": drug_data.get("news_count", 0),
-            "regulatory_updates": drug_data.get("regulatory", []),
-            "market_rumors": drug_data.get("rumors", [])
-        }
+    return AgentResult.for_drugs(
+        "web_intelligence",
+        drug_names,
+        data,
+        not_found="No web intelligence data found for {drug}"
     )
-    
-    return output.model_dump()
@@ -1,12 +1,59 @@
 
-from fastapi import FastAPI, Response, HTTPException
-from pathlib import Path
+import asyncio
+import os
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-import re
+from fastapi.responses import FileResponse, StreamingResponse
+import time
 from app import run_query
+from orchestration.graph import workflow_registry
+from orchestration.batch import run_workflow_batch, MAX_BATCH_QUERIES
+from orchestration.jobs import Job, JobManager, QueueFullError
+from orchestration.events import to_sse, SUMMARY_CHUNK
+from llm import load_backend
+from reports.pool import pdf_pool
+from reports.store import report_store, ReportNotFoundError
+from telemetry import TRACE_HEADER, Sample, metrics
+from telemetry.collectors import register_default_collectors
+from telemetry.http import TraceMiddleware
 
-app = FastAPI()
+
+# Workflows that may run at once, and how many more may wait for a slot
+MAX_WORKFLOWS = int(os.environ.get("MEDNEXA_MAX_WORKFLOWS", "4"))
+MAX_QUEUED_JOBS = int(os.environ.get("MEDNEXA_MAX_QUEUED_JOBS", "32"))
+
+job_manager = JobManager(max_workers=MAX_WORKFLOWS, max_queue=MAX_QUEUED_JOBS)
+
+
+def job_samples():
+    stats = job_manager.stats()
+    yield Sample("mednexa_jobs_active", "gauge", "Jobs running or waiting for a worker.", {}, stats["active"])
+    yield Sample("mednexa_jobs_capacity", "gauge", "Jobs that may be running or queued at once.", {}, stats["max_workers"] + stats["max_queue"])
+    for status in ("queued", "running", "succeeded", "failed", "cancelled"):
+        yield Sample("mednexa_jobs", "gauge", "Retained jobs by status.", {"status": status}, stats.get(status, 0))
+
+
+register_default_collectors()
+metrics.register_collector(job_samples)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the LangGraph workflow once so the first request doesn't pay for it
+    workflow_registry.warm()
+    print(f"[startup] Workflow compiled in {workflow_registry.last_compile_seconds * 1000:.1f}ms")
+    load_backend()
+    # Start the PDF render processes now rather than on the first report
+    pdf_pool.warm()
+    yield
+    job_manager.shutdown()
+    pdf_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 origins = [
@@ -20,58 +67,173 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_HEADER],
 )
 
+# Outermost, so every response (including CORS preflights) carries a trace id
+app.add_middleware(TraceMiddleware)
+
 
-@app.post("/analyze")
+@app.post("/analyze", status_code=202)
 def analyze(payload: dict):
-    query = payload["query"]
-    result = run_query(query)
-    return {
-        "summary": result["summary"],
-        "pdfFilename": result["pdfFilename"]
-    }
+    """Queue a workflow run and return its job id; poll GET /jobs/{id} for the result."""
+    query = payload.get("query")
+    if not query:
+        raise HTTPException(status_code=422, detail="'query' is required")
+    job = submit_analysis(query)
+    return {"jobId": job.id, "status": job.status}
 
 
-OUTPUT_DIR = Path(__file__).parent / "outputs"
+@app.post("/analyze/batch", status_code=202)
+def analyze_batch(payload: dict):
+    """Queue one job for many queries. Agent work shared between queries runs
+    once; the job result has per-query results and dedup statistics."""
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q for q in queries):
+        raise HTTPException(status_code=422, detail="'queries' must be a non-empty list of strings")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_QUERIES} queries per batch")
+    try:
+        job = job_manager.submit(
+            lambda job: run_workflow_batch(queries, cancel_event=job.cancel_event, event_sink=job.publish),
+            kind="batch",
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return {"jobId": job.id, "status": job.status}
 
-@app.get("/download-pdf")
-def download_pdf(filename: str):
-    # normalize and resolve
-    file_path = (OUTPUT_DIR / filename).resolve()
-    print(f"[download-pdf] Requested filename={filename}")
-    print(f"[download-pdf] Looking in OUTPUT_DIR={OUTPUT_DIR.resolve()}")
-
-    if file_path.exists():
-        print(f"[download-pdf] Found file at {file_path}")
-        stored_name = file_path.name
-        m = re.search(r"(\d{8}_\d{6})", stored_name)
-        ts = m.group(1) if m else stored_name.replace('.pdf', '')
-        download_name = f"MedNexa Report - {ts}.pdf"
-        return FileResponse(path=file_path, media_type="application/pdf", filename=download_name)
-
-    # Fallback: try to find a close match in OUTPUT_DIR (in case of race or different process)
-    candidates = [p for p in OUTPUT_DIR.iterdir() if p.is_file()]
-    print(f"[download-pdf] OUTPUT_DIR contains {len(candidates)} files")
-    match = None
-    for p in candidates:
-        if p.name == filename:
-            match = p
-            break
-    if not match:
-        # try substring match
-        for p in candidates:
-            if filename in p.name or p.name in filename:
-                match = p
+
+@app.get("/analyze/stream")
+def analyze_stream(query: str):
+    """Queue a workflow run and stream its progress as Server-Sent Events."""
+    job = submit_analysis(query)
+    return event_stream(job)
+
+
+def submit_analysis(query: str) -> Job:
+    try:
+        return job_manager.submit(
+            lambda job: run_query(query, cancel_event=job.cancel_event, event_sink=job.publish)
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+
+async def follow_job(job: Job):
+    """Replay a job's events from the start, then follow it live until the
+    final ``job_end`` event."""
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    listener = lambda: loop.call_soon_threadsafe(wakeup.set)
+    job.add_listener(listener)
+    try:
+        cursor = 0
+        while True:
+            wakeup.clear()
+            new_events, done = job.events_since(cursor)
+            cursor += len(new_events)
+            for event in new_events:
+                yield event
+            if done:
                 break
+            if not new_events:
+                await wakeup.wait()
+    finally:
+        job.remove_listener(listener)
+
+
+def event_stream(job: Job) -> StreamingResponse:
+    """SSE response carrying every event of a job."""
+
+    async def events():
+        yield to_sse({"type": "job", "jobId": job.id, "status": job.status})
+        async for event in follow_job(job):
+            yield to_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/analyze/summary-stream")
+def analyze_summary_stream(query: str):
+    """Queue a workflow run and stream only the summary text, chunk by chunk
+    as the model produces it. The job id is in the X-Job-Id header."""
+    job = submit_analysis(query)
+
+    async def text():
+        async for event in follow_job(job):
+            if event.get("type") == SUMMARY_CHUNK:
+                yield event["text"]
+            elif event.get("type") == "job_end" and event.get("status") != "succeeded":
+                yield f"\n\n[{event.get('status')}: {event.get('error')}]"
+
+    return StreamingResponse(
+        text(),
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Job-Id": job.id},
+    )
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+def job_events(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return event_stream(job)
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/download-pdf")
+def download_pdf(reportId: str, request: Request):
+    """Serve a report's PDF, rendering it on the first request.
+
+    Responses carry an ETag derived from the report id and the PDF file, so
+    repeat fetches with ``If-None-Match`` get a 304, and byte ranges
+    (``Range``/``If-Range``) are served for resumed downloads.
+    """
+    try:
+        pdf = report_store.render(reportId)
+    except ReportNotFoundError:
+        raise HTTPException(status_code=404, detail="Report not found")
+    except (FutureTimeout, BrokenProcessPool):
+        raise HTTPException(status_code=503, detail="PDF rendering unavailable, try again", headers={"Retry-After": "5"})
+    stat = pdf.stat()
+    etag = f'"{reportId[:32]}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    created_at = report_store.created_at(reportId) or stat.st_mtime
+    download_name = f"MedNexa Report - {time.strftime('%Y%m%d_%H%M%S', time.localtime(created_at))}.pdf"
+    return FileResponse(
+        path=pdf,
+        media_type="application/pdf",
+        filename=download_name,
+        headers=headers,
+        stat_result=stat,
+    )
 
-    if match:
-        print(f"[download-pdf] Serving fallback match {match}")
-        stored_name = match.name
-        m = re.search(r"(\d{8}_\d{6})", stored_name)
-        ts = m.group(1) if m else stored_name.replace('.pdf', '')
-        download_name = f"MedNexa Report - {ts}.pdf"
-        return FileResponse(path=match.resolve(), media_type="application/pdf", filename=download_name)
 
-    print(f"[download-pdf] File not found: {file_path}")
-    raise HTTPException(status_code=404, detail="PDF not found")
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text exposition of latency histograms, error counts,
+    in-flight gauges and cache/store statistics."""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
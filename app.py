@@ -5,7 +5,11 @@ from pathlib import Path
 
 load_dotenv()
 
-from orchestration.graph import run_workflow
+from orchestration.graph import NODE_INFO, run_workflow
+from orchestration.events import LOG, SUMMARY_CHUNK, make_event, print_sink
+from orchestration.response_cache import HIT, MISS, RESPONSE_CACHE_ENABLED, query_key, response_cache
+from llm import LLM_BACKEND
+from reports.store import report_store
 
 
 def print_banner():
@@ -25,7 +29,7 @@ def print_section(title: str):
 def main():
     print_banner()
     
-    if not os.environ.get("GEMINI_API_KEY"):
+    if LLM_BACKEND != "stub" and not os.environ.get("GEMINI_API_KEY"):
         print("ERROR: GEMINI_API_KEY environment variable is not set.")
         print("Please set your Gemini API key and try again.")
         sys.exit(1)
@@ -50,9 +54,11 @@ def main():
         
         print_section("WORKFLOW COMPLETE")
         
-        if result.get("pdf_path"):
+        if result.get("report_id"):
+            # The API renders on first download; the CLI wants the file now
+            pdf_path = report_store.render(result["report_id"])
             print()
-            print(f"Report generated: {result['pdf_path']}")
+            print(f"Report generated: {pdf_path}")
             print()
         
         if result.get("summary"):
@@ -75,23 +81,32 @@ if __name__ == "__main__":
 
 
 
-def run_query(query: str) -> dict:
+def run_query(query: str, cancel_event=None, event_sink=None) -> dict:
     """
     Runs the workflow for a given query and returns a dictionary
-    containing summary and pdf_path.
+    containing the summary and the report id. The report's PDF is
+    rendered when it is first downloaded.
+
+    Queries that parse to the same context share a response: it is served
+    from the response cache, or awaited if an identical query is running.
     """
-    result = run_workflow(query)
-    pdf_path = result.get("pdf_path", "")
-    import os
-    pdf_filename = os.path.basename(pdf_path) if pdf_path else ""
-    # verify the file exists before returning the filename
-    if pdf_filename:
-        candidate = Path(pdf_path)
-        if not candidate.exists():
-            print(f"[run_query] Warning: expected PDF not found at {pdf_path}")
-            pdf_filename = ""
-
-    return {
-        "summary": result.get("summary", ""),
-        "pdfFilename": pdf_filename
-    }
+    def run():
+        result = run_workflow(query, cancel_event=cancel_event, event_sink=event_sink)
+        response = {
+            "summary": result.get("summary", ""),
+            "reportId": result.get("report_id", "")
+        }
+        # Data-only fallback summaries are not kept; the LLM may be back next time
+        return response, not result.get("summary_fallback")
+
+    if not RESPONSE_CACHE_ENABLED:
+        return run()[0]
+
+    response, source = response_cache.get_or_run(query_key(query), run, cancel_event=cancel_event)
+    if source != MISS:
+        # No workflow ran for this caller, so give its stream the summary
+        sink = event_sink or print_sink
+        message = "Served from response cache" if source == HIT else "Served by an identical running query"
+        sink(make_event(LOG, "response_cache", "Response Cache", message=message))
+        sink(make_event(SUMMARY_CHUNK, "gemini", NODE_INFO["gemini"][0], text=response["summary"]))
+    return dict(response)
@@ -0,0 +1,90 @@
+"""Batch analysis benchmark: one workflow run per query vs ``run_workflow_batch``.
+
+A portfolio review of the same few drugs asked several ways is run both
+ways. Agents get a fixed latency stand-in and the summarizer a fixed delay
+(reports are not saved), so the numbers show the effect of computing shared
+agent work once and summarizing with bounded parallelism.
+
+    python -m benchmarks.bench_batch
+"""
+import asyncio
+import time
+from unittest import mock
+
+from orchestration import batch, graph
+from orchestration.events import null_sink
+
+
+AGENT_LATENCY = 0.05
+SUMMARY_LATENCY = 0.10
+
+DRUGS = ["Trastuzumab", "Drug X", "Drug Y", "Drug Z"]
+TEMPLATES = [
+    "Market size and growth for {drug} in Europe",
+    "Patent expiry and exclusivity for {drug}",
+    "Clinical trial pipeline and market outlook for {drug}",
+    "Export and import volumes for {drug} in Asia",
+    "Market size and growth for {drug} in Europe",
+    "News sentiment and internal R&D budget for {drug}",
+]
+QUERIES = [template.format(drug=drug) for drug in DRUGS for template in TEMPLATES]
+
+
+def _fake_process(agent: str):
+    def process(query_context):
+        time.sleep(AGENT_LATENCY)
+        drug = query_context["extracted_entities"].get("drug_name")
+        return {"agent": agent, "status": "success", "data": {"drug": drug}, "timestamp": ""}
+    return process
+
+
+async def _fake_summarize_async(aggregated_data):
+    await asyncio.sleep(SUMMARY_LATENCY)
+    return {"summary": "stub"}
+
+
+def _fake_summarize_stream(aggregated_data):
+    time.sleep(SUMMARY_LATENCY)
+    yield "stub"
+
+
+def main():
+    processors = {agent: _fake_process(agent) for agent in batch.AGENT_PROCESSORS}
+    patches = [
+        mock.patch.object(getattr(graph, f"{agent}_agent"), "process", process)
+        for agent, process in processors.items()
+    ]
+    patches += [
+        mock.patch.dict(batch.AGENT_PROCESSORS, processors),
+        mock.patch.object(graph, "summarize_stream", _fake_summarize_stream),
+        mock.patch.object(graph.report_store, "save", lambda summary, data: ""),
+        mock.patch.object(batch, "summarize_async", _fake_summarize_async),
+    ]
+
+    for p in patches:
+        p.start()
+    try:
+        start = time.perf_counter()
+        for query in QUERIES:
+            graph.run_workflow(query, event_sink=null_sink)
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = batch.run_workflow_batch(QUERIES, event_sink=null_sink)
+        batched = time.perf_counter() - start
+    finally:
+        for p in patches:
+            p.stop()
+
+    stats = result["stats"]
+    assert stats["failed"] == 0, result
+    print(f"queries:               {stats['queries']}")
+    print(f"agent calls:           {stats['agentCalls']} of {stats['agentCallsRequested']} requested  {stats['agentCallsByAgent']}")
+    print(f"summaries:             {stats['summaries']}  ({stats['summariesSaved']} reused)")
+    print(f"run_workflow x{len(QUERIES)}:     {one_by_one * 1000:8.1f} ms")
+    print(f"run_workflow_batch:    {batched * 1000:8.1f} ms")
+    print(f"speedup:               {one_by_one / batched:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Cost of comparing k drugs in one query vs running k single-drug queries.
+
+Agents: the six agents' ``process`` over synthetic datasets (N drugs, 10,000
+by default, and N x 10 trade rows; see ``bench_snapshot.write_datasets``)
+with the cube disabled, once with all k drugs in ``drug_names`` (one
+multi-key index lookup per JSON dataset, one vectorized pass over the trade
+matrices) and k times with one drug each. Drugs are drawn at random, so lookups are not all served
+from one cache line.
+
+Workflow: ``run_workflow`` end to end on the real datasets in data/, with the
+stub summarizer and reports saved to a temporary directory, for "Compare
+Drug X vs Drug A vs Drug M ..." against one query per drug. A comparison
+pays for one summary and one report however many drugs it covers.
+
+    python -m benchmarks.bench_compare [N]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest import mock
+
+import datastore
+import llm
+from agents import cube
+from datastore import DATASETS, DataStore
+from llm import gemini_summarizer, stub_summarizer
+from orchestration import graph
+from orchestration.batch import AGENT_PROCESSORS
+from reports.store import ReportStore
+from benchmarks.bench_snapshot import drug_name, write_datasets
+
+
+COUNTS = [1, 2, 4, 6]
+ROUNDS = 200
+WORKFLOW_DRUGS = ["Drug X", "Drug A", "Drug M"]
+WORKFLOW_ROUNDS = 10
+
+
+def query_context(drug_names: List[str]) -> Dict[str, object]:
+    return {
+        "original_query": f"Compare {' vs '.join(drug_names)}",
+        "extracted_entities": {
+            "drug_name": drug_names[0],
+            "drug_names": drug_names,
+            "therapeutic_area": "oncology",
+            "regions": ["US", "EU", "APAC"],
+            "timeframe": "2025-2030",
+        },
+        "required_agents": list(AGENT_PROCESSORS),
+    }
+
+
+def run_agents(context: Dict[str, object]) -> None:
+    for process in AGENT_PROCESSORS.values():
+        process(context)
+
+
+def best_ms(fn: Callable[[], None], rounds: int) -> float:
+    """Best of 5 batches of ``rounds`` calls, per call."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best * 1000
+
+
+def bench_agents(n: int) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(prefix="mednexa-compare-") as tmp:
+        data_dir = Path(tmp)
+        write_datasets(data_dir, n)
+        store = DataStore()
+        for name, (filename, loader) in DATASETS.items():
+            store.register(name, data_dir / filename, loader)
+        with mock.patch.object(datastore, "_store", store), mock.patch.object(cube, "USE_CUBE", False):
+            run_agents(query_context([drug_name(0)]))  # load datasets and build indexes
+
+            print(f"agents:                six agents, {n} drugs per dataset, {n * 10} trade rows")
+            print(f"{'drugs':>6}{'compared ms':>13}{'k singles ms':>14}{'per drug ms':>13}{'speedup':>9}")
+            for k in COUNTS:
+                drugs = [drug_name(i) for i in rng.sample(range(n), k)]
+                compared = best_ms(lambda: run_agents(query_context(drugs)), ROUNDS)
+                singles = best_ms(lambda: [run_agents(query_context([drug])) for drug in drugs], ROUNDS)
+                print(f"{k:6d}{compared:13.3f}{singles:14.3f}{compared / k:13.3f}{singles / compared:8.2f}x")
+
+
+def bench_workflow() -> None:
+    def run(query: str) -> None:
+        graph.run_workflow(query, event_sink=lambda event: None)
+
+    with tempfile.TemporaryDirectory(prefix="mednexa-compare-") as reports_dir, \
+            mock.patch.object(llm, "LLM_BACKEND", "gemini"), \
+            mock.patch.object(llm, "SUMMARY_CACHE_ENABLED", False), \
+            mock.patch.object(gemini_summarizer, "summarize", stub_summarizer.summarize), \
+            mock.patch.object(gemini_summarizer, "summarize_stream", stub_summarizer.summarize_stream), \
+            mock.patch.object(graph, "report_store", ReportStore(root=Path(reports_dir))):
+        run(f"{WORKFLOW_DRUGS[0]} market outlook")  # compile the graph and load datasets
+
+        print(f"workflow:              run_workflow on data/, stub LLM (delay {stub_summarizer.STUB_DELAY:g} s)")
+        print(f"{'drugs':>6}{'compared ms':>13}{'k singles ms':>14}{'speedup':>9}")
+        for k in range(1, len(WORKFLOW_DRUGS) + 1):
+            drugs = WORKFLOW_DRUGS[:k]
+            compared = best_ms(lambda: run(f"Compare {' vs '.join(drugs)} market, trade and patents"), WORKFLOW_ROUNDS)
+            singles = best_ms(lambda: [run(f"{drug} market, trade and patents") for drug in drugs], WORKFLOW_ROUNDS)
+            print(f"{k:6d}{compared:13.3f}{singles:14.3f}{singles / compared:8.2f}x")
+
+
+def main(argv: List[str]) -> None:
+    n = int(argv[0]) if argv else 10_000
+    bench_agents(n)
+    bench_workflow()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,115 @@
+"""Agent latency computing from the datasets vs reading the precomputed cube.
+
+Generates synthetic datasets (N drugs, 5,000 by default, ten prescription
+years and six patent expiries per drug, N x 10 trade rows; see
+``bench_snapshot.write_datasets``) in a temp directory, registers them with
+a fresh DataStore and builds a cube for them. Then times each agent's
+``process`` on the same random single-drug queries, mixing region
+selections and timeframes the way parsed queries do, first with the cube
+disabled and then reading it. Both paths must return the same data.
+
+Also reports the cost of the offline step: a full rebuild, an incremental
+update of one drug and loading the cube in a new process.
+
+    python -m benchmarks.bench_cube [N]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+import datastore
+from agents import cube
+from datastore import DATASETS, DataStore
+from orchestration.batch import AGENT_PROCESSORS
+from benchmarks.bench_snapshot import drug_name, write_datasets
+
+
+QUERIES = 2_000
+REGION_SELECTIONS = [["US", "EU"], ["APAC"], ["Global"], ["EU", "US", "APAC"], ["US"]]
+TIMEFRAMES = ["2025-2030", "2018-2022", "2015-2030", "2020-2030", "2016-2024"]
+
+
+def contexts(n: int) -> List[Dict[str, Any]]:
+    rng = random.Random(0)
+    result = []
+    for _ in range(QUERIES):
+        drug = drug_name(rng.randrange(n))
+        result.append({
+            "original_query": "",
+            "extracted_entities": {
+                "drug_name": drug,
+                "drug_names": [drug],
+                "therapeutic_area": "oncology",
+                "regions": rng.choice(REGION_SELECTIONS),
+                "timeframe": rng.choice(TIMEFRAMES),
+            },
+        })
+    return result
+
+
+def per_call_us(process, queries: List[Dict[str, Any]]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for context in queries:
+            process(context)
+        best = min(best, (time.perf_counter() - start) / len(queries))
+    return best * 1e6
+
+
+def main(argv: List[str]) -> None:
+    n = int(argv[0]) if argv else 5_000
+    queries = contexts(n)
+    with tempfile.TemporaryDirectory(prefix="mednexa-cube-") as tmp:
+        data_dir, cube_path = Path(tmp) / "data", Path(tmp) / "cube.json"
+        data_dir.mkdir()
+        write_datasets(data_dir, n)
+        store = DataStore()
+        for name, (filename, loader) in DATASETS.items():
+            store.register(name, data_dir / filename, loader)
+
+        with mock.patch.object(datastore, "_store", store), \
+                mock.patch.object(cube, "CUBE_PATH", cube_path), \
+                mock.patch.object(cube, "_registered", False), \
+                mock.patch.object(cube, "_checked_at", 0.0):
+            with mock.patch.object(cube, "USE_CUBE", False):
+                for process in AGENT_PROCESSORS.values():
+                    process(queries[0])  # load datasets and build indexes
+                live = {agent: [process(q).to_dict()["data"] for q in queries[:200]] for agent, process in AGENT_PROCESSORS.items()}
+                before = {agent: per_call_us(process, queries) for agent, process in AGENT_PROCESSORS.items()}
+
+            start = time.perf_counter()
+            cube.build_cube(cube_path)
+            build_s = time.perf_counter() - start
+            start = time.perf_counter()
+            cube.update_cube([drug_name(n // 2)], cube_path)
+            update_s = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = cube.load_cube(cube_path)
+            load_s = time.perf_counter() - start
+
+            assert cube.get_cube() is not None
+            for agent, process in AGENT_PROCESSORS.items():
+                assert [process(q).to_dict()["data"] for q in queries[:200]] == live[agent], agent
+            after = {agent: per_call_us(process, queries) for agent, process in AGENT_PROCESSORS.items()}
+
+    print(f"datasets:              {n} drugs, {n * 10} trade rows")
+    print(f"cube rebuild:          {build_s:.2f} s  ({cube_path.name}: {loaded.nbytes / 2**20:.1f} MiB, "
+          f"{len(loaded.cells)} cells, {len(loaded.region_keys)} region selections)")
+    print(f"cube update, 1 drug:   {update_s:.2f} s")
+    print(f"cube load:             {load_s:.2f} s")
+    print(f"queries:               {QUERIES} single-drug, {len(REGION_SELECTIONS)} region selections, "
+          f"{len(TIMEFRAMES)} timeframes")
+    print(f"{'agent':<20}{'datasets us':>13}{'cube us':>10}{'speedup':>9}")
+    for agent in AGENT_PROCESSORS:
+        print(f"{agent:<20}{before[agent]:13.2f}{after[agent]:10.2f}{before[agent] / after[agent]:8.2f}x")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(f"{'all six':<20}{total_before:13.2f}{total_after:10.2f}{total_before / total_after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
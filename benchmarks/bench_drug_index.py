@@ -0,0 +1,69 @@
+"""Per-lookup cost of the drug index versus the old linear scan.
+
+Builds synthetic catalogues (each drug with a brand name and a synonym) from
+10 up to 100k drugs and times lookups of random names. Index cost should stay
+flat as the catalogue grows; the scan grows linearly.
+
+    python -m benchmarks.bench_drug_index
+"""
+import random
+import time
+
+from datastore.index import DrugIndex
+
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+LOOKUPS = 20_000
+# The linear scan gets slow quickly; cap how many scans are timed at large sizes
+SCAN_LOOKUPS = 200
+
+
+def make_catalogue(size: int):
+    return [
+        {
+            "name": f"Molecule {i:06d}",
+            "brand_names": [f"Brand{i:06d}"],
+            "synonyms": [f"INN-{i:06d}"],
+        }
+        for i in range(size)
+    ]
+
+
+def linear_scan(drugs, drug_name):
+    for drug in drugs:
+        if drug.get("name", "").lower() == drug_name.lower():
+            return drug
+    return None
+
+
+def per_call_ns(fn, names) -> float:
+    start = time.perf_counter_ns()
+    for name in names:
+        fn(name)
+    return (time.perf_counter_ns() - start) / len(names)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'drugs':>8}  {'build ms':>9}  {'index ns/lookup':>16}  {'scan ns/lookup':>15}")
+    for size in SIZES:
+        drugs = make_catalogue(size)
+        start = time.perf_counter()
+        index = DrugIndex(drugs)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Mix canonical names, brand names, synonyms and misses
+        names = []
+        for _ in range(LOOKUPS):
+            i = rng.randrange(size)
+            names.append(rng.choice([
+                f"molecule {i:06d}", f"BRAND{i:06d}", f"inn-{i:06d}", f"Unknown {i}",
+            ]))
+
+        index_ns = per_call_ns(index.lookup, names)
+        scan_ns = per_call_ns(lambda n: linear_scan(drugs, n), names[:SCAN_LOOKUPS])
+        print(f"{size:>8}  {build_ms:>9.2f}  {index_ns:>16.0f}  {scan_ns:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Offline end-to-end benchmark of the workflow over a query corpus.
+
+The corpus (``benchmarks/requests.jsonl``) covers every router keyword
+group, single and combined, for every drug in the datasets plus one the
+datasets don't know, across regions and therapeutic areas. ``build``
+regenerates it deterministically.
+
+``run`` executes ``run_workflow`` in-process for every query with the
+Gemini summarizer replaced by the deterministic stub summarizer and reports
+saved to a temporary directory, so it needs no network or API key. The
+summary cache is off unless ``--summary-cache`` is given, so each query
+pays for its summary. Per-node latencies come from the graph's ``node_end``
+events; end-to-end latency is timed around ``run_workflow``. Results are
+written as JSON, and with ``--baseline`` compared against an earlier run:
+any p95 that is more than ``--threshold`` slower (and by more than
+``--min-delta-ms``) is flagged and the exit status is 1.
+
+    python -m benchmarks.bench_e2e build
+    python -m benchmarks.bench_e2e run [--repeat N] [--baseline results.json]
+    python -m benchmarks.bench_e2e compare baseline.json current.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from unittest import mock
+
+import llm
+from llm import gemini_summarizer, stub_summarizer
+from orchestration import graph
+from orchestration.router import AGENT_KEYWORDS
+from reports.store import ReportStore
+
+
+BENCH_DIR = Path(__file__).parent
+CORPUS_PATH = BENCH_DIR / "requests.jsonl"
+RESULTS_DIR = BENCH_DIR / "results"
+
+PERCENTILES = (50, 95, 99)
+WARMUP_QUERIES = 5
+SEED = 19
+
+# Phrasings per router keyword group; {drug}, {region} and {area} are filled in
+GROUP_TEMPLATES = {
+    "iqvia": [
+        "What is the market size and growth of {drug} in {region}?",
+        "Sales and revenue trend for {drug} in {area}",
+        "Prescription volumes for {drug} across {region}",
+    ],
+    "exim": [
+        "Import and export volumes of {drug} for {region}",
+        "How do tariffs affect trade of {drug} into {region}?",
+        "EXIM trading data for {drug}",
+    ],
+    "patent": [
+        "When does patent exclusivity for {drug} expire?",
+        "Intellectual property landscape and expiring patents for {drug}",
+        "IP position of {drug} in {region}",
+    ],
+    "clinical_trials": [
+        "Clinical trial pipeline for {drug} in {area}",
+        "Which phase are the {drug} studies in?",
+        "Status of ongoing trials for {drug} in {region}",
+    ],
+    "internal_knowledge": [
+        "Internal R&D budget and forecast for {drug}",
+        "Manufacturing capacity planned for {drug}",
+        "Internal forecast for {drug} in {area}",
+    ],
+    "web_intelligence": [
+        "Latest news sentiment around {drug}",
+        "Regulatory updates and competitor rumors for {drug} in {region}",
+        "Competitive intelligence on {drug}",
+    ],
+}
+
+# Queries with no keyword, which the router sends to every agent
+OPEN_TEMPLATES = [
+    "Give me an overview of {drug}",
+    "Tell me about {drug} in {area} for {region}",
+]
+
+REGIONS = ["US", "Europe", "Asia Pacific", "global markets", "the USA"]
+AREAS = ["oncology", "cardiology", "immunology", "neurology", "endocrinology"]
+UNKNOWN_DRUG = "Drug Q"
+
+
+def corpus_drugs() -> List[str]:
+    from datastore import get_drug_catalogue
+
+    return sorted(set(get_drug_catalogue().values())) + [UNKNOWN_DRUG]
+
+
+def build_corpus(size: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Every single group and every drug at least once, then random
+    combinations of two or three groups and open queries up to ``size``."""
+    rng = random.Random(seed)
+    drugs = corpus_drugs()
+    groups = list(GROUP_TEMPLATES)
+
+    def fill(template: str, drug: str) -> str:
+        return template.format(drug=drug, region=rng.choice(REGIONS), area=rng.choice(AREAS))
+
+    entries = []
+    for drug in drugs:
+        for group in groups:
+            entries.append({"query": fill(rng.choice(GROUP_TEMPLATES[group]), drug), "drug": drug, "groups": [group]})
+        entries.append({"query": fill(rng.choice(OPEN_TEMPLATES), drug), "drug": drug, "groups": []})
+
+    while len(entries) < size:
+        drug = rng.choice(drugs)
+        picked = sorted(rng.sample(groups, rng.choice((2, 3))), key=groups.index)
+        first, *rest = [fill(rng.choice(GROUP_TEMPLATES[group]), drug) for group in picked]
+        # Join the phrasings into one question: "<first>, and <second> ..."
+        query = first.rstrip("?") + "".join(f", and {part[0].lower()}{part[1:].rstrip('?')}" for part in rest)
+        entries.append({"query": query, "drug": drug, "groups": picked})
+
+    rng.shuffle(entries)
+    return [{"id": f"q{i:04d}", **entry} for i, entry in enumerate(entries, 1)]
+
+
+def write_corpus(entries: List[Dict[str, Any]], path: Path = CORPUS_PATH) -> None:
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def read_corpus(path: Path = CORPUS_PATH) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear interpolation between closest ranks."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_timings(values_ms: List[float]) -> Dict[str, float]:
+    values = sorted(values_ms)
+    stats = {f"p{pct}_ms": round(percentile(values, pct), 3) for pct in PERCENTILES}
+    stats["mean_ms"] = round(sum(values) / len(values), 3) if values else 0.0
+    stats["max_ms"] = round(values[-1], 3) if values else 0.0
+    stats["count"] = len(values)
+    return stats
+
+
+def run_corpus(entries: List[Dict[str, Any]], repeat: int, summary_cache: bool) -> Dict[str, Any]:
+    node_ms: Dict[str, List[float]] = {}
+    end_to_end_ms: List[float] = []
+    failures: List[Dict[str, str]] = []
+
+    def sink(event: Dict[str, Any]) -> None:
+        if event.get("type") == "node_end":
+            node_ms.setdefault(event["node"], []).append(event["duration_ms"])
+
+    with tempfile.TemporaryDirectory(prefix="mednexa-e2e-") as reports_dir, \
+            mock.patch.object(llm, "LLM_BACKEND", "gemini"), \
+            mock.patch.object(llm, "SUMMARY_CACHE_ENABLED", summary_cache), \
+            mock.patch.object(gemini_summarizer, "summarize", stub_summarizer.summarize), \
+            mock.patch.object(gemini_summarizer, "summarize_stream", stub_summarizer.summarize_stream), \
+            mock.patch.object(graph, "report_store", ReportStore(root=Path(reports_dir))):
+        # Compile the graph, load datasets and build indexes before timing
+        for entry in entries[:WARMUP_QUERIES]:
+            graph.run_workflow(entry["query"], event_sink=lambda event: None)
+
+        for _ in range(repeat):
+            for entry in entries:
+                start = time.perf_counter()
+                try:
+                    graph.run_workflow(entry["query"], event_sink=sink)
+                except Exception as e:
+                    failures.append({"id": entry["id"], "error": str(e)})
+                    continue
+                end_to_end_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "end_to_end": summarize_timings(end_to_end_ms),
+        "nodes": {node: summarize_timings(values) for node, values in sorted(node_ms.items())},
+        "failures": failures,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float, min_delta_ms: float) -> List[str]:
+    """Lines describing every p95 that regressed beyond the threshold."""
+    pairs = [("end_to_end", baseline.get("end_to_end"), current.get("end_to_end"))]
+    pairs += [
+        (f"node {node}", baseline.get("nodes", {}).get(node), stats)
+        for node, stats in current.get("nodes", {}).items()
+    ]
+    regressions = []
+    for name, before, after in pairs:
+        if not before or not after:
+            continue
+        old, new = before["p95_ms"], after["p95_ms"]
+        if new - old > min_delta_ms and new > old * (1 + threshold):
+            regressions.append(f"{name}: p95 {old:.3f} -> {new:.3f} ms (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print(f"{'':22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'count':>8}")
+    rows = [("end-to-end", results["end_to_end"])] + list(results["nodes"].items())
+    for name, stats in rows:
+        print(f"{name:22}{stats['p50_ms']:10.3f}{stats['p95_ms']:10.3f}{stats['p99_ms']:10.3f}{stats['count']:8d}")
+    if results["failures"]:
+        print(f"failures:             {len(results['failures'])}")
+
+
+def report_regressions(baseline_path: Path, results: Dict[str, Any], threshold: float, min_delta_ms: float) -> int:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, results, threshold, min_delta_ms)
+    if not regressions:
+        print(f"no p95 regressions against {baseline_path} (threshold {threshold:.0%})")
+        return 0
+    print(f"p95 regressions against {baseline_path}:")
+    for line in regressions:
+        print(f"  {line}")
+    return 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_e2e")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="regenerate the query corpus")
+    build.add_argument("--size", type=int, default=200)
+    build.add_argument("--seed", type=int, default=SEED)
+    build.add_argument("--out", type=Path, default=CORPUS_PATH)
+
+    run = commands.add_parser("run", help="run the corpus and record latencies")
+    run.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--summary-cache", action="store_true", help="keep the summary cache on")
+    run.add_argument("--out", type=Path, help="results file (default: benchmarks/results/e2e-<time>.json)")
+    run.add_argument("--baseline", type=Path, help="earlier results to compare against")
+    run.add_argument("--threshold", type=float, default=0.10)
+    run.add_argument("--min-delta-ms", type=float, default=0.5)
+
+    cmp = commands.add_parser("compare", help="compare two results files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument("--threshold", type=float, default=0.10)
+    cmp.add_argument("--min-delta-ms", type=float, default=0.5)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        entries = build_corpus(args.size, args.seed)
+        write_corpus(entries, args.out)
+        print(f"wrote {len(entries)} queries ({len(corpus_drugs())} drugs, {len(AGENT_KEYWORDS)} keyword groups) to {args.out}")
+        return 0
+
+    if args.command == "compare":
+        with open(args.current) as f:
+            current = json.load(f)
+        return report_regressions(args.baseline, current, args.threshold, args.min_delta_ms)
+
+    entries = read_corpus(args.corpus)
+    started = time.time()
+    results = run_corpus(entries, args.repeat, args.summary_cache)
+    results["meta"] = {
+        "started_at": started,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "corpus": str(args.corpus),
+        "queries": len(entries),
+        "repeat": args.repeat,
+        "summary_cache": args.summary_cache,
+        "stub_llm_delay": stub_summarizer.STUB_DELAY,
+    }
+    print_results(results)
+
+    out = args.out or RESULTS_DIR / f"e2e-{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results:              {out}")
+
+    if args.baseline:
+        return report_regressions(args.baseline, results, args.threshold, args.min_delta_ms)
+    return 1 if results["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""EXIM query cost on a multi-million-row customs extract.
+
+Generates a synthetic CSV (2M rows by default; pass a row count to change it)
+in a temp directory and compares:
+
+* the old path: ``pd.read_csv`` + ``str.lower()`` filter + sums per query
+* TradeStore cold load (CSV parse + aggregation + binary cache write)
+* TradeStore warm load (binary cache only)
+* TradeStore per-query latency
+
+    python -m benchmarks.bench_exim_store [rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datastore.exim import TradeStore
+
+
+N_DRUGS = 5_000
+REGIONS = ["US", "EU", "APAC", "LATAM", "MEA", "India", "China", "Japan"]
+BARRIERS = ["None", "None", "None", "Regulatory delays", "Documentation requirements"]
+
+
+def write_extract(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "drug_name": np.char.add("Drug ", rng.integers(0, N_DRUGS, rows).astype(str)),
+        "region": rng.choice(REGIONS, rows),
+        "import_kg": rng.integers(0, 10_000, rows),
+        "export_kg": rng.integers(0, 10_000, rows),
+        "tariff_pct": rng.random(rows).round(3) / 10,
+        "barriers": rng.choice(BARRIERS, rows),
+    }).to_csv(path, index=False)
+
+
+def old_query(csv_path: Path, drug_name: str):
+    df = pd.read_csv(csv_path)
+    drug_df = df[df["drug_name"].str.lower() == drug_name.lower()]
+    return int(drug_df["import_kg"].sum()), int(drug_df["export_kg"].sum()), float(drug_df["tariff_pct"].mean())
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "exim_data.csv"
+        print(f"generating {rows:,} rows...")
+        write_extract(csv_path, rows)
+
+        old, old_ms = timed(lambda: old_query(csv_path, "drug 42"))
+        _, cold_ms = timed(lambda: TradeStore.load(csv_path))
+        store, warm_ms = timed(lambda: TradeStore.load(csv_path))
+
+        summary = store.query("drug 42", [])
+        assert (summary.import_volume_kg, summary.export_volume_kg) == old[:2]
+        assert abs(summary.tariff_impact_pct - old[2]) < 1e-9
+
+        queries = 10_000
+        names = [f"Drug {i % N_DRUGS}" for i in range(queries)]
+        _, query_ms = timed(lambda: [store.query(n, ["US", "EU", "India"]) for n in names])
+
+    print(f"old path, per query (read_csv + filter):  {old_ms:10.1f} ms")
+    print(f"TradeStore cold load (parse + cache):     {cold_ms:10.1f} ms")
+    print(f"TradeStore warm load (binary cache):      {warm_ms:10.1f} ms")
+    print(f"TradeStore query, 3 regions:              {query_ms / queries * 1000:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
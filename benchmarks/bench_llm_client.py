@@ -0,0 +1,192 @@
+"""Gemini client resilience against a scripted fake model.
+
+Each scenario injects a fake model (``generate_content_async``, the only
+method the client calls) whose calls fail, hang or answer in a scripted
+order, and checks what the client and the summarizer do:
+
+- retry: 503s before a success are retried with backoff
+- timeout: a hung call is abandoned after ``timeout``, retried, then given up
+  on, and ``summarize`` falls back to the data-only summary
+- breaker: consecutive failed calls open the circuit (a call counts once,
+  however many attempts it retried), further calls are rejected without
+  reaching the model until the cooldown, then one trial call closes it again
+- abandoned trial: a half-open trial call that is cancelled, or a stream the
+  consumer drops, doesn't leave the circuit stuck
+- streaming: a failure before the first chunk is retried
+- concurrency: many summaries in flight on the LLM loop, limited by the
+  client's semaphore, without a thread each
+
+    python -m benchmarks.bench_llm_client
+"""
+import asyncio
+import threading
+import time
+from typing import Any, List
+
+from agents.master_agent import parse_query
+from llm import gemini_summarizer
+from llm.client import CircuitBreaker, CircuitOpenError, GeminiClient, LLMUnavailableError, set_client, submit
+
+
+TIMEOUT = 0.2
+LATENCY = 0.1
+CONCURRENT = 16
+MAX_CALLS = 4
+AGGREGATED = {"query_context": parse_query("Market outlook for Drug X in oncology"), "worker_results": {}}
+
+
+class ServiceUnavailable(Exception):
+    code = 503
+
+
+class Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """Each call takes the next step of ``script``: an exception to raise,
+    ``"hang"`` to never answer, or text to answer with (the default once the
+    script runs out)."""
+
+    def __init__(self, script: List[Any] = (), latency: float = 0.0):
+        self.script = list(script)
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, stream=False, request_options=None):
+        self.calls += 1
+        step = self.script.pop(0) if self.script else "summary text"
+        if step == "hang":
+            await asyncio.sleep(3600)
+        if isinstance(step, Exception):
+            raise step
+        await asyncio.sleep(self.latency)
+        return self._stream(step) if stream else Response(step)
+
+    async def _stream(self, text: str):
+        for word in text.split(" "):
+            yield Response(word + " ")
+
+
+def client(model: FakeModel, **kwargs) -> GeminiClient:
+    options = {"timeout": TIMEOUT, "max_retries": 3, "backoff_base": 0.01, "max_concurrency": MAX_CALLS}
+    return GeminiClient(model=model, **{**options, **kwargs})
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def retry() -> None:
+    model = FakeModel([ServiceUnavailable("503"), ServiceUnavailable("503")])
+    text, ms = timed(lambda: client(model).generate("prompt"))
+    assert text == "summary text" and model.calls == 3, (text, model.calls)
+    print(f"retry:                 2 x 503 then success, {model.calls} calls, {ms:.0f} ms")
+
+
+def timeout() -> None:
+    model = FakeModel(["hang"] * 4)
+    set_client(client(model))
+    try:
+        output, ms = timed(lambda: gemini_summarizer.summarize(AGGREGATED))
+    finally:
+        set_client(None)
+    assert output.get("fallback") and model.calls == 4, (output, model.calls)
+    print(f"timeout:               {model.calls} hung calls of {TIMEOUT:g} s, data-only fallback after {ms:.0f} ms")
+
+
+def breaker() -> None:
+    model = FakeModel([ServiceUnavailable("503")] * 4)
+    gemini = client(model, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=0.3))
+    try:
+        gemini.generate("prompt")
+    except LLMUnavailableError:
+        pass
+    assert model.calls == 4 and gemini.breaker.state == "closed", (model.calls, gemini.breaker.state)
+
+    model = FakeModel([ValueError("bad request")] * 3)
+    gemini = client(model, breaker=CircuitBreaker(failure_threshold=3, reset_seconds=0.3))
+    for _ in range(3):
+        try:
+            gemini.generate("prompt")
+        except LLMUnavailableError:
+            pass
+    assert gemini.breaker.state == "open", gemini.breaker.state
+
+    set_client(gemini)
+    try:
+        output, ms = timed(lambda: gemini_summarizer.summarize(AGGREGATED))
+        assert output.get("fallback") and model.calls == 3, (output, model.calls)
+        try:
+            gemini.generate("prompt")
+            raise AssertionError("call went through an open circuit")
+        except CircuitOpenError:
+            pass
+        time.sleep(0.3)
+        assert gemini.breaker.state == "half_open", gemini.breaker.state
+        assert gemini_summarizer.summarize(AGGREGATED)["summary"] == "summary text"
+    finally:
+        set_client(None)
+    assert gemini.breaker.state == "closed" and model.calls == 4, (gemini.breaker.state, model.calls)
+    print(f"breaker:               a call retried 4 times counts once; open after 3 failed calls, fallback in {ms:.1f} ms without calling the model, "
+          f"closed by the trial call")
+
+
+def abandoned_trial() -> None:
+    async def first_chunk(gemini: GeminiClient) -> None:
+        async for _ in gemini.generate_stream_async("prompt"):
+            return
+
+    model = FakeModel([ValueError("bad request"), "hang"])
+    gemini = client(model, breaker=CircuitBreaker(failure_threshold=1, reset_seconds=0.1))
+    try:
+        gemini.generate("prompt")
+    except LLMUnavailableError:
+        pass
+    time.sleep(0.1)
+    future = submit(first_chunk(gemini))  # the half-open trial, hung before any text
+    time.sleep(0.05)
+    future.cancel()
+    time.sleep(0.05)
+    assert gemini.breaker.state == "half_open" and gemini.breaker.allow(), "cancelled trial kept the circuit blocked"
+    gemini.breaker.record_abandoned()
+
+    stream = gemini.generate_stream("prompt")
+    next(stream)
+    stream.close()  # consumer stops after the first chunk: the model answered
+    assert gemini.breaker.state == "closed", gemini.breaker.state
+    print(f"abandoned trial:       cancelled trial frees the half-open slot, dropped stream closes the circuit")
+
+
+def streaming() -> None:
+    model = FakeModel([ServiceUnavailable("503"), "streamed summary text"])
+    chunks = list(client(model).generate_stream("prompt"))
+    assert "".join(chunks).strip() == "streamed summary text" and model.calls == 2, (chunks, model.calls)
+    print(f"streaming:             503 before the first chunk retried, {len(chunks)} chunks")
+
+
+def concurrency() -> None:
+    model = FakeModel(latency=LATENCY)
+    gemini = client(model)
+    submit(asyncio.sleep(0)).result()  # start the LLM loop
+    threads = threading.active_count()
+    start = time.perf_counter()
+    futures = [submit(gemini.generate_async("prompt")) for _ in range(CONCURRENT)]
+    peak = threading.active_count()
+    assert all(future.result() == "summary text" for future in futures)
+    ms = (time.perf_counter() - start) * 1000
+    assert peak == threads, (threads, peak)
+    print(f"concurrency:           {CONCURRENT} calls of {LATENCY:g} s, {MAX_CALLS} at a time, in {ms:.0f} ms "
+          f"on {peak} threads (no extra thread per call)")
+
+
+def main() -> None:
+    for scenario in (retry, timeout, breaker, abandoned_trial, streaming, concurrency):
+        scenario()
+
+
+if __name__ == "__main__":
+    main()
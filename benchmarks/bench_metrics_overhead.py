@@ -0,0 +1,61 @@
+"""Cost of the instrumentation layer per call.
+
+Times a trivial function plain and wrapped by ``instrument`` (one histogram
+observation, two gauge updates), then a real agent ``process`` call with and
+without its wrapper, so the overhead can be read against actual work. The
+agent's unwrapped function is reached through ``__wrapped__``. Nothing is
+scraped during the run; rendering ``/metrics`` is timed separately.
+
+    python -m benchmarks.bench_metrics_overhead [N]
+"""
+import sys
+import time
+
+from agents import iqvia_agent
+from agents.master_agent import parse_query
+from telemetry import instrument, metrics
+
+
+def noop(x):
+    return x
+
+
+def time_calls(fn, arg, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(arg)
+    return (time.perf_counter() - start) / n
+
+
+def best_of(fn, arg, n: int, rounds: int = 5) -> float:
+    return min(time_calls(fn, arg, n) for _ in range(rounds))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    wrapped_noop = instrument("bench", "noop")(noop)
+
+    plain = best_of(noop, 1, n)
+    wrapped = best_of(wrapped_noop, 1, n)
+    print(f"calls:                 {n} x 5 rounds (best round)")
+    print(f"noop, plain:           {plain * 1e6:7.3f} us/call")
+    print(f"noop, instrumented:    {wrapped * 1e6:7.3f} us/call  (+{(wrapped - plain) * 1e6:.3f} us)")
+
+    context = parse_query("Market analysis for Keytruda in India")
+    process = iqvia_agent.process
+    unwrapped = getattr(process, "__wrapped__", process)
+    process(context)  # warm the dataset cache
+    agent_n = max(1, n // 10)
+    agent_plain = best_of(unwrapped, context, agent_n)
+    agent_wrapped = best_of(process, context, agent_n)
+    print(f"iqvia agent, plain:    {agent_plain * 1e6:7.3f} us/call")
+    print(f"iqvia agent, wrapped:  {agent_wrapped * 1e6:7.3f} us/call  "
+          f"({(agent_wrapped - agent_plain) / agent_plain * 100:+.1f}%)")
+
+    start = time.perf_counter()
+    text = metrics.render()
+    print(f"scrape:                {(time.perf_counter() - start) * 1000:7.3f} ms  ({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Fan-out benchmark for the worker agents.
+
+Each agent's ``process`` is replaced with a fixed-latency stand-in (the
+latencies a real data backend would add), the summarizer and report step are
+stubbed out, and the full graph is run. With the fan-out topology the
+end-to-end time should track the slowest agent, not the sum of all six.
+
+    python -m benchmarks.bench_parallel_agents
+"""
+import statistics
+import time
+from unittest import mock
+
+from orchestration import graph
+
+
+# Simulated backend latency per agent, in seconds.
+AGENT_LATENCY = {
+    "iqvia": 0.20,
+    "exim": 0.15,
+    "patent": 0.10,
+    "clinical_trials": 0.25,
+    "internal_knowledge": 0.05,
+    "web_intelligence": 0.30,
+}
+
+QUERY = "Market, trade, patent, clinical trial, internal budget and news outlook for Drug X"
+RUNS = 5
+
+
+def _fake_process(agent: str, latency: float):
+    def process(query_context):
+        time.sleep(latency)
+        return {"agent": agent, "data": {}, "timestamp": ""}
+    return process
+
+
+def main():
+    patches = [
+        mock.patch.object(getattr(graph, f"{agent}_agent"), "process", _fake_process(agent, latency))
+        for agent, latency in AGENT_LATENCY.items()
+    ]
+    patches.append(mock.patch.object(graph, "summarize_stream", lambda data: iter(["stub"])))
+    patches.append(mock.patch.object(graph.report_store, "save", lambda summary, data: ""))
+
+    for p in patches:
+        p.start()
+    try:
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            result = graph.run_workflow(QUERY)
+            timings.append(time.perf_counter() - start)
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert sorted(result["worker_results"]) == sorted(AGENT_LATENCY), result["worker_results"].keys()
+
+    serial = sum(AGENT_LATENCY.values())
+    slowest = max(AGENT_LATENCY.values())
+    median = statistics.median(timings)
+    print(f"agents:                {len(AGENT_LATENCY)}")
+    print(f"sum of agent latency:  {serial * 1000:7.1f} ms  (serial chain)")
+    print(f"slowest agent:         {slowest * 1000:7.1f} ms")
+    print(f"end-to-end (median):   {median * 1000:7.1f} ms  over {RUNS} runs")
+    print(f"speedup vs serial:     {serial / median:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""PDF rendering throughput: inline on the request threads vs the process pool.
+
+N reports are requested at once from N threads (as N concurrent /analyze
+jobs would) and the wall time is measured with rendering inline
+(``MEDNEXA_PDF_WORKERS=0``) and in the process pool. Inline rendering is
+serialized by the GIL; the pool spreads it across cores, so the speedup
+tracks the number of cores available. A ticker thread stands in for the
+rest of the server: its worst delay shows how long rendering starves
+other work in the same process.
+
+    python -m benchmarks.bench_pdf_pool [N]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from reports.pool import PdfPool
+from reports import generator
+
+
+SUMMARY = "\n".join(
+    ["## Executive Summary", "Market for the drug is growing steadily across regions."]
+    + [f"- Key finding {i}: growth of {i}.{i}% with competitive pressure." for i in range(30)]
+)
+AGGREGATED = {
+    "query_context": {
+        "original_query": "Full outlook for Trastuzumab",
+        "extracted_entities": {"drug_name": "Trastuzumab", "therapeutic_area": "oncology", "regions": ["US", "EU"]},
+    },
+    "worker_results": {
+        "iqvia": {"status": "success", "data": {
+            "market_size_usd": 7_200_000_000, "growth_rate_cagr": 0.061,
+            "competitor_share": {f"Competitor {i}": 0.05 for i in range(12)},
+        }},
+        "patent": {"status": "success", "data": {"active_patents": 14, "competitor_filings": 9, "exclusivity_window_years": 4}},
+        "clinical_trials": {"status": "success", "data": {
+            "total_trials": 120, "completion_rate": 0.7, "competitive_trials": 33,
+            "phase_distribution": {"phase_1": 30, "phase_2": 40, "phase_3": 35, "phase_4": 15},
+        }},
+        "web_intelligence": {"status": "success", "data": {
+            "sentiment_score": 0.4, "news_mentions": 310,
+            "regulatory_updates": [f"Update {i}" for i in range(10)],
+        }},
+    },
+}
+
+
+def run(pool: PdfPool, n: int, out_dir: str):
+    """Wall time for ``n`` concurrent reports and the ticker's worst delay."""
+    stop = threading.Event()
+    worst = [0.0]
+
+    def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            worst[0] = max(worst[0], now - last)
+            last = now
+
+    tick = threading.Thread(target=ticker)
+    tick.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n) as threads:
+        futures = [
+            threads.submit(pool.render, SUMMARY, AGGREGATED, os.path.join(out_dir, f"report_{i}.pdf"))
+            for i in range(n)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    tick.join()
+    return elapsed, worst[0]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    out_dir = tempfile.mkdtemp(prefix="mednexa-pdf-bench-")
+    try:
+        # Warm-up: reportlab imports and font setup in this process
+        generator.render_pdf(SUMMARY, AGGREGATED, os.path.join(out_dir, "warmup.pdf"))
+
+        inline, inline_stall = run(PdfPool(max_workers=0), n, out_dir)
+
+        pool = PdfPool(max_workers=os.cpu_count() or 1)
+        pool.warm()
+        try:
+            pooled, pooled_stall = run(pool, n, out_dir)
+        finally:
+            pool.shutdown(wait=True)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    print(f"cores:                 {os.cpu_count()}")
+    print(f"concurrent reports:    {n}")
+    print(f"inline:                {inline * 1000:8.1f} ms  ({n / inline:6.1f} reports/s)")
+    print(f"process pool:          {pooled * 1000:8.1f} ms  ({n / pooled:6.1f} reports/s)")
+    print(f"speedup:               {inline / pooled:8.2f}x")
+    print(f"worst stall, inline:   {inline_stall * 1000:8.1f} ms")
+    print(f"worst stall, pool:     {pooled_stall * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Prompt size before and after the compact prompt builder.
+
+Payloads: every drug in data/ with all six agents (representative), plus a
+large synthetic payload (long prescription history, many regulatory updates
+and rumors) that exercises the token budget. "Before" is the previous prompt,
+which embedded ``json.dumps(aggregated_data, indent=2)``.
+
+    python -m benchmarks.bench_prompt
+"""
+import json
+
+from agents.master_agent import parse_query
+from contracts.results import AggregatedData
+from llm.prompt import INSTRUCTIONS, build_prompt, estimate_tokens
+from orchestration.graph import WORKER_NODES
+
+
+ALL_AGENTS_QUERY = "market sales, trade exports, patents, clinical trials, internal budget and news for {drug}"
+DRUGS = ["Drug X", "Drug A", "Drug M"]
+
+
+def aggregate(query: str):
+    query_context = parse_query(query)
+    worker_results = {}
+    for node in WORKER_NODES.values():
+        worker_results.update(node({"query_context": query_context})["worker_results"])
+    return AggregatedData(query_context=query_context, worker_results=worker_results).to_dict()
+
+
+def large_payload():
+    data = aggregate(ALL_AGENTS_QUERY.format(drug="Drug X"))
+    results = data["worker_results"]
+    results["iqvia"]["data"]["prescription_trends"] = [
+        {"year": 1990 + i, "prescriptions": 100_000 + i * 731} for i in range(36)
+    ]
+    results["web_intelligence"]["data"]["regulatory_updates"] = [
+        f"Regulatory update {i}: agency guidance on labeling and post-marketing commitments" for i in range(60)
+    ]
+    results["web_intelligence"]["data"]["market_rumors"] = [
+        f"Rumor {i}: possible partnership discussions reported by trade press" for i in range(60)
+    ]
+    return data
+
+
+def old_prompt(aggregated_data) -> str:
+    return INSTRUCTIONS + json.dumps(aggregated_data, indent=2) + "\n"
+
+
+def main():
+    payloads = [(drug, aggregate(ALL_AGENTS_QUERY.format(drug=drug))) for drug in DRUGS]
+    payloads.append(("large synthetic", large_payload()))
+
+    print(f"{'payload':<16} {'old bytes':>10} {'new bytes':>10} {'old tok':>8} {'new tok':>8} {'saved':>6}  trimmed")
+    for name, data in payloads:
+        before = old_prompt(data)
+        after = build_prompt(data)
+        old_tokens = estimate_tokens(before)
+        saved = 1 - after.est_tokens / old_tokens
+        print(
+            f"{name:<16} {len(before.encode()):>10} {after.bytes:>10} "
+            f"{old_tokens:>8} {after.est_tokens:>8} {saved:>6.0%}  {', '.join(after.trimmed) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Queries/sec of the single-pass query matcher.
+
+Compares the previous approach (six ``any(keyword in query)`` scans plus the
+separate area/region/drug/year extractors) with ``QueryMatcher.match`` loaded
+with the real keyword tables, and again with a synthetic catalogue of
+thousands of drug names and synonyms, which should not slow per-query parsing.
+
+    python -m benchmarks.bench_query_matcher
+"""
+import re
+import time
+
+from agents.master_agent import THERAPEUTIC_AREAS, REGIONS
+from orchestration.matcher import AGENT, AREA, DRUG, REGION, QueryMatcher, build_matcher
+from orchestration.router import AGENT_KEYWORDS
+
+
+QUERIES = [
+    "What is the market potential for Drug X in oncology?",
+    "Compare patent expiry and clinical trial pipeline for Trastuzumab in Europe and Asia Pacific 2025 to 2030",
+    "Import and export tariffs for Drug M in the USA",
+    "Internal R&D budget and manufacturing capacity forecast for Drug A",
+    "Latest news, sentiment and regulatory updates on competitors in cardiology worldwide",
+    "Where is the unmet need in neurology over 2026-2032?",
+]
+ROUNDS = 2_000
+CATALOGUE_SIZES = [5_000, 50_000]
+
+OLD_DRUG_PATTERNS = [
+    r'\b(Drug\s*[A-Z])\b',
+    r'\b([A-Z][a-z]+(?:mab|nib|lib|tib|zumab|tinib))\b',
+    r'\b([A-Z][a-z]+(?:cept|vir|pril|sartan))\b',
+]
+
+
+def old_parse(query: str):
+    query_lower = query.lower()
+    agents = [a for a, kws in AGENT_KEYWORDS.items() if any(k in query_lower for k in kws)]
+    area = next((a for a in THERAPEUTIC_AREAS if a in query_lower), None)
+    regions = []
+    for keyword, region in REGIONS.items():
+        if keyword in query_lower and region not in regions:
+            regions.append(region)
+    drug = None
+    for pattern in OLD_DRUG_PATTERNS:
+        match = re.search(pattern, query, re.IGNORECASE)
+        if match:
+            drug = match.group(1)
+            break
+    years = re.findall(r'\b(20\d{2})\b', query)
+    return agents, area, regions, drug, years
+
+
+def synthetic_matcher(size: int) -> QueryMatcher:
+    terms = {}
+    for agent, keywords in AGENT_KEYWORDS.items():
+        for keyword in keywords:
+            terms.setdefault(keyword, []).append((AGENT, agent))
+    for area in THERAPEUTIC_AREAS:
+        terms.setdefault(area, []).append((AREA, area))
+    for keyword, region in REGIONS.items():
+        terms.setdefault(keyword, []).append((REGION, region))
+    # Each molecule has a brand name and an INN-style synonym
+    for i in range(size // 3):
+        name = f"Molecule {i:05d}"
+        for term in (name, f"Brandex{i:05d}", f"inn {i:05d} sodium"):
+            terms.setdefault(term, []).append((DRUG, name))
+    return QueryMatcher(terms)
+
+
+def queries_per_sec(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            fn(query)
+    return ROUNDS * len(QUERIES) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'variant':<38} {'terms':>7} {'build ms':>9} {'queries/sec':>12}")
+    print(f"{'old: substring scans + 4 extractors':<38} {'-':>7} {'-':>9} {queries_per_sec(old_parse):>12,.0f}")
+
+    start = time.perf_counter()
+    matcher = build_matcher()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{'matcher: data/ tables':<38} {len(matcher):>7} {build_ms:>9.1f} {queries_per_sec(matcher.match):>12,.0f}")
+
+    for size in CATALOGUE_SIZES:
+        start = time.perf_counter()
+        matcher = synthetic_matcher(size)
+        build_ms = (time.perf_counter() - start) * 1000
+        hits = matcher.match("Pricing for brandex00042 vs Molecule 00007 in the EU")
+        assert hits.drugs == ["Molecule 00042", "Molecule 00007"], hits
+        print(f"{'matcher: synthetic catalogue':<38} {len(matcher):>7} {build_ms:>9.1f} {queries_per_sec(matcher.match):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
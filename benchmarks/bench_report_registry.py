@@ -0,0 +1,67 @@
+"""Report lookup: the old ``iterdir`` scan of outputs/ vs the SQLite registry.
+
+The old /download-pdf handled a miss by listing every file in outputs/ and
+trying exact, then substring, matches, so each lookup cost O(files). The
+registry answers with a primary-key read. N empty report files are created
+in a temporary directory and both lookups are timed.
+
+    python -m benchmarks.bench_report_registry [N]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from reports.registry import ReportRegistry
+
+
+LOOKUPS = 200
+
+
+def scan_lookup(directory: Path, filename: str):
+    # What download_pdf used to do when the exact path was missing
+    candidates = [p for p in directory.iterdir() if p.is_file()]
+    for p in candidates:
+        if p.name == filename:
+            return p
+    for p in candidates:
+        if filename in p.name or p.name in filename:
+            return p
+    return None
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    root = Path(tempfile.mkdtemp(prefix="mednexa-registry-bench-"))
+    try:
+        registry = ReportRegistry(root / "registry.sqlite3")
+        ids = [f"{i:064x}" for i in range(n)]
+        start = time.perf_counter()
+        for report_id in ids:
+            (root / f"{report_id}.pdf").touch()
+            registry.add(report_id, f"{report_id}.json", 0)
+        setup = time.perf_counter() - start
+
+        targets = [ids[(i * 7919) % n] for i in range(LOOKUPS)]
+        start = time.perf_counter()
+        for report_id in targets:
+            assert scan_lookup(root, f"{report_id}.pdf") is not None
+        scan = (time.perf_counter() - start) / LOOKUPS
+
+        start = time.perf_counter()
+        for report_id in targets:
+            assert registry.get(report_id) is not None
+        indexed = (time.perf_counter() - start) / LOOKUPS
+        registry.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"reports:               {n}  (setup {setup:.1f}s)")
+    print(f"iterdir scan:          {scan * 1e6:10.1f} us/lookup")
+    print(f"registry:              {indexed * 1e6:10.1f} us/lookup")
+    print(f"speedup:               {scan / indexed:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Single-core report rendering throughput, with and without the cached
+report templates.
+
+"Before" clears the style and table-style caches ahead of every report, so
+each report rebuilds ``getSampleStyleSheet()``, the six report styles and a
+fresh ``TableStyle`` per table as ``generate_pdf`` used to. "After" uses the
+templates built once. Story construction (``build_elements``, where the
+templates are used) and the full render are timed separately, in CPU time
+and interleaved rounds so other load on the machine mostly cancels out.
+Everything runs in one thread, so the figures are per core.
+
+    python -m benchmarks.bench_report_render [N]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from reports import templates
+from reports.generator import build_elements, render_pdf
+from benchmarks.bench_pdf_pool import SUMMARY, AGGREGATED
+
+
+ROUNDS = 5
+
+
+def clear_templates() -> None:
+    templates.get_styles.cache_clear()
+    templates.get_table_style.cache_clear()
+
+
+def time_story(n: int, cached: bool) -> float:
+    start = time.process_time()
+    for _ in range(n):
+        if not cached:
+            clear_templates()
+        build_elements(SUMMARY, AGGREGATED)
+    return (time.process_time() - start) / n
+
+
+def time_render(n: int, out_dir: str, cached: bool) -> float:
+    start = time.process_time()
+    for i in range(n):
+        if not cached:
+            clear_templates()
+        render_pdf(SUMMARY, AGGREGATED, os.path.join(out_dir, f"report_{i}.pdf"))
+    return (time.process_time() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    out_dir = tempfile.mkdtemp(prefix="mednexa-render-bench-")
+    story = {False: [], True: []}
+    render = {False: [], True: []}
+    try:
+        time_render(5, out_dir, cached=True)  # warm-up: imports, font metrics
+        for _ in range(ROUNDS):
+            for cached in (False, True):
+                story[cached].append(time_story(n * 4, cached))
+                render[cached].append(time_render(n, out_dir, cached))
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    story_before, story_after = min(story[False]), min(story[True])
+    before, after = min(render[False]), min(render[True])
+    print(f"reports:               {n} x {ROUNDS} rounds (best round, CPU time)")
+    print(f"story, before:         {story_before * 1000:7.3f} ms/report")
+    print(f"story, after:          {story_after * 1000:7.3f} ms/report  ({story_before / story_after:.1f}x)")
+    print(f"render, before:        {1 / before:7.1f} reports/s/core  ({before * 1000:.2f} ms/report)")
+    print(f"render, after:         {1 / after:7.1f} reports/s/core  ({after * 1000:.2f} ms/report)")
+    print(f"speedup:               {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Concurrent, differently worded queries with and without the response cache.
+
+Runs ``app.run_query`` (what ``/analyze`` jobs call) on real datasets in
+data/, with the stub summarizer (``STUB_DELAY`` seconds per summary, 0.5 by
+default), the summary cache off and reports saved to a temporary directory.
+
+Burst: C threads at once, each asking one of the WORDINGS, which all parse to
+the same query context. Without the cache every thread runs the workflow;
+with it one does and the others wait for its response. Repeat: the same
+wordings one after another once the response is cached.
+
+    python -m benchmarks.bench_response_cache [STUB_DELAY]
+"""
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+import app
+import llm
+from llm import gemini_summarizer, stub_summarizer
+from orchestration import graph
+from orchestration.response_cache import ResponseCache
+from reports.store import ReportStore
+
+
+WORDINGS = [
+    "What is the market potential for Drug X in oncology?",
+    "Drug X oncology market potential",
+    "How big is the oncology market for Drug X?",
+    "market potential of drug x in oncology",
+]
+CONCURRENCY = [1, 4, 16]
+REPEATS = 200
+
+
+def burst(threads: int) -> Dict[str, float]:
+    """Start ``threads`` queries together; wall time and per-query latency."""
+    barrier = threading.Barrier(threads)
+    latencies: List[float] = []
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        start = time.perf_counter()
+        app.run_query(WORDINGS[i % len(WORDINGS)], event_sink=lambda event: None)
+        latencies.append(time.perf_counter() - start)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return {"wall": time.perf_counter() - start, "p50": statistics.median(latencies), "max": max(latencies)}
+
+
+def main(argv: List[str]) -> None:
+    delay = float(argv[0]) if argv else 0.5
+    runs = {"count": 0}
+    run_workflow = graph.run_workflow
+
+    def counted(*args, **kwargs):
+        runs["count"] += 1
+        return run_workflow(*args, **kwargs)
+
+    with tempfile.TemporaryDirectory(prefix="mednexa-response-cache-") as reports_dir, \
+            mock.patch.object(llm, "LLM_BACKEND", "gemini"), \
+            mock.patch.object(llm, "SUMMARY_CACHE_ENABLED", False), \
+            mock.patch.object(stub_summarizer, "STUB_DELAY", delay), \
+            mock.patch.object(gemini_summarizer, "summarize", stub_summarizer.summarize), \
+            mock.patch.object(gemini_summarizer, "summarize_stream", stub_summarizer.summarize_stream), \
+            mock.patch.object(graph, "report_store", ReportStore(root=Path(reports_dir))), \
+            mock.patch.object(app, "run_workflow", counted):
+        with mock.patch.object(stub_summarizer, "STUB_DELAY", 0):
+            counted("Drug A market outlook", event_sink=lambda event: None)  # compile the graph and load datasets
+
+        print(f"burst:                 {len(WORDINGS)} wordings of one query, stub LLM (delay {delay:g} s)")
+        print(f"{'threads':>8}{'cache':>7}{'workflows':>11}{'wall s':>9}{'p50 s':>8}{'max s':>8}")
+        for threads in CONCURRENCY:
+            for enabled in (False, True):
+                cache = ResponseCache()
+                runs["count"] = 0
+                with mock.patch.object(app, "RESPONSE_CACHE_ENABLED", enabled), \
+                        mock.patch.object(app, "response_cache", cache):
+                    result = burst(threads)
+                print(f"{threads:8d}{'on' if enabled else 'off':>7}{runs['count']:11d}"
+                      f"{result['wall']:9.3f}{result['p50']:8.3f}{result['max']:8.3f}")
+            stats = cache.stats()
+            assert runs["count"] == 1 and stats["coalesced"] == threads - 1, stats
+
+        cache = ResponseCache()
+        with mock.patch.object(app, "response_cache", cache):
+            app.run_query(WORDINGS[0], event_sink=lambda event: None)
+            start = time.perf_counter()
+            for i in range(REPEATS):
+                app.run_query(WORDINGS[i % len(WORDINGS)], event_sink=lambda event: None)
+            hit_ms = (time.perf_counter() - start) / REPEATS * 1000
+        print(f"repeat:                {hit_ms:.3f} ms per cached query ({cache.stats()['hits']} hits)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
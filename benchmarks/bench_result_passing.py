@@ -0,0 +1,236 @@
+"""Cost of moving agent results through the workflow, before and after typed
+results.
+
+"Before" reproduces the previous path: each agent built a pydantic
+``AgentOutput`` around a dict and returned ``model_dump()``, and the
+aggregator wrapped the six dicts in ``AggregatedData`` and ``model_dump()``-ed
+them again. "After" is the current path: the real agents return frozen
+``AgentResult`` objects, the aggregator keeps them by reference, and
+``to_dict()`` runs once when a boundary (prompt, cache key, report store)
+first needs it. That boundary serialization is included in "after", so both
+sides end with the same plain dict.
+
+The agents read large synthetic records (long prescription history, many
+competitors, patents and regulatory updates) so the copies show. Time is
+CPU time per cycle (six agents, aggregation and serialization), and memory
+is traced with tracemalloc over one cycle.
+
+    python -m benchmarks.bench_result_passing [N]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+from unittest import mock
+
+from pydantic import BaseModel, Field
+
+from agents import (
+    cube,
+    iqvia_agent,
+    exim_agent,
+    patent_agent,
+    clinical_trials_agent,
+    internal_knowledge_agent,
+    web_intelligence_agent,
+)
+from contracts.results import AggregatedData
+from datastore import TradeSummary
+
+
+SIZE = 400
+
+RECORDS = {
+    "iqvia": {
+        "market_size_usd": 4_200_000_000,
+        "growth_rate": 0.071,
+        "prescriptions": [{"year": 1900 + i % 125, "count": 10_000 + i} for i in range(SIZE)],
+        "competitors": {f"Competitor {i}": round(1 / (i + 2), 4) for i in range(SIZE)},
+    },
+    "patent": {
+        "active_patents": SIZE,
+        "expiring_patents": [{"id": f"US{9_000_000 + i}", "expiry": f"20{30 + i % 20}-01-01"} for i in range(SIZE)],
+        "competitor_filings": 37,
+        "exclusivity_years": 6,
+    },
+    "clinical_trials": {
+        "total_trials": 120,
+        "trials": {"phase_1": 40, "phase_2": 35, "phase_3": 30, "phase_4": 15},
+        "completion_rate": 0.74,
+        "competitive_trials": 22,
+    },
+    "internal_knowledge": {
+        "rd_budget": 250_000_000,
+        "capacity_units": 1_500_000,
+        "forecast_2025": 900_000_000,
+        "priority": "high",
+    },
+    "web_intelligence": {
+        "sentiment": 0.42,
+        "news_count": 5_000,
+        "regulatory": [f"Regulatory update {i}: revised labeling guidance" for i in range(SIZE)],
+        "rumors": [f"Rumor {i}: partnership talks reported" for i in range(SIZE)],
+    },
+}
+TRADE = TradeSummary(
+    import_volume_kg=120_000,
+    export_volume_kg=98_000,
+    top_exporters=[f"Exporter {i}" for i in range(SIZE // 4)],
+    tariff_impact_pct=0.052,
+    trade_barriers=[f"Barrier {i}" for i in range(SIZE // 4)],
+    regions=["US", "EU", "APAC"],
+)
+
+QUERY_CONTEXT = {
+    "original_query": "Full outlook for Drug X",
+    "extracted_entities": {"drug_name": "Drug X", "therapeutic_area": "oncology", "regions": ["US", "EU"], "timeframe": None},
+    "required_agents": list(RECORDS) + ["exim"],
+}
+
+
+class _Index:
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+
+    def lookup_many(self, names: List[str]) -> List[Dict[str, Any]]:
+        return [self.record for _ in names]
+
+
+class _Trade:
+    def query_many(self, drugs: List[str], regions: List[str]) -> List[TradeSummary]:
+        return [TRADE for _ in drugs]
+
+
+# The previous pydantic result models and agent bodies, for "before"
+class LegacyAgentOutput(BaseModel):
+    agent: str
+    data: Dict[str, Any]
+    status: str = "success"
+    message: str = None
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+
+class LegacyAggregatedData(BaseModel):
+    query_context: Dict[str, Any]
+    worker_results: Dict[str, Any]
+    aggregation_timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+
+def legacy_results() -> Dict[str, Dict[str, Any]]:
+    iqvia, patent, trials = RECORDS["iqvia"], RECORDS["patent"], RECORDS["clinical_trials"]
+    internal, web = RECORDS["internal_knowledge"], RECORDS["web_intelligence"]
+    phases = trials["trials"]
+    outputs = [
+        LegacyAgentOutput(agent="iqvia", data={
+            "market_size_usd": iqvia["market_size_usd"],
+            "growth_rate_cagr": iqvia["growth_rate"],
+            "prescription_trends": [{"year": p["year"], "prescriptions": p["count"]} for p in iqvia["prescriptions"]],
+            "competitor_share": iqvia["competitors"],
+        }),
+        LegacyAgentOutput(agent="exim", data={
+            "import_volume_kg": TRADE.import_volume_kg,
+            "export_volume_kg": TRADE.export_volume_kg,
+            "top_exporters": TRADE.top_exporters,
+            "tariff_impact_pct": round(TRADE.tariff_impact_pct, 4),
+            "trade_barriers": TRADE.trade_barriers,
+            "regions": TRADE.regions,
+        }),
+        LegacyAgentOutput(agent="patent", data={
+            "active_patents": patent["active_patents"],
+            "expiring_soon": [{"patent_id": p["id"], "expiry_date": p["expiry"]} for p in patent["expiring_patents"]],
+            "competitor_filings": patent["competitor_filings"],
+            "exclusivity_window_years": patent["exclusivity_years"],
+        }),
+        LegacyAgentOutput(agent="clinical_trials", data={
+            "total_trials": trials["total_trials"],
+            "phase_distribution": {key: phases[key] for key in ("phase_1", "phase_2", "phase_3", "phase_4")},
+            "completion_rate": trials["completion_rate"],
+            "competitive_trials": trials["competitive_trials"],
+        }),
+        LegacyAgentOutput(agent="internal_knowledge", data={
+            "rd_budget_usd": internal["rd_budget"],
+            "manufacturing_capacity_units_per_year": internal["capacity_units"],
+            "forecast_revenue_2025_usd": internal["forecast_2025"],
+            "strategic_priority": internal["priority"],
+        }),
+        LegacyAgentOutput(agent="web_intelligence", data={
+            "sentiment_score": web["sentiment"],
+            "news_mentions": web["news_count"],
+            "regulatory_updates": web["regulatory"],
+            "market_rumors": web["rumors"],
+        }),
+    ]
+    return {output.agent: output.model_dump() for output in outputs}
+
+
+def before() -> Dict[str, Any]:
+    return LegacyAggregatedData(query_context=QUERY_CONTEXT, worker_results=legacy_results()).model_dump()
+
+
+AGENTS = [iqvia_agent, exim_agent, patent_agent, clinical_trials_agent, internal_knowledge_agent, web_intelligence_agent]
+
+
+def after() -> Dict[str, Any]:
+    results = {}
+    for agent in AGENTS:
+        result = agent.process(QUERY_CONTEXT)
+        results[result.agent] = result
+    return AggregatedData(query_context=QUERY_CONTEXT, worker_results=results).to_dict()
+
+
+def cpu_per_cycle(fn, n: int) -> float:
+    start = time.process_time()
+    for _ in range(n):
+        fn()
+    return (time.process_time() - start) / n
+
+
+def traced(fn):
+    """(peak bytes, allocated blocks still held by the result) for one cycle."""
+    tracemalloc.start()
+    try:
+        before_snapshot = tracemalloc.take_snapshot()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        diff = tracemalloc.take_snapshot().compare_to(before_snapshot, "filename")
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    patches = [
+        mock.patch.object(module, "get_drug_index", lambda name: _Index(RECORDS[name]))
+        for module in AGENTS if module is not exim_agent
+    ]
+    patches.append(mock.patch.object(exim_agent, "load_exim_data", _Trade))
+    # Agents must build their results, not read precomputed ones
+    patches.append(mock.patch.object(cube, "USE_CUBE", False))
+    for p in patches:
+        p.start()
+    try:
+        assert after()["worker_results"].keys() == before()["worker_results"].keys()
+        before(), after()  # warm-up
+        rounds = {before: [], after: []}
+        for _ in range(5):
+            for fn in (before, after):
+                rounds[fn].append(cpu_per_cycle(fn, n))
+        before_peak, before_blocks = traced(before)
+        after_peak, after_blocks = traced(after)
+    finally:
+        for p in patches:
+            p.stop()
+
+    old, new = min(rounds[before]), min(rounds[after])
+    print(f"payload:               6 agents, {SIZE} items per list")
+    print(f"before, CPU:           {old * 1000:7.3f} ms/cycle")
+    print(f"after, CPU:            {new * 1000:7.3f} ms/cycle  ({old / new:.2f}x)")
+    print(f"before, peak traced:   {before_peak / 1024:7.1f} KiB  ({before_blocks} blocks held)")
+    print(f"after, peak traced:    {after_peak / 1024:7.1f} KiB  ({after_blocks} blocks held)")
+
+
+if __name__ == "__main__":
+    main()
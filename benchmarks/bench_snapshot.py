@@ -0,0 +1,204 @@
+"""Cold start and memory of worker processes: parsing data/ vs mapping a
+snapshot.
+
+Generates large synthetic datasets (N drugs, 10,000 by default, in each
+JSON file and N x 10 rows of EXIM trade) in a temp directory and compiles a
+snapshot of them. Then W worker processes (4 by default) start at once for
+each mode, the way uvicorn workers would, and each loads all six datasets
+and their drug indexes:
+
+* source: parse every JSON file and build its ``DrugIndex``, load the EXIM
+  ``.npz`` cache (already built, so this is the fast path for EXIM)
+* snapshot: map the snapshot and take a section per dataset
+
+Each worker reports its load time, then, one worker at a time so they do
+not compete for CPU, its lookup latency for names drawn
+uniformly from every drug (mostly first touches of the mapping for the
+snapshot) and for a hot set of 200 drugs (served from its record cache).
+While all workers of a mode are still alive, their memory is read from
+``/proc/<pid>/smaps_rollup``. PSS charges shared pages fractionally to each process that maps them, and
+private bytes are what each worker holds alone. Both are reported relative
+to an idle worker that only imports the same modules.
+
+    python -m benchmarks.bench_snapshot [N] [W]
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from datastore import DATASETS, build_drug_index
+from datastore.snapshot import Snapshot, build_snapshot, current_snapshot
+
+
+REGIONS = ["US", "EU", "APAC", "LATAM", "MEA", "India", "China", "Japan", "Canada", "Brazil"]
+LOOKUPS = 2_000
+HOT_DRUGS = 200
+
+
+def drug_name(i: int) -> str:
+    return f"Drug {i:06d}"
+
+
+def write_datasets(data_dir: Path, n: int) -> None:
+    rng = random.Random(0)
+    records = {
+        "iqvia": lambda i: {
+            "market_size_usd": rng.randrange(10**8, 10**10), "growth_rate": round(rng.random() / 10, 3),
+            "prescriptions": [{"year": 2015 + y, "count": rng.randrange(10**5)} for y in range(10)],
+            "competitors": {drug_name(rng.randrange(n)): round(rng.random() / 2, 2) for _ in range(8)},
+        },
+        "patent": lambda i: {
+            "active_patents": rng.randrange(40), "competitor_filings": rng.randrange(20), "exclusivity_years": rng.randrange(12),
+            "expiring_patents": [{"id": f"US{rng.randrange(10**7)}", "expiry": f"20{rng.randrange(26, 40)}-06-01"} for _ in range(6)],
+        },
+        "clinical_trials": lambda i: {
+            "total_trials": 120, "completion_rate": 0.7, "competitive_trials": rng.randrange(50),
+            "trials": {f"phase_{p}": rng.randrange(50) for p in range(1, 5)},
+        },
+        "internal_knowledge": lambda i: {
+            "rd_budget": rng.randrange(10**9), "capacity_units": rng.randrange(10**7),
+            "forecast_2025": rng.randrange(10**9), "priority": rng.choice(["high", "medium", "low"]),
+        },
+        "web_intelligence": lambda i: {
+            "sentiment": round(rng.random(), 2), "news_count": rng.randrange(10**4),
+            "regulatory": [f"Regulatory update {k} for {drug_name(i)}: revised labeling guidance" for k in range(4)],
+            "rumors": [f"Rumor {k}: partnership talks reported for {drug_name(i)}" for k in range(4)],
+        },
+    }
+    for name, (filename, _) in DATASETS.items():
+        if name == "exim":
+            continue
+        drugs = [
+            {"name": drug_name(i), "brand_names": [f"Brand{i}"], "therapeutic_area": "oncology", **records[name](i)}
+            for i in range(n)
+        ]
+        with open(data_dir / filename, "w") as f:
+            json.dump({"drugs": drugs}, f)
+
+    rows = n * len(REGIONS)
+    np_rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "drug_name": np.repeat([drug_name(i) for i in range(n)], len(REGIONS)),
+        "region": REGIONS * n,
+        "import_kg": np_rng.integers(0, 10_000, rows),
+        "export_kg": np_rng.integers(0, 10_000, rows),
+        "tariff_pct": np_rng.random(rows).round(3) / 10,
+        "barriers": np_rng.choice(["None", "Regulatory delays"], rows),
+    }).to_csv(data_dir / DATASETS["exim"][0], index=False)
+
+
+def worker(mode: str, data_dir: Path, snapshot_dir: Path, n: int) -> None:
+    """Load everything and report the time; on a line from stdin, time
+    lookups and report them; then wait for stdin to close."""
+    start = time.perf_counter()
+    sections: Dict[str, object] = {}
+    if mode == "source":
+        for name, (filename, loader) in DATASETS.items():
+            value = loader(data_dir / filename)
+            sections[name] = value if name == "exim" else build_drug_index(value)
+    elif mode == "snapshot":
+        snapshot = Snapshot(current_snapshot(snapshot_dir))
+        for name in DATASETS:
+            sections[name] = snapshot.section(name)
+    loaded = time.perf_counter() - start
+
+    print(json.dumps({"load_ms": loaded * 1000}), flush=True)
+
+    sys.stdin.readline()
+    timings = {"lookup_us": 0.0, "hot_us": 0.0}
+    if sections:
+        rng = random.Random(os.getpid())
+        indexes = [index for name, index in sections.items() if name != "exim"]
+        hot = [drug_name(rng.randrange(n)) for _ in range(HOT_DRUGS)]
+        for key, names in (
+            ("lookup_us", [drug_name(rng.randrange(n)) for _ in range(LOOKUPS)]),
+            ("hot_us", [rng.choice(hot) for _ in range(LOOKUPS)]),
+        ):
+            start = time.perf_counter()
+            for name in names:
+                for index in indexes:
+                    assert index.lookup(name) is not None
+            timings[key] = (time.perf_counter() - start) / (LOOKUPS * len(indexes)) * 1e6
+
+    print(json.dumps(timings), flush=True)
+    sys.stdin.read()
+
+
+def memory_kib(pid: int) -> Dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def run_mode(mode: str, workers: int, data_dir: Path, snapshot_dir: Path, n: int) -> Dict[str, float]:
+    command = [sys.executable, "-m", "benchmarks.bench_snapshot", "--worker", mode, str(data_dir), str(snapshot_dir), str(n)]
+    procs = [subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+    try:
+        reports = [json.loads(proc.stdout.readline()) for proc in procs]
+        for proc, report in zip(procs, reports):
+            proc.stdin.write("lookup\n")
+            proc.stdin.flush()
+            report.update(json.loads(proc.stdout.readline()))
+        memory = [memory_kib(proc.pid) for proc in procs]
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return {
+        "load_ms": sum(r["load_ms"] for r in reports) / workers,
+        "lookup_us": sum(r["lookup_us"] for r in reports) / workers,
+        "hot_us": sum(r["hot_us"] for r in reports) / workers,
+        **{key: sum(m[key] for m in memory) / workers for key in ("rss", "pss", "private")},
+    }
+
+
+def main(argv: List[str]) -> None:
+    if argv[:1] == ["--worker"]:
+        worker(argv[1], Path(argv[2]), Path(argv[3]), int(argv[4]))
+        return
+
+    n = int(argv[0]) if argv else 10_000
+    workers = int(argv[1]) if len(argv) > 1 else 4
+    with tempfile.TemporaryDirectory(prefix="mednexa-snapshot-") as tmp:
+        data_dir, snapshot_dir = Path(tmp) / "data", Path(tmp) / "snapshots"
+        data_dir.mkdir()
+        write_datasets(data_dir, n)
+        source_bytes = sum(f.stat().st_size for f in data_dir.iterdir())
+        start = time.perf_counter()
+        path = build_snapshot(data_dir, snapshot_dir, DATASETS)
+        build_s = time.perf_counter() - start
+        print(f"datasets:              {n} drugs each, {n * len(REGIONS)} trade rows, {source_bytes / 2**20:.1f} MiB of JSON/CSV")
+        print(f"snapshot build:        {build_s:.2f} s  ({path.stat().st_size / 2**20:.1f} MiB)")
+
+        idle = run_mode("idle", workers, data_dir, snapshot_dir, n)
+        results = {mode: run_mode(mode, workers, data_dir, snapshot_dir, n) for mode in ("source", "snapshot")}
+
+    print(f"workers:               {workers} at once; memory is per worker, above an idle worker")
+    print(f"{'':<10}{'load ms':>10}{'lookup us':>11}{'hot us':>8}{'RSS MiB':>10}{'PSS MiB':>10}{'private MiB':>13}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<10}{r['load_ms']:10.1f}{r['lookup_us']:11.2f}{r['hot_us']:8.2f}"
+            f"{(r['rss'] - idle['rss']) / 1024:10.1f}{(r['pss'] - idle['pss']) / 1024:10.1f}"
+            f"{(r['private'] - idle['private']) / 1024:13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
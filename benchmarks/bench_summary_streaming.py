@@ -0,0 +1,96 @@
+"""Time-to-first-byte of the streamed summary versus the full response.
+
+A fake Gemini model (injected through ``llm.client.set_client``) waits
+``FIRST_TOKEN`` seconds before its first chunk and ``PER_CHUNK`` between the
+rest. The benchmark serves the API with uvicorn on a local port (in this
+process, so the fake can be injected), calls ``GET /analyze/summary-stream``
+and records when the first summary byte arrives and when the stream ends. Before
+streaming, nothing reached the client until the whole summary existed (plus
+the old 1.8-3.2s artificial delay).
+
+    python -m benchmarks.bench_summary_streaming
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+
+os.environ.setdefault("MEDNEXA_SUMMARY_CACHE", "0")
+
+import httpx
+import uvicorn
+
+import api
+from llm.client import GeminiClient, set_client
+
+
+FIRST_TOKEN = 0.4
+PER_CHUNK = 0.05
+CHUNKS = 30
+QUERY = "Market size and patent outlook for Drug A in EU"
+
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    async def generate_content_async(self, prompt, stream=False, request_options=None):
+        if not stream:
+            await asyncio.sleep(FIRST_TOKEN + PER_CHUNK * (CHUNKS - 1))
+            return Chunk("".join(f"token{i} " for i in range(CHUNKS)))
+        return self._stream()
+
+    async def _stream(self):
+        await asyncio.sleep(FIRST_TOKEN)
+        for i in range(CHUNKS):
+            if i:
+                await asyncio.sleep(PER_CHUNK)
+            yield Chunk(f"token{i} ")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    set_client(GeminiClient(model=FakeStreamingModel()))
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        start = time.perf_counter()
+        first_byte = None
+        received = []
+        with httpx.stream(
+            "GET", f"http://127.0.0.1:{port}/analyze/summary-stream",
+            params={"query": QUERY}, timeout=60
+        ) as response:
+            for text in response.iter_text():
+                if text and first_byte is None:
+                    first_byte = time.perf_counter() - start
+                received.append(text)
+        total = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    summary = "".join(received)
+    assert summary.startswith("token0 ") and summary.rstrip().endswith(f"token{CHUNKS - 1}"), summary[:200]
+    model_total = FIRST_TOKEN + PER_CHUNK * (CHUNKS - 1)
+    print(f"model first-token latency:      {FIRST_TOKEN * 1000:7.0f} ms")
+    print(f"model full generation:          {model_total * 1000:7.0f} ms")
+    print(f"time to first summary byte:     {first_byte * 1000:7.0f} ms")
+    print(f"time to end of stream:          {total * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
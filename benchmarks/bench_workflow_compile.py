@@ -0,0 +1,48 @@
+"""Compile-time versus invoke-time for the LangGraph workflow.
+
+Before the registry every query paid for ``create_workflow()`` (building the
+StateGraph and compiling it) on top of the actual run. This reports both
+numbers so the removed per-request overhead is visible. Agents are real; the
+summarizer and report step are stubbed so only graph overhead is measured.
+
+    python -m benchmarks.bench_workflow_compile
+"""
+import statistics
+import time
+from unittest import mock
+
+from orchestration import graph
+
+
+RUNS = 50
+QUERY = "What is the market potential for Drug X in oncology?"
+
+
+def _time(fn, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    with mock.patch.object(graph, "summarize_stream", lambda data: iter(["stub"])), \
+            mock.patch.object(graph.report_store, "save", lambda summary, data: ""), \
+            mock.patch("builtins.print"):
+        compile_ms = _time(graph.create_workflow, RUNS)
+        graph.reload_workflow()
+        invoke_ms = _time(lambda: graph.run_workflow(QUERY), RUNS)
+        uncached_ms = _time(lambda: graph.create_workflow().invoke(
+            {"user_query": QUERY, "worker_results": {}}
+        ), RUNS)
+
+    print(f"compile (create_workflow):       {compile_ms:8.2f} ms  (median of {RUNS})")
+    print(f"invoke, registry-cached graph:   {invoke_ms:8.2f} ms")
+    print(f"compile + invoke (old per-query): {uncached_ms:7.2f} ms")
+    print(f"per-request overhead removed:    {uncached_ms - invoke_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""HTTP load test of the API with a concurrency sweep.
+
+Starts ``uvicorn api:app`` in a subprocess with the stub summarizer (a
+simulated model latency, no network), the summary cache off and reports in
+a temporary directory, then replays the query corpus
+(``benchmarks/requests.jsonl``) against it. Each virtual user repeats the
+frontend's flow as fast as it can: ``POST /analyze``, poll
+``GET /jobs/{id}`` until the job finishes, then ``GET /download-pdf`` for
+the report, which renders the PDF on first download.
+
+Each concurrency level runs for ``--duration`` seconds. For each level the
+tool reports session throughput, request and session latency percentiles,
+and error rates. A ``429`` from a full job queue counts as rejected, not
+failed. The saturation knee is the last level before extra concurrency
+stops buying throughput: the next level adds less than ``--knee-gain``.
+It prints a summary table and writes the full report as JSON.
+
+    python -m benchmarks.load_test [--levels 1,2,4,8,16,32] [--duration 10]
+    python -m benchmarks.load_test --url http://127.0.0.1:8000   # existing server
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_e2e import CORPUS_PATH, RESULTS_DIR, read_corpus, summarize_timings
+
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_LEVELS = "1,2,4,8,16,32"
+STARTUP_TIMEOUT = 60.0
+
+
+class LevelStats:
+    """Latencies and outcomes collected while one concurrency level runs."""
+
+    def __init__(self):
+        self.requests_ms: Dict[str, List[float]] = {}
+        self.sessions_ms: List[float] = []
+        self.requests = 0
+        self.rejected = 0
+        self.failed = 0
+        self.errors: Dict[str, int] = {}
+
+    def request(self, endpoint: str, started: float) -> None:
+        self.requests += 1
+        self.requests_ms.setdefault(endpoint, []).append((time.perf_counter() - started) * 1000)
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, stub_delay: float, workdir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MEDNEXA_LLM": "stub",
+        "MEDNEXA_STUB_LLM_DELAY": str(stub_delay),
+        "MEDNEXA_SUMMARY_CACHE": "0",
+        "MEDNEXA_RESPONSE_CACHE": "0",
+        "MEDNEXA_CACHE_DIR": os.path.join(workdir, "cache"),
+        "MEDNEXA_REPORTS_DIR": os.path.join(workdir, "reports"),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, server: Optional[subprocess.Popen]) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode}")
+            try:
+                await client.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} not ready after {STARTUP_TIMEOUT:.0f}s")
+
+
+async def session(client: httpx.AsyncClient, query: str, stats: LevelStats, poll_interval: float) -> None:
+    """One user flow: queue an analysis, wait for it, download its PDF."""
+    session_start = time.perf_counter()
+
+    started = time.perf_counter()
+    response = await client.post("/analyze", json={"query": query})
+    stats.request("POST /analyze", started)
+    if response.status_code == 429:
+        stats.rejected += 1
+        # Back off like a client honouring Retry-After, scaled down for the test
+        await asyncio.sleep(poll_interval * 4)
+        return
+    if response.status_code != 202:
+        stats.failed += 1
+        stats.error(f"analyze {response.status_code}")
+        return
+    job_id = response.json()["jobId"]
+
+    while True:
+        started = time.perf_counter()
+        response = await client.get(f"/jobs/{job_id}")
+        stats.request("GET /jobs/{id}", started)
+        job = response.json()
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            break
+        await asyncio.sleep(poll_interval)
+    if job["status"] != "succeeded":
+        stats.failed += 1
+        stats.error(f"job {job['status']}")
+        return
+
+    started = time.perf_counter()
+    response = await client.get("/download-pdf", params={"reportId": job["result"]["reportId"]})
+    stats.request("GET /download-pdf", started)
+    if response.status_code != 200 or not response.content.startswith(b"%PDF"):
+        stats.failed += 1
+        stats.error(f"download {response.status_code}")
+        return
+
+    stats.sessions_ms.append((time.perf_counter() - session_start) * 1000)
+
+
+async def run_level(base_url: str, queries: List[str], concurrency: int, duration: float, poll_interval: float, seed: int) -> Dict[str, Any]:
+    stats = LevelStats()
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        async def user(index: int) -> None:
+            rng = random.Random(seed * 1000 + index)
+            while time.perf_counter() < deadline:
+                try:
+                    await session(client, rng.choice(queries), stats, poll_interval)
+                except httpx.HTTPError as e:
+                    stats.failed += 1
+                    stats.error(type(e).__name__)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    attempted = len(stats.sessions_ms) + stats.failed + stats.rejected
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "sessions": len(stats.sessions_ms),
+        "throughput_per_s": round(len(stats.sessions_ms) / elapsed, 3),
+        "requests_per_s": round(stats.requests / elapsed, 3),
+        "rejected": stats.rejected,
+        "failed": stats.failed,
+        "rejected_rate": round(stats.rejected / attempted, 4) if attempted else 0.0,
+        "error_rate": round(stats.failed / attempted, 4) if attempted else 0.0,
+        "errors": stats.errors,
+        "session_latency": summarize_timings(stats.sessions_ms),
+        "request_latency": {endpoint: summarize_timings(values) for endpoint, values in sorted(stats.requests_ms.items())},
+    }
+
+
+def find_knee(levels: List[Dict[str, Any]], min_gain: float) -> Optional[int]:
+    """Concurrency after which the next level gains less than ``min_gain``
+    throughput (relative) or starts failing or rejecting sessions."""
+    for current, following in zip(levels, levels[1:]):
+        base = current["throughput_per_s"]
+        gained = (following["throughput_per_s"] - base) / base if base else float("inf")
+        degraded = following["error_rate"] + following["rejected_rate"] > current["error_rate"] + current["rejected_rate"]
+        if gained < min_gain or degraded:
+            return current["concurrency"]
+    return None
+
+
+def print_table(levels: List[Dict[str, Any]], knee: Optional[int]) -> None:
+    print(f"{'conc':>5}{'sess/s':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'pdf p95':>10}{'rejected':>10}{'errors':>8}")
+    for level in levels:
+        latency = level["session_latency"]
+        pdf = level["request_latency"].get("GET /download-pdf", {}).get("p95_ms", 0.0)
+        marker = "  <- knee" if level["concurrency"] == knee else ""
+        print(
+            f"{level['concurrency']:5d}{level['throughput_per_s']:9.2f}{level['requests_per_s']:9.1f}"
+            f"{latency['p50_ms']:10.1f}{latency['p95_ms']:10.1f}{latency['p99_ms']:10.1f}{pdf:10.1f}"
+            f"{level['rejected_rate']:10.1%}{level['error_rate']:8.1%}{marker}"
+        )
+    if knee is None:
+        print("saturation knee: not reached at the levels tested")
+    else:
+        print(f"saturation knee: {knee} concurrent users")
+
+
+async def sweep(args: argparse.Namespace, base_url: str) -> List[Dict[str, Any]]:
+    queries = [entry["query"] for entry in read_corpus(args.corpus)]
+    levels = []
+    # Warm-up: the first runs load datasets and start the PDF worker processes
+    await run_level(base_url, queries, 1, min(args.duration, 3.0), args.poll_interval, seed=0)
+    for concurrency in args.levels:
+        print(f"[LoadTest] {concurrency} concurrent users for {args.duration:.0f}s...", flush=True)
+        levels.append(await run_level(base_url, queries, concurrency, args.duration, args.poll_interval, seed=concurrency))
+    return levels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test")
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    parser.add_argument("--levels", type=lambda value: [int(level) for level in value.split(",")], default=DEFAULT_LEVELS)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--stub-delay", type=float, default=0.5, help="simulated summarizer latency, seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--knee-gain", type=float, default=0.10)
+    parser.add_argument("--out", type=Path, help="report file (default: benchmarks/results/load-<time>.json)")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    with tempfile.TemporaryDirectory(prefix="mednexa-load-") as workdir:
+        server = None
+        base_url = args.url
+        if base_url is None:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(port, args.stub_delay, workdir)
+        try:
+            asyncio.run(wait_until_ready(base_url, server))
+            levels = asyncio.run(sweep(args, base_url))
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+    knee = find_knee(levels, args.knee_gain)
+    print_table(levels, knee)
+
+    report = {
+        "meta": {
+            "started_at": started,
+            "url": args.url or "local",
+            "corpus": str(args.corpus),
+            "duration_s": args.duration,
+            "stub_llm_delay": args.stub_delay if args.url is None else None,
+            "poll_interval_s": args.poll_interval,
+            "cpu_count": os.cpu_count(),
+        },
+        "knee_concurrency": knee,
+        "levels": levels,
+    }
+    out = args.out or RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import hashlib
+import json
+from typing import Any
+
+
+# Fields stamped at creation time (AgentResult.timestamp,
+# AggregatedData.aggregation_timestamp, ...) that say nothing about content.
+VOLATILE_FIELDS = frozenset({"timestamp", "aggregation_timestamp"})
+
+
+def strip_volatile(data: Any) -> Any:
+    """Copy of ``data`` with volatile fields removed at every nesting level."""
+    if isinstance(data, dict):
+        return {k: strip_volatile(v) for k, v in data.items() if k not in VOLATILE_FIELDS}
+    if isinstance(data, (list, tuple)):
+        return [strip_volatile(v) for v in data]
+    return data
+
+
+def canonical_json(data: Any) -> str:
+    """Stable JSON encoding: volatile fields dropped, keys sorted, no whitespace."""
+    return json.dumps(strip_volatile(data), sort_keys=True, separators=(",", ":"), default=str)
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 of the canonical encoding, so equal content gets the same hash."""
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
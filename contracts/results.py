@@ -0,0 +1,314 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TypedDict, Union
+
+
+# Agent results travel through the workflow state as these frozen, slotted
+# objects, shared by reference between nodes. They are turned into plain
+# dicts (``to_dict``) only where they leave the process: the LLM prompt, the
+# saved report and API/SSE payloads. The dict shapes are the ones the
+# pydantic models produced with ``model_dump()`` before. ``from_dict`` rebuilds
+# an object from that shape (precomputed outputs are stored that way).
+#
+# List items, of which a result can hold hundreds, are TypedDicts built once
+# by the agent in their wire shape, held in tuples and shared (not copied)
+# by ``to_dict``; building a typed object per item and then a dict from it
+# costs more than the copies this removes. Nothing may modify them.
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+class PrescriptionTrend(TypedDict):
+    year: int
+    prescriptions: int
+
+
+@dataclass(frozen=True, slots=True)
+class IQVIAData:
+    market_size_usd: int
+    growth_rate_cagr: float
+    prescription_trends: Tuple[PrescriptionTrend, ...]
+    competitor_share: Tuple[Tuple[str, float], ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "market_size_usd": self.market_size_usd,
+            "growth_rate_cagr": self.growth_rate_cagr,
+            "prescription_trends": list(self.prescription_trends),
+            "competitor_share": dict(self.competitor_share),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "IQVIAData":
+        return cls(
+            market_size_usd=data["market_size_usd"],
+            growth_rate_cagr=data["growth_rate_cagr"],
+            prescription_trends=tuple(data["prescription_trends"]),
+            competitor_share=tuple(data["competitor_share"].items()),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EXIMData:
+    import_volume_kg: int
+    export_volume_kg: int
+    top_exporters: Tuple[str, ...]
+    tariff_impact_pct: float
+    trade_barriers: Tuple[str, ...]
+    regions: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "import_volume_kg": self.import_volume_kg,
+            "export_volume_kg": self.export_volume_kg,
+            "top_exporters": list(self.top_exporters),
+            "tariff_impact_pct": self.tariff_impact_pct,
+            "trade_barriers": list(self.trade_barriers),
+            "regions": list(self.regions),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "EXIMData":
+        return cls(
+            import_volume_kg=data["import_volume_kg"],
+            export_volume_kg=data["export_volume_kg"],
+            top_exporters=tuple(data["top_exporters"]),
+            tariff_impact_pct=data["tariff_impact_pct"],
+            trade_barriers=tuple(data["trade_barriers"]),
+            regions=tuple(data["regions"]),
+        )
+
+
+class ExpiringPatent(TypedDict):
+    patent_id: str
+    expiry_date: str
+
+
+@dataclass(frozen=True, slots=True)
+class PatentData:
+    active_patents: int
+    expiring_soon: Tuple[ExpiringPatent, ...]
+    competitor_filings: int
+    exclusivity_window_years: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "active_patents": self.active_patents,
+            "expiring_soon": list(self.expiring_soon),
+            "competitor_filings": self.competitor_filings,
+            "exclusivity_window_years": self.exclusivity_window_years,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PatentData":
+        return cls(
+            active_patents=data["active_patents"],
+            expiring_soon=tuple(data["expiring_soon"]),
+            competitor_filings=data["competitor_filings"],
+            exclusivity_window_years=data["exclusivity_window_years"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseDistribution:
+    phase_1: int
+    phase_2: int
+    phase_3: int
+    phase_4: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"phase_1": self.phase_1, "phase_2": self.phase_2, "phase_3": self.phase_3, "phase_4": self.phase_4}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PhaseDistribution":
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class ClinicalTrialsData:
+    total_trials: int
+    phase_distribution: PhaseDistribution
+    completion_rate: float
+    competitive_trials: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_trials": self.total_trials,
+            "phase_distribution": self.phase_distribution.to_dict(),
+            "completion_rate": self.completion_rate,
+            "competitive_trials": self.competitive_trials,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ClinicalTrialsData":
+        return cls(
+            total_trials=data["total_trials"],
+            phase_distribution=PhaseDistribution.from_dict(data["phase_distribution"]),
+            completion_rate=data["completion_rate"],
+            competitive_trials=data["competitive_trials"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class InternalKnowledgeData:
+    rd_budget_usd: int
+    manufacturing_capacity_units_per_year: int
+    forecast_revenue_2025_usd: int
+    strategic_priority: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rd_budget_usd": self.rd_budget_usd,
+            "manufacturing_capacity_units_per_year": self.manufacturing_capacity_units_per_year,
+            "forecast_revenue_2025_usd": self.forecast_revenue_2025_usd,
+            "strategic_priority": self.strategic_priority,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "InternalKnowledgeData":
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class WebIntelligenceData:
+    sentiment_score: float
+    news_mentions: int
+    regulatory_updates: Tuple[str, ...]
+    market_rumors: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sentiment_score": self.sentiment_score,
+            "news_mentions": self.news_mentions,
+            "regulatory_updates": list(self.regulatory_updates),
+            "market_rumors": list(self.market_rumors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "WebIntelligenceData":
+        return cls(
+            sentiment_score=data["sentiment_score"],
+            news_mentions=data["news_mentions"],
+            regulatory_updates=tuple(data["regulatory_updates"]),
+            market_rumors=tuple(data["market_rumors"]),
+        )
+
+
+AgentData = Union[IQVIAData, EXIMData, PatentData, ClinicalTrialsData, InternalKnowledgeData, WebIntelligenceData]
+
+# agent name -> the type of its data, for rebuilding it from ``to_dict`` output
+AGENT_DATA_TYPES: Dict[str, type] = {
+    "iqvia": IQVIAData,
+    "exim": EXIMData,
+    "patent": PatentData,
+    "clinical_trials": ClinicalTrialsData,
+    "internal_knowledge": InternalKnowledgeData,
+    "web_intelligence": WebIntelligenceData,
+}
+
+# Key of the per-drug mapping in a comparison's dict form
+COMPARISON_KEY = "drugs"
+
+
+@dataclass(frozen=True, slots=True)
+class DrugComparison:
+    """One agent's data for several drugs, side by side in query order. A
+    drug the agent has nothing for is paired with None."""
+    drugs: Tuple[Tuple[str, Optional[AgentData]], ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {COMPARISON_KEY: {name: data.to_dict() if data is not None else None for name, data in self.drugs}}
+
+
+def compared_drugs(data: Mapping[str, Any]) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+    """drug -> data (None if missing) when ``data`` is a serialized
+    ``DrugComparison``, else None."""
+    drugs = data.get(COMPARISON_KEY) if data else None
+    return drugs if isinstance(drugs, dict) else None
+
+
+@dataclass(frozen=True, slots=True)
+class AgentResult:
+    """One agent's output. ``data`` is None when the agent had nothing for
+    the drug (``status`` is then ``"not_found"`` and ``message`` says why),
+    and a ``DrugComparison`` when several drugs were asked for.
+    ``to_dict`` is computed once, like ``AggregatedData.to_dict``."""
+    agent: str
+    data: Optional[Union[AgentData, DrugComparison]]
+    status: str = "success"
+    message: Optional[str] = None
+    timestamp: str = field(default_factory=_now)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def not_found(cls, agent: str, message: str) -> "AgentResult":
+        return cls(agent=agent, data=None, status="not_found", message=message)
+
+    @classmethod
+    def for_drugs(
+        cls,
+        agent: str,
+        drug_names: Sequence[str],
+        data: Sequence[Optional[AgentData]],
+        not_found: str,
+    ) -> "AgentResult":
+        """Result for the drugs in ``drug_names``, given each one's data (None
+        where the agent has none) and a ``not_found`` message template with a
+        ``{drug}`` field. One drug gives a plain result; several give a
+        ``DrugComparison``, which succeeds if any drug was found and lists the
+        missing ones in ``message``."""
+        missing: List[str] = [not_found.format(drug=name) for name, item in zip(drug_names, data) if item is None]
+        message = "; ".join(missing) or None
+        if len(missing) == len(drug_names):
+            return cls.not_found(agent, message)
+        if len(drug_names) == 1:
+            return cls(agent=agent, data=data[0])
+        return cls(agent=agent, data=DrugComparison(tuple(zip(drug_names, data))), message=message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            object.__setattr__(self, "_dict", {
+                "agent": self.agent,
+                "data": self.data.to_dict() if self.data is not None else {},
+                "status": self.status,
+                "message": self.message,
+                "timestamp": self.timestamp,
+            })
+        return self._dict
+
+
+@dataclass(frozen=True, slots=True)
+class AggregatedData:
+    """The query context and every agent's result, as handed to the
+    summarizer and the report store.
+
+    ``to_dict`` is computed once and reused, so the prompt, the summary cache
+    key, the report id and the saved report all share one serialization.
+    Callers must treat the returned dict as read-only.
+    """
+    query_context: Mapping[str, Any]
+    worker_results: Mapping[str, AgentResult]
+    aggregation_timestamp: str = field(default_factory=_now)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.worker_results, MappingProxyType):
+            object.__setattr__(self, "worker_results", MappingProxyType(dict(self.worker_results)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            object.__setattr__(self, "_dict", {
+                "query_context": self.query_context,
+                "worker_results": {agent: as_dict(result) for agent, result in self.worker_results.items()},
+                "aggregation_timestamp": self.aggregation_timestamp,
+            })
+        return self._dict
+
+
+def as_dict(value: Any) -> Any:
+    """``value.to_dict()`` for result objects; plain dicts pass through."""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else value
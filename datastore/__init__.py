@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from datastore.store import DataStore, DatasetStats, estimate_size
+from datastore.index import DrugIndex, build_drug_index, normalize_name
+from datastore.exim import TradeStore, TradeSummary, load_trade_store
+from datastore.snapshot import CURRENT, MappedDrugIndex, Snapshot, open_current, section_loader
+
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Budget for parsed datasets held in memory, in MB (0 disables the limit)
+DATA_BUDGET_MB = int(os.environ.get("MEDNEXA_DATA_BUDGET_MB", "512"))
+# How often a cached dataset re-checks its file for changes, in seconds
+DATA_CHECK_INTERVAL = float(os.environ.get("MEDNEXA_DATA_CHECK_INTERVAL", "0.5"))
+# Compiled snapshots of data/ (python -m datastore snapshot build)
+SNAPSHOT_DIR = Path(os.environ.get("MEDNEXA_SNAPSHOT_DIR", DATA_DIR / "snapshots"))
+# Set to 0 to read data/ directly even when a snapshot exists
+USE_SNAPSHOTS = os.environ.get("MEDNEXA_SNAPSHOTS", "1") != "0"
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# dataset name -> (file in data/, loader)
+DATASETS = {
+    "iqvia": ("iqvia_data.json", load_json),
+    "exim": ("exim_data.csv", load_trade_store),
+    "patent": ("patent_data.json", load_json),
+    "clinical_trials": ("clinical_trials_data.json", load_json),
+    "internal_knowledge": ("internal_knowledge.json", load_json),
+    "web_intelligence": ("web_intelligence.json", load_json),
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DataStore:
+    """Process-wide DataStore with every dataset in data/ registered.
+
+    When a snapshot has been built, datasets are read from it instead: JSON
+    datasets come back as ``MappedDrugIndex`` rather than parsed documents,
+    and edits to data/ take effect once a new snapshot is built and swapped
+    in.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = DataStore(
+                    budget_bytes=DATA_BUDGET_MB * 1024 * 1024 or None,
+                    check_interval=DATA_CHECK_INTERVAL,
+                )
+                pointer = SNAPSHOT_DIR / CURRENT
+                if USE_SNAPSHOTS and pointer.exists():
+                    _check_snapshot()
+                    for name in DATASETS:
+                        store.register(name, pointer, section_loader(name))
+                else:
+                    for name, (filename, loader) in DATASETS.items():
+                        store.register(name, DATA_DIR / filename, loader)
+                _store = store
+    return _store
+
+
+def get_drug_index(name: str) -> DrugIndex:
+    """Name/alias index over a JSON dataset, rebuilt only when the file changes."""
+    return get_store().derive(name, "drug_index", _drug_index)
+
+
+def get_drug_catalogue() -> Dict[str, str]:
+    """Every drug name and synonym known to any dataset, normalized, mapped to
+    its canonical name."""
+    catalogue: Dict[str, str] = {}
+    for name in DATASETS:
+        if name == "exim":
+            for drug in get_store().get("exim").drugs.tolist():
+                catalogue.setdefault(normalize_name(drug), drug)
+        else:
+            for key, canonical in get_drug_index(name).names().items():
+                catalogue.setdefault(key, canonical)
+    return catalogue
+
+
+def _drug_index(value: Any) -> Any:
+    # Snapshot sections are already indexes
+    return value if isinstance(value, MappedDrugIndex) else build_drug_index(value)
+
+
+def _check_snapshot() -> None:
+    snapshot = open_current(SNAPSHOT_DIR)
+    stale = snapshot.stale(DATA_DIR)
+    print(f"[DataStore] Using data snapshot {snapshot.path.name} (version {snapshot.version})")
+    if stale:
+        print(f"[DataStore] Snapshot is older than data/ for: {', '.join(stale)}; "
+              f"rebuild with python -m datastore snapshot build")
+
+
+__all__ = [
+    "DataStore",
+    "DatasetStats",
+    "DrugIndex",
+    "MappedDrugIndex",
+    "Snapshot",
+    "TradeStore",
+    "TradeSummary",
+    "estimate_size",
+    "build_drug_index",
+    "normalize_name",
+    "get_store",
+    "get_drug_index",
+    "get_drug_catalogue",
+    "DATA_DIR",
+    "DATASETS",
+    "SNAPSHOT_DIR",
+]
@@ -0,0 +1,116 @@
+"""Maintenance commands for the datasets in data/.
+
+    python -m datastore snapshot build [--keep N]
+    python -m datastore snapshot status
+    python -m datastore cube rebuild
+    python -m datastore cube update DRUG [DRUG ...]
+    python -m datastore cube status
+
+The cube holds precomputed agent outputs, so its commands load the agents
+(imported on use; the datastore package itself does not depend on them).
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from datastore import DATA_DIR, DATASETS, SNAPSHOT_DIR, get_store
+from datastore.snapshot import KEEP_SNAPSHOTS, Snapshot, build_snapshot, current_snapshot
+
+
+def snapshot_build(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    path = build_snapshot(DATA_DIR, SNAPSHOT_DIR, DATASETS, keep=args.keep)
+    print(f"[Snapshot] Built {path} ({path.stat().st_size} bytes) in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def snapshot_status(args: argparse.Namespace) -> int:
+    path = current_snapshot(SNAPSHOT_DIR)
+    if path is None:
+        print(f"[Snapshot] No snapshot in {SNAPSHOT_DIR}; datasets are read from {DATA_DIR}")
+        return 1
+    snapshot = Snapshot(path)
+    built = datetime.fromtimestamp(snapshot.created_at).isoformat(timespec="seconds")
+    print(f"[Snapshot] Current: {path.name} (version {snapshot.version}, built {built}, {snapshot.nbytes} bytes)")
+    for name, entry in snapshot.datasets.items():
+        print(f"  {name:<20} {entry['kind']:<6} {entry['source']['file']}")
+    stale = snapshot.stale(DATA_DIR)
+    if stale:
+        print(f"[Snapshot] Out of date for: {', '.join(stale)}; run python -m datastore snapshot build")
+        return 1
+    return 0
+
+
+def cube_rebuild(args: argparse.Namespace) -> int:
+    from agents.cube import CUBE_PATH, build_cube
+
+    start = time.perf_counter()
+    path = build_cube(CUBE_PATH)
+    print(f"[Cube] Built {path} ({path.stat().st_size} bytes) in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cube_update(args: argparse.Namespace) -> int:
+    from agents.cube import CUBE_PATH, CubeError, update_cube
+
+    start = time.perf_counter()
+    try:
+        drugs = update_cube(args.drugs, CUBE_PATH)
+    except CubeError as e:
+        print(f"[Cube] {e}")
+        return 1
+    print(f"[Cube] Updated {', '.join(drugs)} in {CUBE_PATH} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cube_status(args: argparse.Namespace) -> int:
+    from agents.cube import CUBE_FORMAT, CUBE_PATH, load_cube
+
+    if not CUBE_PATH.exists():
+        print(f"[Cube] No cube at {CUBE_PATH}; agents compute from the datasets")
+        return 1
+    cube = load_cube(CUBE_PATH)
+    if cube.format != CUBE_FORMAT:
+        print(f"[Cube] {CUBE_PATH} has format {cube.format}, expected {CUBE_FORMAT}; run python -m datastore cube rebuild")
+        return 1
+    built = datetime.fromtimestamp(cube.built_at).isoformat(timespec="seconds")
+    print(f"[Cube] {CUBE_PATH} (built {built}, {cube.nbytes} bytes, {len(cube.cells)} cells, "
+          f"{len(cube.region_keys)} region selections)")
+    stale = cube.stale(get_store().versions())
+    if stale:
+        print(f"[Cube] Out of date for: {', '.join(stale)}; run python -m datastore cube rebuild, "
+              f"or cube update DRUG ... if only some drugs changed")
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m datastore")
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    snapshot = groups.add_parser("snapshot", help="compiled, memory-mapped copies of data/")
+    commands = snapshot.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compile data/ into a new snapshot and make it current")
+    build.add_argument("--keep", type=int, default=KEEP_SNAPSHOTS, help="snapshots to keep, including the new one")
+    build.set_defaults(handler=snapshot_build)
+    status = commands.add_parser("status", help="show the current snapshot and whether data/ changed since")
+    status.set_defaults(handler=snapshot_status)
+
+    cube = groups.add_parser("cube", help="precomputed agent outputs per drug, region selection and timeframe")
+    commands = cube.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="materialize every agent output for every drug")
+    rebuild.set_defaults(handler=cube_rebuild)
+    update = commands.add_parser("update", help="re-materialize drugs whose records changed")
+    update.add_argument("drugs", nargs="+", help="drug names or aliases")
+    update.set_defaults(handler=cube_update)
+    status = commands.add_parser("status", help="show the cube and whether the datasets changed since")
+    status.set_defaults(handler=cube_status)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from datastore.index import normalize_name
+
+
+# Bump when the cached layout changes so stale caches are rebuilt
+CACHE_FORMAT = 2
+# Regions that mean "every region in the dataset"
+ALL_REGIONS = {"global", "worldwide"}
+NO_BARRIER = {"", "none"}
+TOP_EXPORTERS = 3
+
+
+@dataclass
+class TradeSummary:
+    import_volume_kg: int
+    export_volume_kg: int
+    top_exporters: List[str]
+    tariff_impact_pct: float
+    trade_barriers: List[str]
+    regions: List[str]
+
+
+class TradeStore:
+    """Columnar, pre-aggregated view of the EXIM trade CSV.
+
+    Drug and region names are encoded as categorical codes and the per-row
+    volumes are summed once into dense ``(drug, region)`` matrices, so a query
+    is a couple of fancy-indexing operations regardless of how many customs
+    rows the extract had. Barriers are kept as two arrays sorted by cell
+    (``drug * len(regions) + region``) rather than per-cell lists, so loading
+    builds no Python objects per cell. A binary copy (``.npz``) is cached next
+    to the CSV and reused while the CSV's mtime and size are unchanged.
+    """
+
+    __slots__ = (
+        "drugs", "regions", "import_kg", "export_kg", "tariff_sum", "row_count",
+        "barrier_cells", "barrier_texts", "_drug_codes", "_region_codes",
+    )
+
+    def __init__(
+        self,
+        drugs: np.ndarray,
+        regions: np.ndarray,
+        import_kg: np.ndarray,
+        export_kg: np.ndarray,
+        tariff_sum: np.ndarray,
+        row_count: np.ndarray,
+        barrier_cells: np.ndarray,
+        barrier_texts: np.ndarray,
+    ):
+        self.drugs = drugs
+        self.regions = regions
+        self.import_kg = import_kg
+        self.export_kg = export_kg
+        self.tariff_sum = tariff_sum
+        self.row_count = row_count
+        self.barrier_cells = barrier_cells
+        self.barrier_texts = barrier_texts
+        self._drug_codes = {normalize_name(str(d)): i for i, d in enumerate(drugs)}
+        self._region_codes = {normalize_name(str(r)): i for i, r in enumerate(regions)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TradeStore":
+        drug_names, drug_codes = _encode(df["drug_name"])
+        region_names, region_codes = _encode(df["region"])
+        valid = (drug_codes >= 0) & (region_codes >= 0)
+        if not valid.all():
+            df = df[valid]
+            drug_codes, region_codes = drug_codes[valid], region_codes[valid]
+        n_drugs, n_regions = len(drug_names), len(region_names)
+        cells = drug_codes.astype(np.int64) * n_regions + region_codes
+        size = n_drugs * n_regions
+
+        def totals(column: str) -> np.ndarray:
+            weights = df[column].to_numpy(dtype=np.float64, na_value=0.0)
+            return np.bincount(cells, weights=weights, minlength=size).reshape(n_drugs, n_regions)
+
+        # Only distinct (cell, barrier) pairs need a Python-level loop
+        text = df["barriers"].astype("category")
+        labels = [str(c).strip() for c in text.cat.categories]
+        keep = np.array([label.lower() not in NO_BARRIER for label in labels] + [False])
+        text_codes = text.cat.codes.to_numpy().astype(np.int64)
+        mask = keep[text_codes]
+        pairs = pd.DataFrame({"cell": cells[mask], "text": text_codes[mask]}).drop_duplicates()
+        barriers: Dict[int, List[str]] = {}
+        for cell, code in zip(pairs["cell"].tolist(), pairs["text"].tolist()):
+            items = barriers.setdefault(cell, [])
+            if labels[code] not in items:
+                items.append(labels[code])
+        ordered = sorted(barriers)
+
+        return cls(
+            drugs=drug_names,
+            regions=region_names,
+            import_kg=totals("import_kg").round().astype(np.int64),
+            export_kg=totals("export_kg").round().astype(np.int64),
+            tariff_sum=totals("tariff_pct"),
+            row_count=np.bincount(cells, minlength=size).reshape(n_drugs, n_regions),
+            barrier_cells=np.asarray([cell for cell in ordered for _ in barriers[cell]], dtype=np.int64),
+            barrier_texts=np.asarray([text for cell in ordered for text in barriers[cell]], dtype=str),
+        )
+
+    @classmethod
+    def load(cls, csv_path: Path) -> "TradeStore":
+        """Load from the binary cache if it matches the CSV, else parse and cache."""
+        csv_path = Path(csv_path)
+        stat = os.stat(csv_path)
+        source = np.array([CACHE_FORMAT, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+        cache_path = cache_path_for(csv_path)
+
+        if cache_path.exists():
+            try:
+                with np.load(cache_path, allow_pickle=False) as cached:
+                    if np.array_equal(cached["source"], source):
+                        return cls.from_arrays(cached)
+            except (OSError, KeyError, ValueError):
+                pass
+
+        df = pd.read_csv(
+            csv_path,
+            dtype={"drug_name": "category", "region": "category", "barriers": "string"},
+            keep_default_na=False,
+        )
+        store = cls.from_frame(df)
+        store._save(cache_path, source)
+        return store
+
+    def query(self, drug_name: str, regions: Iterable[str] = ()) -> Optional[TradeSummary]:
+        """Totals for one drug over the requested regions (all regions if none
+        are given or 'Global' is among them). Returns None for an unknown drug."""
+        return self.query_many([drug_name], regions)[0]
+
+    def query_many(self, drug_names: Iterable[str], regions: Iterable[str] = ()) -> List[Optional[TradeSummary]]:
+        """``query`` for several drugs over the same regions, as one pass over
+        a ``(drugs, regions)`` block of each matrix. Results are in the order
+        given, None for unknown drugs."""
+        codes = [self._drug_codes.get(normalize_name(name or "")) for name in drug_names]
+        results: List[Optional[TradeSummary]] = [None] * len(codes)
+        known = [i for i, code in enumerate(codes) if code is not None]
+        if not known:
+            return results
+        drugs = np.asarray([codes[i] for i in known], dtype=np.int64)
+        cols = self._region_columns(regions)
+        block = np.ix_(drugs, cols)
+
+        imports = self.import_kg[block].sum(axis=1)
+        exports = self.export_kg[block]
+        counts = self.row_count[block]
+        rows = counts.sum(axis=1)
+        tariff_sums = self.tariff_sum[block].sum(axis=1)
+
+        present = counts > 0
+        # Stable sort over every column, then keep present ones: the same
+        # order as sorting only the present columns
+        ranking = np.argsort(-exports, axis=1, kind="stable")
+
+        cells = drugs[:, None] * len(self.regions) + cols[None, :]
+        starts = self.barrier_cells.searchsorted(cells, "left")
+        ends = self.barrier_cells.searchsorted(cells, "right")
+
+        for row, i in enumerate(known):
+            ranked = [c for c in ranking[row].tolist() if present[row, c]]
+            barriers: List[str] = []
+            for start, end in zip(starts[row].tolist(), ends[row].tolist()):
+                for barrier in self.barrier_texts[start:end].tolist():
+                    if barrier not in barriers:
+                        barriers.append(barrier)
+            count = int(rows[row])
+            results[i] = TradeSummary(
+                import_volume_kg=int(imports[row]),
+                export_volume_kg=int(exports[row].sum()),
+                top_exporters=[str(self.regions[cols[c]]) for c in ranked[:TOP_EXPORTERS]],
+                tariff_impact_pct=float(tariff_sums[row]) / count if count else 0.0,
+                trade_barriers=barriers,
+                regions=[str(self.regions[c]) for c in cols[present[row]]],
+            )
+        return results
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.import_kg, self.export_kg, self.tariff_sum, self.row_count, self.drugs, self.regions,
+            self.barrier_cells, self.barrier_texts,
+        )
+        return int(sum(a.nbytes for a in arrays))
+
+    def _region_columns(self, regions: Iterable[str]) -> np.ndarray:
+        wanted = [normalize_name(r) for r in regions or ()]
+        if not wanted or ALL_REGIONS.intersection(wanted):
+            return np.arange(len(self.regions))
+        cols = [self._region_codes[r] for r in dict.fromkeys(wanted) if r in self._region_codes]
+        return np.asarray(cols, dtype=np.int64)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Every field as a plain array, the layout of the ``.npz`` cache and
+        of the EXIM section of a data snapshot."""
+        return {
+            "drugs": self.drugs.astype(str),
+            "regions": self.regions.astype(str),
+            "import_kg": self.import_kg,
+            "export_kg": self.export_kg,
+            "tariff_sum": self.tariff_sum,
+            "row_count": self.row_count,
+            "barrier_cells": self.barrier_cells,
+            "barrier_texts": self.barrier_texts.astype(str),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "TradeStore":
+        """Inverse of ``to_arrays``. The arrays are used as they are, so they
+        may be read-only views (of an ``.npz`` or a memory-mapped snapshot)."""
+        return cls(
+            drugs=arrays["drugs"],
+            regions=arrays["regions"],
+            import_kg=arrays["import_kg"],
+            export_kg=arrays["export_kg"],
+            tariff_sum=arrays["tariff_sum"],
+            row_count=arrays["row_count"],
+            barrier_cells=arrays["barrier_cells"],
+            barrier_texts=arrays["barrier_texts"],
+        )
+
+    def _save(self, cache_path: Path, source: np.ndarray) -> None:
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, source=source, **self.to_arrays())
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # A read-only data/ directory just means no cache
+            print(f"[TradeStore] Could not write cache {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+def cache_path_for(csv_path: Path) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}.columnar.npz")
+
+
+def load_trade_store(path: Path) -> TradeStore:
+    return TradeStore.load(path)
+
+
+def _encode(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Categorical codes for a column, merging categories that differ only in case/spacing."""
+    categorical = column.astype("category")
+    categories = [str(c).strip() for c in categorical.cat.categories]
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    remap = np.empty(len(categories), dtype=np.int64)
+    for i, category in enumerate(categories):
+        key = normalize_name(category)
+        if key not in seen:
+            seen[key] = len(names)
+            names.append(category)
+        remap[i] = seen[key]
+    raw_codes = categorical.cat.codes.to_numpy()
+    # Missing values keep code -1
+    codes = np.where(raw_codes >= 0, remap[raw_codes], -1)
+    return np.asarray(names, dtype=str), codes
@@ -0,0 +1,83 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Record fields that hold alternative names for a drug (brand names, INN
+# synonyms, ...). Each may be a string or a list of strings.
+ALIAS_FIELDS = ("aliases", "synonyms", "brand_names", "inn")
+
+
+def normalize_name(name: str) -> str:
+    """Case-folded, whitespace-collapsed form used as the index key."""
+    return " ".join(name.casefold().split())
+
+
+class DrugIndex:
+    """O(1) lookup of drug records by name, brand name or synonym.
+
+    Canonical names win over aliases when they collide, and the first record
+    to claim a key keeps it.
+    """
+
+    __slots__ = ("_by_key", "_records")
+
+    def __init__(self, records: Iterable[Dict[str, Any]], name_field: str = "name"):
+        self._records: List[Dict[str, Any]] = list(records)
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+
+        for record in self._records:
+            name = record.get(name_field)
+            if name:
+                self._by_key.setdefault(normalize_name(name), record)
+
+        for record in self._records:
+            for alias in _aliases(record):
+                self._by_key.setdefault(normalize_name(alias), record)
+
+    def lookup(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the record for ``name``, or None if the drug is not in the dataset."""
+        if not name:
+            return None
+        record = self._by_key.get(name)
+        if record is None:
+            record = self._by_key.get(normalize_name(name))
+        return record
+
+    def lookup_many(self, names: Iterable[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+        """``lookup`` for several names in one call, in the order given."""
+        return [self.lookup(name) for name in names]
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def keys(self) -> List[str]:
+        """Every searchable (normalized) name, canonical and alias."""
+        return list(self._by_key)
+
+    def names(self, name_field: str = "name") -> Dict[str, str]:
+        """Searchable name -> canonical name of the record it resolves to."""
+        return {key: record.get(name_field, key) for key, record in self._by_key.items()}
+
+    def records(self) -> List[Dict[str, Any]]:
+        return list(self._records)
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(searchable name, record it resolves to) for every key."""
+        return list(self._by_key.items())
+
+
+def build_drug_index(raw_data: Dict[str, Any]) -> DrugIndex:
+    return DrugIndex(raw_data.get("drugs", []))
+
+
+def _aliases(record: Dict[str, Any]) -> List[str]:
+    aliases = []
+    for field in ALIAS_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            aliases.append(value)
+        elif isinstance(value, (list, tuple)):
+            aliases.extend(v for v in value if isinstance(v, str))
+    return aliases
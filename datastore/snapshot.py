@@ -0,0 +1,345 @@
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from datastore.exim import TradeStore
+from datastore.index import build_drug_index, normalize_name
+
+
+# A snapshot compiles every dataset in data/ into one read-only binary file
+# that processes map with mmap instead of parsing. Workers that map the same
+# file share its pages through the page cache, and opening it only reads the
+# header and directory; everything else is faulted in on first use.
+#
+# Layout: a fixed header, then 64-byte aligned numpy arrays, then a JSON
+# directory giving each dataset's kind, source file version and the offset,
+# dtype and shape of its arrays.
+#
+#   drugs  (JSON datasets)  records         uint8    compact JSON of every record, back to back
+#                           record_offsets  int64    start of record i; record i ends at i + 1
+#                           keys            S<n>     sorted normalized names and aliases
+#                           key_records     int32    record each key resolves to
+#   trade  (EXIM)           TradeStore.to_arrays()
+#
+# Snapshots are immutable and versioned (snapshot-000001.mnx, ...). The
+# CURRENT file in the snapshot directory names the live one and is replaced
+# atomically once a new snapshot is complete, so readers see either the old
+# or the new snapshot and never a partial one. A replaced snapshot stays
+# mapped, even after pruning unlinks it, until its last reader lets go.
+
+MAGIC = b"MNXSNAP\x00"
+# Bump when the layout changes; older files are then refused
+SNAPSHOT_FORMAT = 1
+# magic, format, reserved, version, created (ns), directory offset, directory length
+_HEADER = struct.Struct("<8sIIQQQQ")
+ALIGN = 64
+CURRENT = "CURRENT"
+KEEP_SNAPSHOTS = 3
+# Decoded records kept per dataset, so hot drugs are not decoded on every lookup
+RECORD_CACHE_SIZE = 1024
+
+_SNAPSHOT_NAME = re.compile(r"^snapshot-(\d+)\.mnx$")
+
+
+class SnapshotError(Exception):
+    """The file is not a snapshot this version can read."""
+
+
+class MappedDrugIndex:
+    """``DrugIndex`` over a snapshot section.
+
+    Lookups binary-search the sorted key table in place and decode only the
+    matching record, so a process holds little beyond the mapping and the
+    last ``RECORD_CACHE_SIZE`` records it decoded. As with ``DrugIndex``,
+    records are shared between callers and must be treated as read-only.
+    """
+
+    __slots__ = ("_records", "_offsets", "_keys", "_key_records", "_decoded")
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        self._records = arrays["records"]
+        self._offsets = arrays["record_offsets"]
+        self._keys = arrays["keys"]
+        self._key_records = arrays["key_records"]
+        self._decoded = lru_cache(maxsize=RECORD_CACHE_SIZE)(self._record)
+
+    def lookup(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the record for ``name``, or None if the drug is not in the dataset."""
+        if not name:
+            return None
+        key = normalize_name(name).encode()
+        if len(key) > self._keys.itemsize:
+            return None
+        i = int(self._keys.searchsorted(key))
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+        return self._decoded(int(self._key_records[i]))
+
+    def lookup_many(self, names: Iterable[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+        """``lookup`` for several names with one vectorized search of the key
+        table, in the order given."""
+        keys = [normalize_name(name).encode() if name else b"" for name in names]
+        records: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        # Keys longer than the table's width would be truncated into false hits
+        wanted = [(i, key) for i, key in enumerate(keys) if key and len(key) <= self._keys.itemsize]
+        if not wanted or not len(self._keys):
+            return records
+        positions = self._keys.searchsorted(np.array([key for _, key in wanted], dtype=self._keys.dtype))
+        for (i, key), position in zip(wanted, positions.tolist()):
+            if position < len(self._keys) and self._keys[position] == key:
+                records[i] = self._decoded(int(self._key_records[position]))
+        return records
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def keys(self) -> List[str]:
+        """Every searchable (normalized) name, canonical and alias."""
+        return [key.decode() for key in self._keys.tolist()]
+
+    def names(self, name_field: str = "name") -> Dict[str, str]:
+        """Searchable name -> canonical name of the record it resolves to."""
+        canonical: Dict[int, Any] = {}
+        names = {}
+        for key, record in zip(self.keys(), self._key_records.tolist()):
+            if record not in canonical:
+                canonical[record] = self._record(record).get(name_field)
+            names[key] = canonical[record] or key
+        return names
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in (self._records, self._offsets, self._keys, self._key_records)))
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return json.loads(self._records[start:end].tobytes())
+
+
+class Snapshot:
+    """A snapshot file mapped read-only.
+
+    ``section`` returns views of the mapping (``MappedDrugIndex`` or
+    ``TradeStore``), which keep it alive for as long as they are referenced.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"{self.path} is not a data snapshot")
+        magic, fmt, _, version, created_ns, dir_offset, dir_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a data snapshot")
+        if fmt != SNAPSHOT_FORMAT:
+            raise SnapshotError(f"{self.path} has format {fmt}, expected {SNAPSHOT_FORMAT}; rebuild it")
+        self.version = version
+        self.created_at = created_ns / 1e9
+        self.datasets: Dict[str, Dict[str, Any]] = json.loads(self._map[dir_offset:dir_offset + dir_length])
+
+    def arrays(self, name: str) -> Dict[str, np.ndarray]:
+        try:
+            parts = self.datasets[name]["arrays"]
+        except KeyError:
+            raise KeyError(f"Dataset {name} is not in snapshot {self.path.name}") from None
+        arrays = {}
+        for part, (offset, dtype, shape) in parts.items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            if count:
+                arrays[part] = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset).reshape(shape)
+            else:
+                arrays[part] = np.empty(shape, dtype=dtype)
+        return arrays
+
+    def section(self, name: str) -> Any:
+        arrays = self.arrays(name)
+        if self.datasets[name]["kind"] == "trade":
+            return TradeStore.from_arrays(arrays)
+        return MappedDrugIndex(arrays)
+
+    def stale(self, data_dir: Path) -> List[str]:
+        """Datasets whose source file in ``data_dir`` changed since the build."""
+        changed = []
+        for name, entry in self.datasets.items():
+            source = entry["source"]
+            try:
+                stat = os.stat(Path(data_dir) / source["file"])
+            except FileNotFoundError:
+                changed.append(name)
+                continue
+            if [stat.st_mtime_ns, stat.st_size] != [source["mtime_ns"], source["size"]]:
+                changed.append(name)
+        return changed
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._map)
+
+
+def current_snapshot(snapshot_dir: Path) -> Optional[Path]:
+    """Path of the live snapshot, or None if none has been built."""
+    try:
+        name = (Path(snapshot_dir) / CURRENT).read_text().strip()
+    except FileNotFoundError:
+        return None
+    return Path(snapshot_dir) / name if name else None
+
+
+_opened: Optional[Snapshot] = None
+_opened_lock = threading.Lock()
+
+
+def open_current(snapshot_dir: Path) -> Snapshot:
+    """The live snapshot, mapped once per process and remapped after a swap."""
+    global _opened
+    path = current_snapshot(snapshot_dir)
+    if path is None:
+        raise FileNotFoundError(f"No data snapshot in {snapshot_dir}")
+    with _opened_lock:
+        if _opened is None or _opened.path != path:
+            _opened = Snapshot(path)
+        return _opened
+
+
+def section_loader(name: str) -> Callable[[Path], Any]:
+    """DataStore loader for one dataset, registered against the CURRENT file
+    so the store reloads the section when a new snapshot is swapped in."""
+    def load(pointer: Path) -> Any:
+        return open_current(pointer.parent).section(name)
+    return load
+
+
+def build_snapshot(
+    data_dir: Path,
+    snapshot_dir: Path,
+    datasets: Mapping[str, Tuple[str, Callable[[Path], Any]]],
+    keep: int = KEEP_SNAPSHOTS,
+) -> Path:
+    """Compile ``datasets`` (name -> (file in ``data_dir``, loader)) into the
+    next snapshot version, make it current and prune old versions."""
+    data_dir, snapshot_dir = Path(data_dir), Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    sections = {}
+    for name, (filename, loader) in datasets.items():
+        path = data_dir / filename
+        stat = os.stat(path)
+        value = loader(path)
+        if isinstance(value, TradeStore):
+            kind, arrays = "trade", value.to_arrays()
+        else:
+            kind, arrays = "drugs", _drug_arrays(value)
+        sections[name] = (kind, {"file": filename, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}, arrays)
+
+    version = _latest_version(snapshot_dir) + 1
+    while True:
+        path = snapshot_dir / f"snapshot-{version:06d}.mnx"
+        try:
+            # Exclusive create reserves the version against a concurrent build
+            f = open(path, "xb")
+            break
+        except FileExistsError:
+            version += 1
+    try:
+        with f:
+            _write(f, version, sections)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    _swap_current(snapshot_dir, path.name)
+    prune(snapshot_dir, keep)
+    return path
+
+
+def prune(snapshot_dir: Path, keep: int = KEEP_SNAPSHOTS) -> List[Path]:
+    """Delete all but the newest ``keep`` snapshots, never the current one."""
+    current = current_snapshot(snapshot_dir)
+    removed = []
+    for _, path in sorted(_versions(snapshot_dir), reverse=True)[max(keep, 1):]:
+        if path != current:
+            path.unlink(missing_ok=True)
+            removed.append(path)
+    return removed
+
+
+def _drug_arrays(raw_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    # Same keys and precedence as DrugIndex, fixed at build time
+    index = build_drug_index(raw_data)
+    records = index.records()
+    position = {id(record): i for i, record in enumerate(records)}
+    blobs = [json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode() for record in records]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    entries = sorted((key.encode(), position[id(record)]) for key, record in index.items())
+    return {
+        "records": np.frombuffer(b"".join(blobs), dtype=np.uint8),
+        "record_offsets": offsets,
+        "keys": np.array([key for key, _ in entries], dtype=bytes),
+        "key_records": np.array([record for _, record in entries], dtype=np.int32),
+    }
+
+
+def _write(f, version: int, sections: Dict[str, Tuple[str, Dict[str, Any], Dict[str, np.ndarray]]]) -> None:
+    f.write(b"\x00" * ALIGN)
+    offset = ALIGN
+    directory = {}
+    for name, (kind, source, arrays) in sections.items():
+        parts = {}
+        for part, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            pad = -offset % ALIGN
+            f.write(b"\x00" * pad)
+            offset += pad
+            parts[part] = [offset, array.dtype.str, list(array.shape)]
+            f.write(array.tobytes())
+            offset += array.nbytes
+        directory[name] = {"kind": kind, "source": source, "arrays": parts}
+    encoded = json.dumps(directory, separators=(",", ":")).encode()
+    f.write(encoded)
+    f.seek(0)
+    f.write(_HEADER.pack(MAGIC, SNAPSHOT_FORMAT, 0, version, time.time_ns(), offset, len(encoded)))
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _swap_current(snapshot_dir: Path, name: str) -> None:
+    tmp_path = snapshot_dir / f".{CURRENT}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(name + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, snapshot_dir / CURRENT)
+    # Persist the rename itself
+    dir_fd = os.open(snapshot_dir, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _versions(snapshot_dir: Path) -> List[Tuple[int, Path]]:
+    versions = []
+    for path in Path(snapshot_dir).iterdir():
+        match = _SNAPSHOT_NAME.match(path.name)
+        if match:
+            versions.append((int(match.group(1)), path))
+    return versions
+
+
+def _latest_version(snapshot_dir: Path) -> int:
+    return max((version for version, _ in _versions(snapshot_dir)), default=0)
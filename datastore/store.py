@@ -0,0 +1,230 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+Version = Tuple[int, int]
+
+
+@dataclass
+class DatasetStats:
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    evictions: int = 0
+    loads: int = 0
+    load_seconds_total: float = 0.0
+    last_load_seconds: float = 0.0
+    size_bytes: int = 0
+
+
+@dataclass
+class _Dataset:
+    name: str
+    path: Path
+    loader: Callable[[Path], Any]
+    sizer: Callable[[Any], int]
+    lock: threading.Lock
+    stats: DatasetStats
+    value: Any = None
+    version: Optional[Version] = None
+    checked_at: float = 0.0
+    derived: Optional[Dict[Hashable, Any]] = None
+
+
+def estimate_size(obj: Any) -> int:
+    """Rough deep size of a parsed JSON document, a pandas DataFrame or any
+    object exposing ``nbytes``."""
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except TypeError:
+            pass
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class DataStore:
+    """Loads each registered dataset once and shares it across threads.
+
+    A dataset is reloaded when its file's mtime or size changes (checked at most
+    every ``check_interval`` seconds), and the least recently used datasets are
+    dropped once the estimated in-memory size exceeds ``budget_bytes``. Values
+    handed out are shared and must be treated as read-only.
+
+    ``derive`` caches objects built from a dataset (indexes, aggregates) and
+    discards them whenever the dataset is reloaded.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, check_interval: float = 0.5):
+        self.budget_bytes = budget_bytes
+        self.check_interval = check_interval
+        self._datasets: Dict[str, _Dataset] = {}
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        path: Path,
+        loader: Callable[[Path], Any],
+        sizer: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        with self._lock:
+            self._datasets[name] = _Dataset(
+                name=name,
+                path=Path(path),
+                loader=loader,
+                sizer=sizer,
+                lock=threading.Lock(),
+                stats=DatasetStats(),
+            )
+
+    def get(self, name: str) -> Any:
+        dataset = self._dataset(name)
+        value = dataset.value
+        if value is not None and time.monotonic() - dataset.checked_at < self.check_interval:
+            self._hit(dataset)
+            return value
+
+        with dataset.lock:
+            current = _file_version(dataset.path)
+            dataset.checked_at = time.monotonic()
+            loaded = dataset.value is None or dataset.version != current
+            if loaded:
+                self._load(dataset, current)
+            else:
+                self._hit(dataset)
+            value = dataset.value
+        # Outside our own lock, so two threads loading at once can't wait on each other
+        if loaded:
+            self._enforce_budget(keep=name)
+        return value
+
+    def derive(self, name: str, key: Hashable, builder: Callable[[Any], Any]) -> Any:
+        """Return ``builder(dataset)`` cached until the dataset next changes."""
+        value = self.get(name)
+        dataset = self._dataset(name)
+        derived = dataset.derived
+        if derived is not None and key in derived:
+            return derived[key]
+        with dataset.lock:
+            # Build from whatever is loaded now; it may have been reloaded since get()
+            if dataset.value is not None:
+                value = dataset.value
+            if dataset.derived is None:
+                dataset.derived = {}
+            if key not in dataset.derived:
+                dataset.derived[key] = builder(value)
+            return dataset.derived[key]
+
+    def version(self, name: str) -> Optional[Version]:
+        """(mtime_ns, size) of the currently loaded copy, or None if not loaded."""
+        return self._dataset(name).version
+
+    def versions(self) -> Dict[str, Version]:
+        """Current on-disk version of every registered dataset."""
+        return {name: _file_version(ds.path) for name, ds in self._datasets.items()}
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        names = [name] if name else list(self._datasets)
+        for dataset_name in names:
+            dataset = self._dataset(dataset_name)
+            with dataset.lock:
+                self._drop(dataset)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: asdict(ds.stats) for name, ds in self._datasets.items()}
+
+    def resident_bytes(self) -> int:
+        return sum(ds.stats.size_bytes for ds in self._datasets.values() if ds.value is not None)
+
+    def _dataset(self, name: str) -> _Dataset:
+        try:
+            return self._datasets[name]
+        except KeyError:
+            raise KeyError(f"Unknown dataset: {name}") from None
+
+    def _hit(self, dataset: _Dataset) -> None:
+        with self._lock:
+            dataset.stats.hits += 1
+            if dataset.name in self._lru:
+                self._lru.move_to_end(dataset.name, last=True)
+
+    def _load(self, dataset: _Dataset, version: Version) -> None:
+        stats = dataset.stats
+        stats.misses += 1
+        if dataset.value is not None:
+            stats.reloads += 1
+
+        start = time.perf_counter()
+        value = dataset.loader(dataset.path)
+        elapsed = time.perf_counter() - start
+
+        stats.loads += 1
+        stats.last_load_seconds = elapsed
+        stats.load_seconds_total += elapsed
+        stats.size_bytes = dataset.sizer(value)
+
+        dataset.value = value
+        dataset.version = version
+        dataset.derived = None
+        with self._lock:
+            self._lru[dataset.name] = None
+            self._lru.move_to_end(dataset.name, last=True)
+
+    def _drop(self, dataset: _Dataset) -> None:
+        dataset.value = None
+        dataset.version = None
+        dataset.derived = None
+        dataset.checked_at = 0.0
+        with self._lock:
+            self._lru.pop(dataset.name, None)
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Drop the least recently used datasets until within budget, in one
+        pass. Datasets another thread is loading are skipped rather than
+        waited for, so the budget may be overshot until the next load."""
+        if not self.budget_bytes:
+            return
+        with self._lock:
+            victims = [name for name in self._lru if name != keep]
+        for victim in victims:
+            if self.resident_bytes() <= self.budget_bytes:
+                return
+            dataset = self._datasets[victim]
+            if not dataset.lock.acquire(blocking=False):
+                continue
+            try:
+                if dataset.value is not None:
+                    self._drop(dataset)
+                    dataset.stats.evictions += 1
+            finally:
+                dataset.lock.release()
+
+
+def _file_version(path: Path) -> Version:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
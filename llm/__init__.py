@@ -1 +1,100 @@
 # LLM package
+import os
+from pathlib import Path
+from typing import Dict, Any, Generator, Union
+
+from contracts.results import AggregatedData, as_dict
+from llm.cache import SummaryCache
+from telemetry import instrument
+
+
+# "gemini" (default) or "stub" for a deterministic offline summarizer
+LLM_BACKEND = os.environ.get("MEDNEXA_LLM", "gemini").lower()
+
+# Summary cache: set MEDNEXA_SUMMARY_CACHE=0 to always call the LLM
+SUMMARY_CACHE_ENABLED = os.environ.get("MEDNEXA_SUMMARY_CACHE", "1") != "0"
+CACHE_DIR = Path(os.environ.get("MEDNEXA_CACHE_DIR", Path(__file__).parent.parent / ".cache"))
+
+summary_cache = SummaryCache(
+    max_entries=int(os.environ.get("MEDNEXA_SUMMARY_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.environ.get("MEDNEXA_SUMMARY_CACHE_TTL", "86400")),
+    cache_dir=CACHE_DIR / "summaries",
+    max_disk_entries=int(os.environ.get("MEDNEXA_SUMMARY_CACHE_DISK_ENTRIES", "10000")),
+)
+
+
+def load_backend():
+    """Import the configured backend (the Gemini SDK import is slow), so it
+    can be done at startup rather than on the first request."""
+    return _backend()[0]
+
+
+def _backend():
+    if LLM_BACKEND == "stub":
+        from llm import stub_summarizer as backend
+        return backend, backend.STUB_MODEL
+    from llm import gemini_summarizer as backend
+    return backend, backend.GEMINI_MODEL
+
+
+def _cache_key(aggregated_data: Dict[str, Any], model: str) -> str:
+    from datastore import get_store
+
+    return SummaryCache.make_key(aggregated_data, model, get_store().versions())
+
+
+@instrument("llm", "summarize")
+def summarize(aggregated_data: Union[AggregatedData, Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize with the configured backend, reusing a cached summary when the
+    same data (ignoring timestamps) was summarized against the same dataset
+    versions before."""
+    aggregated_data = as_dict(aggregated_data)
+    backend, model = _backend()
+    if not SUMMARY_CACHE_ENABLED:
+        return backend.summarize(aggregated_data)
+
+    key = _cache_key(aggregated_data, model)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    output = backend.summarize(aggregated_data)
+    if not output.get("fallback"):
+        summary_cache.put(key, output)
+    return output
+
+
+@instrument("llm", "summarize_async")
+async def summarize_async(aggregated_data: Union[AggregatedData, Dict[str, Any]]) -> Dict[str, Any]:
+    """``summarize`` as a coroutine, for running many summaries on the LLM
+    loop (``llm.client.submit``) without a thread each."""
+    aggregated_data = as_dict(aggregated_data)
+    backend, model = _backend()
+    key = _cache_key(aggregated_data, model) if SUMMARY_CACHE_ENABLED else None
+    cached = summary_cache.get(key) if key else None
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    output = await backend.summarize_async(aggregated_data)
+    if key and not output.get("fallback"):
+        summary_cache.put(key, output)
+    return output
+
+
+@instrument("llm", "summarize_stream")
+def summarize_stream(aggregated_data: Union[AggregatedData, Dict[str, Any]]) -> Generator[str, None, Dict[str, Any]]:
+    """Like ``summarize`` but yields text chunks as the model produces them;
+    the generator returns the full output dict. A cached summary is yielded
+    as a single chunk."""
+    aggregated_data = as_dict(aggregated_data)
+    backend, model = _backend()
+    key = _cache_key(aggregated_data, model) if SUMMARY_CACHE_ENABLED else None
+    cached = summary_cache.get(key) if key else None
+    if cached is not None:
+        yield cached["summary"]
+        return {**cached, "cached": True}
+
+    output = yield from backend.summarize_stream(aggregated_data)
+    if key and not output.get("fallback"):
+        summary_cache.put(key, output)
+    return output
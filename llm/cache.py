@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from contracts.fingerprint import content_hash
+
+
+class SummaryCache:
+    """Two-tier cache for LLM summaries: an in-memory LRU in front of one JSON
+    file per entry on disk (so entries survive restarts and are shared between
+    worker processes).
+
+    Entries expire after ``ttl_seconds``. Keys are content hashes, so callers
+    fold everything that should invalidate an entry (aggregated data, model,
+    dataset versions) into ``make_key``. Since a dataset change makes every
+    old key unreachable, the disk tier is swept (``sweep_disk``) on the first
+    write and whenever it grows past ``max_disk_entries``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 86400,
+        cache_dir: Optional[Path] = None,
+        max_disk_entries: int = 10000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        # Entry files on disk as of the last sweep plus writes since; None
+        # until the first sweep. Other processes' writes are only seen then.
+        self._disk_entries: Optional[int] = None
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(aggregated_data: Dict[str, Any], model: str, dataset_version: Any = None) -> str:
+        return content_hash({"data": aggregated_data, "model": model, "datasets": dataset_version})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            created_at, value = entry
+            if now - created_at <= self.ttl_seconds:
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, created_at, value)
+                return value
+            self._delete_disk(key)
+            with self._lock:
+                self._counters["expired"] += 1
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._counters["stores"] += 1
+            self._remember(key, created_at, value)
+        if self._write_disk(key, created_at, value):
+            with self._lock:
+                if self._disk_entries is not None:
+                    self._disk_entries += 1
+                sweep = self._disk_entries is None or self._disk_entries > self.max_disk_entries
+            if sweep:
+                self.sweep_disk()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_entries = None
+        if self.cache_dir and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def sweep_disk(self) -> int:
+        """Delete expired entry files, then the oldest until at most 90% of
+        ``max_disk_entries`` remain (so sweeps stay rare). Returns the number
+        deleted; 0 if another thread is already sweeping."""
+        if not self.cache_dir or not self._sweep_lock.acquire(blocking=False):
+            return 0
+        try:
+            files = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+            files.sort()
+            keep = int(self.max_disk_entries * 0.9)
+            cutoff = time.time() - self.ttl_seconds
+            removed = 0
+            for mtime, path in files:
+                if mtime >= cutoff and len(files) - removed <= keep:
+                    break
+                path.unlink(missing_ok=True)
+                removed += 1
+            with self._lock:
+                self._disk_entries = len(files) - removed
+                self._counters["disk_evictions"] += removed
+            return removed
+        finally:
+            self._sweep_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._memory)
+            counters["disk_entries"] = self._disk_entries or 0
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        counters["hit_rate"] = (counters["memory_hits"] + counters["disk_hits"]) / lookups if lookups else 0.0
+        return counters
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "r") as f:
+                entry = json.load(f)
+            return entry["created_at"], entry["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, created_at: float, value: Dict[str, Any]) -> bool:
+        if not self.cache_dir:
+            return False
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"created_at": created_at, "value": value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            print(f"[SummaryCache] Could not write {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _delete_disk(self, key: str) -> None:
+        if self.cache_dir:
+            self._path(key).unlink(missing_ok=True)
@@ -0,0 +1,328 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, Optional, TypeVar
+
+
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Concurrent LLM calls per process, per-call timeout, retries on 429/5xx and
+# circuit breaker settings
+MAX_LLM_CALLS = int(os.environ.get("MEDNEXA_MAX_LLM_CALLS", "4"))
+LLM_TIMEOUT = float(os.environ.get("MEDNEXA_LLM_TIMEOUT", "30"))
+LLM_RETRIES = int(os.environ.get("MEDNEXA_LLM_RETRIES", "3"))
+BREAKER_THRESHOLD = int(os.environ.get("MEDNEXA_LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.environ.get("MEDNEXA_LLM_BREAKER_RESET", "30"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class LLMUnavailableError(Exception):
+    """The LLM could not produce a response (retries exhausted, timeout or
+    open circuit). Callers fall back to a data-only summary."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failed calls and rejects
+    calls for ``reset_seconds``; then lets one trial call through (half-open).
+    A call counts once, however many attempts it retried."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+    def record_abandoned(self) -> None:
+        """A call ended without an outcome (cancelled, or its stream dropped
+        by the consumer): free the half-open trial without counting it."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+
+class GeminiClient:
+    """Long-lived Gemini client shared by every request in the process.
+
+    The model object is built once. Every call runs as a coroutine on one
+    process-wide event loop (``get_loop``), so a slow or hung call holds no
+    thread of its own: it is limited to ``max_concurrency`` at a time, timed
+    out after ``timeout`` seconds, retried with jittered exponential backoff
+    on 429/5xx and timeouts, and passed through a circuit breaker. The sync
+    ``generate``/``generate_stream`` wait on the loop for callers that are
+    not async. Any object with ``generate_content_async`` can be passed as
+    ``model`` (e.g. a fake for local testing).
+    """
+
+    def __init__(
+        self,
+        model: Any = None,
+        model_name: str = GEMINI_MODEL,
+        max_concurrency: int = MAX_LLM_CALLS,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_RETRIES,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET)
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._max_concurrency = max_concurrency
+        # asyncio semaphores are bound to the loop that first uses them
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from llm.gemini_summarizer import configure_gemini
+                    import google.generativeai as genai
+
+                    configure_gemini()
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt: str) -> str:
+        return submit(self.generate_async(prompt)).result()
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Yield text chunks as the model produces them (see
+        ``generate_stream_async``)."""
+        stream = self.generate_stream_async(prompt)
+        try:
+            while True:
+                try:
+                    yield submit(_next_chunk(stream)).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            submit(stream.aclose()).result()
+
+    async def generate_async(self, prompt: str) -> str:
+        attempt = 0
+        with self._breaker_call() as call:
+            while True:
+                try:
+                    async with self._async_semaphore():
+                        response = await asyncio.wait_for(
+                            self.model.generate_content_async(prompt, request_options={"timeout": self.timeout}),
+                            timeout=self.timeout,
+                        )
+                    text = response_text(response)
+                except Exception as e:
+                    attempt = self._on_failure(e, attempt)
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                call.answered = True
+                return text
+
+    async def generate_stream_async(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as the model produces them; each must arrive
+        within ``timeout``.
+
+        Failures before the first chunk are retried like ``generate_async``;
+        once text has been yielded a failure raises ``LLMUnavailableError``
+        rather than restarting the response.
+        """
+        attempt = 0
+        with self._breaker_call() as call:
+            while True:
+                try:
+                    async with self._async_semaphore():
+                        response = await asyncio.wait_for(
+                            self.model.generate_content_async(prompt, stream=True, request_options={"timeout": self.timeout}),
+                            timeout=self.timeout,
+                        )
+                        chunks = response.__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                            except StopAsyncIteration:
+                                break
+                            text = response_text(chunk)
+                            if text:
+                                call.answered = True
+                                yield text
+                except Exception as e:
+                    if call.answered:
+                        raise LLMUnavailableError(f"Gemini stream interrupted: {str(e) or type(e).__name__}") from e
+                    attempt = self._on_failure(e, attempt)
+                else:
+                    call.answered = True
+                    return
+                await asyncio.sleep(self._backoff(attempt))
+
+    @contextmanager
+    def _breaker_call(self) -> Iterator["_Call"]:
+        """Admit one call through the circuit breaker and record its outcome
+        once: a success if the model answered, a failure if the call gave
+        up. A call that ends otherwise (cancelled, or a stream the consumer
+        dropped before any text) releases its half-open trial."""
+        self._check_breaker()
+        call = _Call()
+        try:
+            yield call
+        except LLMUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            if call.answered:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_abandoned()
+            raise
+        else:
+            self.breaker.record_success()
+
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError("Gemini circuit breaker is open")
+
+    def _on_failure(self, error: Exception, attempt: int) -> int:
+        """Raise if a failed attempt shouldn't be retried, else return the
+        new attempt count."""
+        reason = str(error) or type(error).__name__
+        if not is_retryable(error):
+            raise LLMUnavailableError(f"Gemini call failed: {reason}") from error
+        attempt += 1
+        if attempt > self.max_retries:
+            raise LLMUnavailableError(f"Gemini call failed after {attempt} attempts: {reason}") from error
+        print(f"[GeminiClient] Attempt {attempt} failed ({reason}); retrying")
+        return attempt
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform between 0 and the capped exponential delay
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_slots.get(loop)
+        if semaphore is None:
+            semaphore = self._async_slots[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
+
+class _Call:
+    __slots__ = ("answered",)
+
+    def __init__(self):
+        self.answered = False
+
+
+async def _next_chunk(stream: AsyncIterator[str]) -> str:
+    return await stream.__anext__()
+
+
+def response_text(response: Any) -> str:
+    try:
+        return response.text
+    except AttributeError:
+        return str(response)
+    except ValueError:
+        # Gemini raises ValueError for responses/chunks without text parts
+        return ""
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None)
+    code = getattr(code, "value", code)
+    return isinstance(code, int) and code in RETRYABLE_STATUS
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The event loop LLM calls run on, in a daemon thread started on first use."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="mednexa-llm", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> "Future[T]":
+    """Schedule ``coro`` on the LLM loop. The returned future can be waited
+    on, or cancelled, from any thread."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+_client: Optional[GeminiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GeminiClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient()
+    return _client
+
+
+def set_client(client: Optional[GeminiClient]) -> None:
+    """Replace the process-wide client (e.g. with one wrapping a fake model)."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from contracts.results import compared_drugs
+
+
+DATA_ONLY_MODEL = "data-only"
+
+
+def _scalars(data: Dict[str, Any]) -> str:
+    return ", ".join(
+        f"{key}={value}" for key, value in sorted(data.items())
+        if isinstance(value, (int, float, str))
+    )
+
+
+def build_data_summary(aggregated_data: Dict[str, Any]) -> str:
+    """Deterministic summary derived only from the aggregated data."""
+    entities = aggregated_data.get("query_context", {}).get("extracted_entities", {})
+    worker_results = aggregated_data.get("worker_results", {})
+    drug_names = entities.get("drug_names") or [entities.get("drug_name", "N/A")]
+
+    lines = [
+        "1. Executive Summary",
+        f"Data-only summary for {' vs '.join(drug_names)} "
+        f"({entities.get('therapeutic_area', 'N/A')}) across {', '.join(entities.get('regions', [])) or 'N/A'}.",
+        "",
+        "2. Key Findings",
+    ]
+    for agent in sorted(worker_results):
+        result = worker_results[agent]
+        if result.get("status", "success") != "success":
+            lines.append(f"- {agent}: {result.get('message') or 'no data'}")
+            continue
+        data = result.get("data", {})
+        drugs = compared_drugs(data)
+        if drugs is None:
+            lines.append(f"- {agent}: {_scalars(data) or 'no scalar metrics'}")
+            continue
+        for drug, drug_data in drugs.items():
+            scalars = (_scalars(drug_data) or "no scalar metrics") if drug_data is not None else "no data"
+            lines.append(f"- {agent} ({drug}): {scalars}")
+    lines += ["", "3. Risks", "- Not assessed (no LLM analysis)", "", "4. Opportunities", "- Not assessed (no LLM analysis)"]
+    return "\n".join(lines)
+
+
+def data_only_output(aggregated_data: Dict[str, Any], error: Optional[Exception] = None) -> Dict[str, Any]:
+    """Summarizer output used when the LLM is unavailable. Marked ``fallback``
+    so it is never cached."""
+    return {
+        "summary": build_data_summary(aggregated_data),
+        "gemini_model": DATA_ONLY_MODEL,
+        "fallback": True,
+        "error": str(error) if error else None,
+        "timestamp": datetime.now().isoformat()
+    }
@@ -1,9 +1,12 @@
 import os
-import json
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Generator
 import google.generativeai as genai
 
+from llm.client import GEMINI_MODEL, LLMUnavailableError, get_client
+from llm.fallback import data_only_output
+from llm.prompt import Prompt, build_prompt
+
 
 
 def configure_gemini():
@@ -14,28 +17,51 @@ def configure_gemini():
 
 
 def summarize(aggregated_data: Dict[str, Any]) -> Dict[str, Any]:
-    configure_gemini()
-    prompt = f"""You are a pharmaceutical portfolio analyst. Summarize the following data into an executive report.
-
-STRICT RULES:
-- Do NOT invent or modify any numbers
-- Use ONLY the provided data
-- Structure your output with these sections:
-  1. Executive Summary (2-3 sentences overview)
-  2. Key Findings (bullet points of important insights)
-  3. Risks (potential concerns identified from data)
-  4. Opportunities (growth potential and strategic advantages)
-
-Data:
-{json.dumps(aggregated_data, indent=2)}
-"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content(prompt)
-    summary_text = response.text if hasattr(response, 'text') else str(response)
-    output = {
+    prompt = build_prompt(aggregated_data)
+    try:
+        summary_text = get_client().generate(prompt.text)
+    except LLMUnavailableError as e:
+        print(f"[Gemini] {e}; falling back to data-only summary")
+        return data_only_output(aggregated_data, e)
+    return _output(summary_text, prompt)
+
+
+def summarize_stream(aggregated_data: Dict[str, Any]) -> Generator[str, None, Dict[str, Any]]:
+    """Yield summary text chunks as Gemini streams them; the generator's
+    return value is the same output dict ``summarize`` returns."""
+    prompt = build_prompt(aggregated_data)
+    chunks = []
+    try:
+        for chunk in get_client().generate_stream(prompt.text):
+            chunks.append(chunk)
+            yield chunk
+    except LLMUnavailableError as e:
+        if chunks:
+            note = f"\n\n[Summary incomplete: {e}]"
+            chunks.append(note)
+            yield note
+            return {**_output("".join(chunks), prompt), "fallback": True, "error": str(e)}
+        print(f"[Gemini] {e}; falling back to data-only summary")
+        output = data_only_output(aggregated_data, e)
+        yield output["summary"]
+        return output
+    return _output("".join(chunks), prompt)
+
+
+async def summarize_async(aggregated_data: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = build_prompt(aggregated_data)
+    try:
+        summary_text = await get_client().generate_async(prompt.text)
+    except LLMUnavailableError as e:
+        print(f"[Gemini] {e}; falling back to data-only summary")
+        return data_only_output(aggregated_data, e)
+    return _output(summary_text, prompt)
+
+
+def _output(summary_text: str, prompt: Prompt) -> Dict[str, Any]:
+    return {
         "summary": summary_text,
-        "gemini_model": "gemini-2.0-flash",
+        "gemini_model": GEMINI_MODEL,
+        **prompt.stats(),
         "timestamp": datetime.now().isoformat()
     }
-    
-    return output
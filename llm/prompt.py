@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from contracts.fingerprint import strip_volatile
+from contracts.results import compared_drugs
+
+
+# Input-token budget for the data section of the prompt (0 disables trimming)
+PROMPT_TOKEN_BUDGET = int(os.environ.get("MEDNEXA_PROMPT_TOKEN_BUDGET", "1500"))
+# Rough chars-per-token ratio for English/JSON text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+INSTRUCTIONS = """You are a pharmaceutical portfolio analyst. Summarize the following data into an executive report.
+
+STRICT RULES:
+- Do NOT invent or modify any numbers
+- Use ONLY the provided data
+- Structure your output with these sections:
+  1. Executive Summary (2-3 sentences overview)
+  2. Key Findings (bullet points of important insights)
+  3. Risks (potential concerns identified from data)
+  4. Opportunities (growth potential and strategic advantages)
+- If "compare" lists several drugs, each source's data is keyed by drug under "drugs" (null where a source has nothing for that drug); compare the drugs side by side in every section
+
+Data (compact JSON; each key under "results" is a data source):
+"""
+
+# Query entities the model needs; the rest of query_context is routing detail
+CONTEXT_FIELDS = ("drug_name", "therapeutic_area", "regions", "timeframe")
+
+# What to drop, lowest priority first, when the data exceeds the budget.
+# (agent, field) removes one field; (agent, None) removes the whole source.
+TRIM_ORDER: List[Tuple[str, Optional[str]]] = [
+    ("web_intelligence", "market_rumors"),
+    ("web_intelligence", "regulatory_updates"),
+    ("exim", "trade_barriers"),
+    ("iqvia", "prescription_trends"),
+    ("patent", "expiring_soon"),
+    ("iqvia", "competitor_share"),
+    ("web_intelligence", None),
+    ("internal_knowledge", None),
+    ("exim", None),
+    ("clinical_trials", None),
+]
+
+
+@dataclass
+class Prompt:
+    text: str
+    data_bytes: int
+    est_tokens: int
+    trimmed: List[str] = field(default_factory=list)
+
+    @property
+    def bytes(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "prompt_bytes": self.bytes,
+            "prompt_tokens_est": self.est_tokens,
+            "prompt_trimmed": self.trimmed,
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact_payload(aggregated_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of the aggregated data the model needs: query entities and
+    each source's data (or its not-found message), without timestamps or
+    routing metadata."""
+    query_context = aggregated_data.get("query_context", {})
+    entities = query_context.get("extracted_entities", {})
+    payload: Dict[str, Any] = {
+        "query": query_context.get("original_query", ""),
+        **{key: entities[key] for key in CONTEXT_FIELDS if entities.get(key)},
+    }
+    drug_names = entities.get("drug_names") or []
+    if len(drug_names) > 1:
+        payload["compare"] = drug_names
+    results = {}
+    for agent, result in aggregated_data.get("worker_results", {}).items():
+        if result.get("status", "success") != "success":
+            results[agent] = {"missing": result.get("message") or "no data"}
+        else:
+            results[agent] = strip_volatile(result.get("data", {}))
+    payload["results"] = results
+    return payload
+
+
+def serialize(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def build_prompt(aggregated_data: Dict[str, Any], token_budget: Optional[int] = None) -> Prompt:
+    """Build the summarizer prompt, trimming low-priority data (see
+    ``TRIM_ORDER``) until the data section fits ``token_budget``."""
+    budget = PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    payload = compact_payload(aggregated_data)
+    data = serialize(payload)
+    trimmed: List[str] = []
+
+    if budget:
+        results = payload["results"]
+        for agent, field_name in TRIM_ORDER:
+            if estimate_tokens(data) <= budget:
+                break
+            if agent not in results:
+                continue
+            if field_name is None:
+                del results[agent]
+                trimmed.append(agent)
+            else:
+                # A comparison holds the field once per drug; trim it from all
+                drugs = compared_drugs(results[agent])
+                holders = [d for d in drugs.values() if d] if drugs is not None else [results[agent]]
+                holders = [d for d in holders if field_name in d]
+                if not holders:
+                    continue
+                for holder in holders:
+                    del holder[field_name]
+                trimmed.append(f"{agent}.{field_name}")
+            data = serialize(payload)
+
+    text = INSTRUCTIONS + data + "\n"
+    prompt = Prompt(
+        text=text,
+        data_bytes=len(data.encode("utf-8")),
+        est_tokens=estimate_tokens(text),
+        trimmed=trimmed,
+    )
+    prompt_stats.record(prompt)
+    return prompt
+
+
+class PromptStats:
+    """Running totals of prompt sizes, for spotting prompt growth over time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_bytes = 0
+        self.total_tokens_est = 0
+        self.max_bytes = 0
+        self.trimmed_prompts = 0
+        self.last: Dict[str, Any] = {}
+
+    def record(self, prompt: Prompt) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_bytes += prompt.bytes
+            self.total_tokens_est += prompt.est_tokens
+            self.max_bytes = max(self.max_bytes, prompt.bytes)
+            if prompt.trimmed:
+                self.trimmed_prompts += 1
+            self.last = prompt.stats()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_bytes": self.total_bytes,
+                "total_tokens_est": self.total_tokens_est,
+                "avg_bytes": self.total_bytes / self.count if self.count else 0,
+                "max_bytes": self.max_bytes,
+                "trimmed_prompts": self.trimmed_prompts,
+                "last": dict(self.last),
+            }
+
+
+prompt_stats = PromptStats()
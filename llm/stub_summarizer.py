@@ -0,0 +1,53 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+import re
+from typing import Dict, Any, Generator
+
+from llm.fallback import build_data_summary
+
+
+STUB_MODEL = "stub"
+
+# Simulated LLM latency in seconds, so local load tests exercise the same
+# concurrency limits as real Gemini calls.
+STUB_DELAY = float(os.environ.get("MEDNEXA_STUB_LLM_DELAY", "0"))
+
+
+# Number of chunks the stub streams its summary in
+STUB_CHUNKS = 20
+
+
+def summarize(aggregated_data: Dict[str, Any]) -> Dict[str, Any]:
+    if STUB_DELAY > 0:
+        time.sleep(STUB_DELAY)
+    return _output(build_data_summary(aggregated_data))
+
+
+async def summarize_async(aggregated_data: Dict[str, Any]) -> Dict[str, Any]:
+    if STUB_DELAY > 0:
+        await asyncio.sleep(STUB_DELAY)
+    return _output(build_data_summary(aggregated_data))
+
+
+def summarize_stream(aggregated_data: Dict[str, Any]) -> Generator[str, None, Dict[str, Any]]:
+    """Stream the stub summary in chunks, spreading ``STUB_DELAY`` across
+    them like a model producing tokens."""
+    summary = build_data_summary(aggregated_data)
+    words = re.findall(r"\S+\s*|\s+", summary)
+    size = max(1, -(-len(words) // STUB_CHUNKS))
+    chunks = ["".join(words[i:i + size]) for i in range(0, len(words), size)]
+    for chunk in chunks:
+        if STUB_DELAY > 0:
+            time.sleep(STUB_DELAY / len(chunks))
+        yield chunk
+    return _output(summary)
+
+
+def _output(summary: str) -> Dict[str, Any]:
+    return {
+        "summary": summary,
+        "gemini_model": STUB_MODEL,
+        "timestamp": datetime.now().isoformat()
+    }
@@ -183,7 +183,7 @@ export default function ChatPage() {
         content: backendResponse.summary || 'Here is your analysis.',
         timestamp: new Date(),
         data: backendResponse.data,
-        pdfPath: backendResponse.pdfFilename, // Use filename from backend
+        pdfPath: backendResponse.reportId, // Report id; the PDF renders on first download
         // Add more mapping if backend returns clarification, etc.
       };
       console.log('Assistant message pdfPath:', assistantMessage.pdfPath);
@@ -107,7 +107,7 @@ export default function SummaryPage() {
     }
     setDownloading(true);
     try {
-      const url = `${API_BASE.replace(/\/$/, '')}/download-pdf?filename=${encodeURIComponent(pdfPath)}`;
+      const url = `${API_BASE.replace(/\/$/, '')}/download-pdf?reportId=${encodeURIComponent(pdfPath)}`;
       window.open(url, '_blank');
     } catch (e) {
       alert('Failed to download PDF.');
@@ -54,11 +54,29 @@ async function fetchWithError(url: string, options?: RequestInit) {
 
 export const api = {
   async sendQuery(query: string, context?: string): Promise<any> {
-    // Updated to call /analyze endpoint as per backend
-    return fetchWithError(`${API_BASE_URL}/analyze`, {
+    // /analyze queues a job; poll /jobs/{id} until it finishes
+    const job = await fetchWithError(`${API_BASE_URL}/analyze`, {
       method: 'POST',
       body: JSON.stringify({ query, context }),
     });
+    return api.waitForJob(job.jobId);
+  },
+
+  async waitForJob(jobId: string, intervalMs = 1000): Promise<any> {
+    for (;;) {
+      const job = await fetchWithError(`${API_BASE_URL}/jobs/${jobId}`);
+      if (job.status === 'succeeded') {
+        return job.result;
+      }
+      if (job.status === 'failed' || job.status === 'cancelled') {
+        throw new Error(job.error || `Job ${job.status}`);
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  },
+
+  async cancelJob(jobId: string): Promise<any> {
+    return fetchWithError(`${API_BASE_URL}/jobs/${jobId}`, { method: 'DELETE' });
   },
 
   async getAgentResults(queryId: string): Promise<AgentResponse[]> {
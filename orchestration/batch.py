@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from orchestration.jobs import JobCancelled
+from orchestration.events import EventSink, make_event, print_sink, LOG
+from orchestration.graph import demo_summary
+from contracts.fingerprint import content_hash
+from contracts.results import AgentResult, AggregatedData
+from agents.master_agent import parse_query
+from agents import (
+    iqvia_agent,
+    exim_agent,
+    patent_agent,
+    clinical_trials_agent,
+    internal_knowledge_agent,
+    web_intelligence_agent
+)
+from llm import summarize_async
+from llm.client import submit
+from reports.store import report_store
+
+
+# Upper bound on queries per batch, and summaries produced at once
+MAX_BATCH_QUERIES = int(os.environ.get("MEDNEXA_MAX_BATCH_QUERIES", "100"))
+BATCH_SUMMARY_CONCURRENCY = int(os.environ.get("MEDNEXA_BATCH_SUMMARY_CONCURRENCY", "4"))
+
+AGENT_PROCESSORS: Dict[str, Callable[[Dict[str, Any]], AgentResult]] = {
+    "iqvia": iqvia_agent.process,
+    "exim": exim_agent.process,
+    "patent": patent_agent.process,
+    "clinical_trials": clinical_trials_agent.process,
+    "internal_knowledge": internal_knowledge_agent.process,
+    "web_intelligence": web_intelligence_agent.process,
+}
+
+# Entities each agent's result depends on; everything else in the query
+# context is ignored by the agent, so queries that agree on these share a result.
+AGENT_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "exim": ("drug_names", "regions"),
+    "iqvia": ("drug_names", "timeframe"),
+    "patent": ("drug_names", "timeframe"),
+}
+DEFAULT_AGENT_INPUTS = ("drug_names",)
+
+# List entities whose order is part of the result (comparison columns follow
+# the order the drugs were named in)
+ORDERED_INPUTS = frozenset({"drug_names"})
+
+BATCH_LABEL = "Batch"
+
+# How often the batch checks for cancellation while summaries are running
+CANCEL_POLL_SECONDS = 0.1
+
+# (agent, input values) identifying one unit of agent work
+WorkKey = Tuple[str, Tuple[Any, ...]]
+
+
+def work_key(agent: str, query_context: Dict[str, Any]) -> WorkKey:
+    entities = query_context.get("extracted_entities", {})
+    values = []
+    for name in AGENT_INPUTS.get(agent, DEFAULT_AGENT_INPUTS):
+        value = entities.get(name)
+        if isinstance(value, str):
+            value = value.casefold()
+        elif isinstance(value, list) and name in ORDERED_INPUTS:
+            value = tuple(item.casefold() for item in value)
+        elif isinstance(value, list):
+            value = tuple(sorted(value))
+        values.append(value)
+    return agent, tuple(values)
+
+
+def run_workflow_batch(
+    queries: List[str],
+    cancel_event: Optional[threading.Event] = None,
+    event_sink: Optional[EventSink] = None,
+    max_summaries: int = BATCH_SUMMARY_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Run many queries, doing shared work once.
+
+    All queries are parsed up front. Each distinct agent/input combination
+    (see ``work_key``) is computed once and its result fanned out to every
+    query that needs it; queries whose aggregated data is
+    identical share one summary and report. Summaries run at most
+    ``max_summaries`` at a time. Returns per-query results in input order and
+    dedup statistics.
+    """
+    sink = event_sink or print_sink
+    start = time.perf_counter()
+
+    def log(message: str) -> None:
+        sink(make_event(LOG, "batch", BATCH_LABEL, message=message))
+
+    def check_cancelled() -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            log("Cancelled")
+            raise JobCancelled("batch")
+
+    contexts = [parse_query(query) for query in queries]
+
+    # Distinct agent work, keyed by the inputs the agent actually reads
+    needed: Dict[int, Dict[str, WorkKey]] = {}
+    work: Dict[WorkKey, Dict[str, Any]] = {}
+    for i, context in enumerate(contexts):
+        needed[i] = {}
+        for agent in context["required_agents"]:
+            if agent not in AGENT_PROCESSORS:
+                continue
+            key = work_key(agent, context)
+            needed[i][agent] = key
+            work.setdefault(key, context)
+    requested_calls = sum(len(keys) for keys in needed.values())
+    calls_by_agent: Dict[str, int] = {}
+    for agent, _ in work:
+        calls_by_agent[agent] = calls_by_agent.get(agent, 0) + 1
+    log(f"{len(queries)} queries; {len(work)} agent calls instead of {requested_calls} "
+        f"({', '.join(f'{agent} {count}' for agent, count in calls_by_agent.items())})")
+
+    check_cancelled()
+    agent_results: Dict[WorkKey, AgentResult] = {}
+    agent_errors: Dict[WorkKey, str] = {}
+    # Agent lookups are in-memory and quick, so one pool for the whole batch
+    with ThreadPoolExecutor(max_workers=min(len(AGENT_PROCESSORS), max(len(work), 1))) as pool:
+        futures = {key: pool.submit(AGENT_PROCESSORS[key[0]], context) for key, context in work.items()}
+        for key, future in futures.items():
+            try:
+                agent_results[key] = future.result()
+            except Exception as e:
+                agent_errors[key] = f"{key[0]}: {e}"
+                log(f"Agent {key[0]} failed: {e}")
+
+    # Fan agent results back out and dedupe identical reports
+    reports: Dict[str, AggregatedData] = {}
+    report_for: Dict[int, str] = {}
+    errors: Dict[int, str] = {}
+    for i, context in enumerate(contexts):
+        failed = [agent_errors[key] for key in needed[i].values() if key in agent_errors]
+        if failed:
+            errors[i] = "; ".join(failed)
+            continue
+        # Agent results are shared by reference between the queries using them
+        aggregated = AggregatedData(
+            query_context=context,
+            worker_results={agent: agent_results[key] for agent, key in needed[i].items()},
+        )
+        report_id = content_hash(aggregated.to_dict())
+        reports.setdefault(report_id, aggregated)
+        report_for[i] = report_id
+
+    check_cancelled()
+
+    # Summaries run as coroutines on the LLM loop, at most ``max_summaries`` at
+    # a time, so none of them holds a thread; this thread saves each report as
+    # its summary arrives
+    produced: Dict[str, Dict[str, Any]] = {}
+
+    def save(report_id: str, summary: str) -> None:
+        try:
+            produced[report_id] = {"summary": summary, "reportId": report_store.save(summary, reports[report_id])}
+        except Exception as e:
+            log(f"Saving report failed: {e}")
+            produced[report_id] = {"error": str(e)}
+        log(f"Report {len(produced)}/{len(reports)} ready")
+
+    waiting: Deque[str] = deque()
+    for report_id, aggregated in reports.items():
+        summary = demo_summary(aggregated.query_context.get("original_query"))
+        if summary is None:
+            waiting.append(report_id)
+        else:
+            save(report_id, summary)
+
+    pending: Dict[Future, str] = {}
+    try:
+        while waiting or pending:
+            check_cancelled()
+            while waiting and len(pending) < max(1, max_summaries):
+                report_id = waiting.popleft()
+                pending[submit(summarize_async(reports[report_id]))] = report_id
+            done, _ = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                report_id = pending.pop(future)
+                try:
+                    summary = future.result()["summary"]
+                except Exception as e:
+                    log(f"Summary failed: {e}")
+                    produced[report_id] = {"error": str(e)}
+                    log(f"Report {len(produced)}/{len(reports)} ready")
+                else:
+                    save(report_id, summary)
+    finally:
+        for future in pending:
+            future.cancel()
+
+    results = []
+    for i, query in enumerate(queries):
+        result: Dict[str, Any] = {
+            "query": query,
+            "agents": list(needed[i]),
+            "summary": "",
+            "reportId": "",
+        }
+        output = produced.get(report_for.get(i), {})
+        error = errors.get(i) or output.get("error")
+        if error:
+            result.update(status="failed", error=error)
+        else:
+            result.update(status="succeeded", summary=output["summary"], reportId=output["reportId"])
+        results.append(result)
+
+    stats = {
+        "queries": len(queries),
+        "agentCallsRequested": requested_calls,
+        "agentCalls": len(work),
+        "agentCallsByAgent": calls_by_agent,
+        "agentCallsSaved": requested_calls - len(work),
+        "summaries": len(reports),
+        "summariesSaved": len(report_for) - len(reports),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "durationMs": round((time.perf_counter() - start) * 1000, 1),
+    }
+    log(f"Done: {stats['agentCallsSaved']} agent calls and "
+        f"{stats['summariesSaved']} summaries saved by deduplication")
+    return {"results": results, "stats": stats}
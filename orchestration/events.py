@@ -0,0 +1,64 @@
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from langgraph.config import get_stream_writer
+
+
+# An event sink receives every workflow event (a JSON-serializable dict).
+EventSink = Callable[[Dict[str, Any]], None]
+
+NODE_START = "node_start"
+NODE_END = "node_end"
+NODE_ERROR = "node_error"
+LOG = "log"
+SUMMARY_CHUNK = "summary_chunk"
+
+
+def make_event(event_type: str, node: str, label: str, **fields: Any) -> Dict[str, Any]:
+    return {"type": event_type, "node": node, "label": label, "ts": time.time(), **fields}
+
+
+def print_sink(event: Dict[str, Any]) -> None:
+    """Default sink: the console progress lines the CLI has always shown."""
+    label = event.get("label") or event.get("node", "")
+    event_type = event.get("type")
+    if event_type == NODE_END:
+        print(f"[{label}] Done in {event.get('duration_ms', 0):.1f}ms")
+    elif event_type == NODE_ERROR:
+        print(f"[{label}] ERROR: {event.get('error')}")
+    elif event.get("message"):
+        print(f"[{label}] {event['message']}")
+
+
+def null_sink(event: Dict[str, Any]) -> None:
+    pass
+
+
+class ListSink:
+    """Collects events in memory, e.g. for tests and benchmarks."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+
+def emit_event(event: Dict[str, Any]) -> None:
+    """Publish an event from inside a graph node.
+
+    Events go out on LangGraph's ``custom`` stream and ``run_workflow`` hands
+    them to its sink. Outside a graph run they are printed.
+    """
+    try:
+        writer = get_stream_writer()
+    except (RuntimeError, KeyError):
+        print_sink(event)
+        return
+    writer(event)
+
+
+def to_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message."""
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
@@ -1,11 +1,25 @@
-from typing import Dict, Any
+import functools
+import threading
+from typing import Callable, Dict, Any, List, Optional
 import time
-import random
 from langgraph.graph import StateGraph, END
 from langgraph.graph.state import CompiledStateGraph
 
 from orchestration.state import AgentState
-from contracts.schemas import AggregatedData
+from orchestration.registry import WorkflowRegistry
+from orchestration.jobs import JobCancelled
+from orchestration.events import (
+    EventSink,
+    emit_event,
+    make_event,
+    print_sink,
+    NODE_START,
+    NODE_END,
+    NODE_ERROR,
+    LOG,
+    SUMMARY_CHUNK,
+)
+from contracts.results import AggregatedData, as_dict
 from agents.master_agent import parse_query
 from agents import (
     iqvia_agent,
@@ -15,89 +29,145 @@ from agents import (
     internal_knowledge_agent,
     web_intelligence_agent
 )
-from llm.gemini_summarizer import summarize
-from reports.generator import generate_pdf
+from llm import summarize_stream
+from reports.store import report_store
+from telemetry import instrument
+
+
+# node name -> (display label, message shown when the node starts)
+NODE_INFO = {
+    "master": ("Master Agent", "Parsing query..."),
+    "iqvia": ("IQVIA Agent", "Processing..."),
+    "exim": ("EXIM Agent", "Processing..."),
+    "patent": ("Patent Agent", "Processing..."),
+    "clinical_trials": ("Clinical Trials Agent", "Processing..."),
+    "internal_knowledge": ("Internal Knowledge Agent", "Processing..."),
+    "web_intelligence": ("Web Intelligence Agent", "Processing..."),
+    "aggregator": ("Aggregator", "Consolidating worker results..."),
+    "gemini": ("Gemini Summarizer", "Generating executive summary..."),
+    "report": ("Report Store", "Saving report..."),
+}
+
+# Parts of a node's state update that are forwarded in its node_end event
+EVENT_UPDATE_KEYS = ("selected_agents", "worker_results", "summary", "report_id")
+
+
+def log(node: str, message: str) -> None:
+    emit_event(make_event(LOG, node, NODE_INFO[node][0], message=message))
+
+
+def emit_summary_chunk(text: str) -> None:
+    emit_event(make_event(SUMMARY_CHUNK, "gemini", NODE_INFO["gemini"][0], text=text))
 
 
-def master_node(state: AgentState) -> AgentState:
-    print("[Master Agent] Parsing query...")
+def with_events(name: str, node: Callable[[AgentState], Dict[str, Any]]) -> Callable[[AgentState], Dict[str, Any]]:
+    """Wrap a node so it emits start/finish events with its timing and the
+    interesting parts of its state update (e.g. the worker's result), and
+    records its latency in the ``node`` metrics."""
+    label, start_message = NODE_INFO[name]
+    node = instrument("node", name)(node)
+
+    @functools.wraps(node)
+    def wrapper(state: AgentState) -> Dict[str, Any]:
+        emit_event(make_event(NODE_START, name, label, message=start_message))
+        start = time.perf_counter()
+        try:
+            update = node(state)
+        except Exception as e:
+            emit_event(make_event(
+                NODE_ERROR, name, label,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                error=str(e)
+            ))
+            raise
+        fields = {key: update[key] for key in EVENT_UPDATE_KEYS if key in (update or {})}
+        if "worker_results" in fields:
+            # Events leave the process (SSE, job log), so results go as dicts
+            fields["worker_results"] = {agent: as_dict(result) for agent, result in fields["worker_results"].items()}
+        emit_event(make_event(
+            NODE_END, name, label,
+            duration_ms=(time.perf_counter() - start) * 1000,
+            **fields
+        ))
+        return update
+
+    return wrapper
+
+
+def master_node(state: AgentState) -> Dict[str, Any]:
     query_context = parse_query(state["user_query"])
-    state["query_context"] = query_context
-    state["selected_agents"] = query_context["required_agents"]
-    state["worker_results"] = {}
-    print(f"[Master Agent] Selected agents: {state['selected_agents']}")
-    return state
+    selected_agents = query_context["required_agents"]
+    log("master", f"Selected agents: {selected_agents}")
+    return {
+        "query_context": query_context,
+        "selected_agents": selected_agents,
+    }
+
+
+def iqvia_node(state: AgentState) -> Dict[str, Any]:
+    result = iqvia_agent.process(state["query_context"])
+    return {"worker_results": {"iqvia": result}}
 
 
-def iqvia_node(state: AgentState) -> AgentState:
-    if "iqvia" in state["selected_agents"]:
-        print("[IQVIA Agent] Processing...")
-        result = iqvia_agent.process(state["query_context"])
-        state["worker_results"]["iqvia"] = result
-    return state
+def exim_node(state: AgentState) -> Dict[str, Any]:
+    result = exim_agent.process(state["query_context"])
+    return {"worker_results": {"exim": result}}
 
 
-def exim_node(state: AgentState) -> AgentState:
-    if "exim" in state["selected_agents"]:
-        print("[EXIM Agent] Processing...")
-        result = exim_agent.process(state["query_context"])
-        state["worker_results"]["exim"] = result
-    return state
+def patent_node(state: AgentState) -> Dict[str, Any]:
+    result = patent_agent.process(state["query_context"])
+    return {"worker_results": {"patent": result}}
 
 
-def patent_node(state: AgentState) -> AgentState:
-    if "patent" in state["selected_agents"]:
-        print("[Patent Agent] Processing...")
-        result = patent_agent.process(state["query_context"])
-        state["worker_results"]["patent"] = result
-    return state
+def clinical_trials_node(state: AgentState) -> Dict[str, Any]:
+    result = clinical_trials_agent.process(state["query_context"])
+    return {"worker_results": {"clinical_trials": result}}
 
 
-def clinical_trials_node(state: AgentState) -> AgentState:
-    if "clinical_trials" in state["selected_agents"]:
-        print("[Clinical Trials Agent] Processing...")
-        result = clinical_trials_agent.process(state["query_context"])
-        state["worker_results"]["clinical_trials"] = result
-    return state
+def internal_knowledge_node(state: AgentState) -> Dict[str, Any]:
+    result = internal_knowledge_agent.process(state["query_context"])
+    return {"worker_results": {"internal_knowledge": result}}
 
 
-def internal_knowledge_node(state: AgentState) -> AgentState:
-    if "internal_knowledge" in state["selected_agents"]:
-        print("[Internal Knowledge Agent] Processing...")
-        result = internal_knowledge_agent.process(state["query_context"])
-        state["worker_results"]["internal_knowledge"] = result
-    return state
+def web_intelligence_node(state: AgentState) -> Dict[str, Any]:
+    result = web_intelligence_agent.process(state["query_context"])
+    return {"worker_results": {"web_intelligence": result}}
 
 
-def web_intelligence_node(state: AgentState) -> AgentState:
-    if "web_intelligence" in state["selected_agents"]:
-        print("[Web Intelligence Agent] Processing...")
-        result = web_intelligence_agent.process(state["query_context"])
-        state["worker_results"]["web_intelligence"] = result
-    return state
+# Worker node name -> node function. Node names match the agent names produced
+# by the router so ``selected_agents`` can be dispatched directly.
+WORKER_NODES = {
+    "iqvia": iqvia_node,
+    "exim": exim_node,
+    "patent": patent_node,
+    "clinical_trials": clinical_trials_node,
+    "internal_knowledge": internal_knowledge_node,
+    "web_intelligence": web_intelligence_node,
+}
 
 
-def aggregator_node(state: AgentState) -> AgentState:
-    print("[Aggregator] Consolidating worker results...")
+def dispatch_agents(state: AgentState) -> List[str]:
+    """Fan out from the master node to every selected worker in parallel."""
+    selected = [agent for agent in state["selected_agents"] if agent in WORKER_NODES]
+    return selected or ["aggregator"]
+
+
+def aggregator_node(state: AgentState) -> Dict[str, Any]:
+    # Results are passed on by reference; they are serialized once, when the
+    # summarizer or the report store first asks for the dict
     aggregated = AggregatedData(
         query_context=state["query_context"],
         worker_results=state["worker_results"]
     )
-    state["aggregated_data"] = aggregated.model_dump()
-    return state
-
-
-def gemini_node(state: AgentState) -> AgentState:
-    print("[Gemini Summarizer] Generating executive summary...")
-    # Small thinking delay to make demo output feel like it's being generated
-    delay = random.uniform(1.8, 3.2)
-    print(f"[Gemini Summarizer] Thinking for {delay:.1f}s...")
-    # If the user's query explicitly asks about HER2+ in India, return
-    # a deterministic, hardcoded mock summary for demo/video purposes.
-    query = (state.get("user_query") or "").lower()
+    return {"aggregated_data": aggregated}
+
+
+def demo_summary(query: str) -> Optional[str]:
+    """Deterministic, hardcoded mock summary for demo/video purposes, returned
+    when the query explicitly asks about HER2+ in India."""
+    query = (query or "").lower()
     if "her2" in query and "india" in query:
-        time.sleep(delay)
-        state["summary"] = (
+        return (
             "Executive Report: HER2+ Breast Cancer — India (Mock Data)\n\n"
             "1. Executive Summary:\n"
             "Based on aggregated mock datasets for HER2+ breast cancer in India, there is a clear unmet need for\nimproved access to targeted HER2 therapies, better CNS-active agents, and earlier diagnosis. Market signals\nindicate growing adoption of biosimilars and increasing clinical development activity across domestic and\nmultinational sponsors.\n\n"
@@ -122,66 +192,113 @@ def gemini_node(state: AgentState) -> AgentState:
             "- Monitor patent cliffs and prepare biosimilar development strategies.\n"
             "\n" 
         )
-        return state
+    return None
 
-    # Default behaviour: call the real summarizer
-    gemini_output = summarize(state["aggregated_data"])
-    state["summary"] = gemini_output.get("summary") if isinstance(gemini_output, dict) else gemini_output
-    return state
 
+def gemini_node(state: AgentState) -> Dict[str, Any]:
+    summary = demo_summary(state.get("user_query"))
+    if summary is not None:
+        emit_summary_chunk(summary)
+        return {"summary": summary}
 
-def pdf_generator_node(state: AgentState) -> AgentState:
-    print("[PDF Generator] Creating report...")
-    pdf_path = generate_pdf(state["summary"], state["aggregated_data"])
-    print(f"[PDF Generator] PDF generated at: {pdf_path}")
-    state["pdf_path"] = pdf_path
-    return state
+    # Default behaviour: stream from the real summarizer, forwarding each chunk
+    # so clients see text as soon as the model produces it. The stream's
+    # return value tells whether it fell back to a data-only summary
+    chunks = []
+    stream = summarize_stream(state["aggregated_data"])
+    while True:
+        try:
+            chunk = next(stream)
+        except StopIteration as done:
+            output = done.value or {}
+            break
+        chunks.append(chunk)
+        emit_summary_chunk(chunk)
+    return {"summary": "".join(chunks), "summary_fallback": bool(output.get("fallback"))}
+
+
+def report_node(state: AgentState) -> Dict[str, Any]:
+    # The PDF is rendered on first download (GET /download-pdf), not here
+    report_id = report_store.save(state["summary"], state["aggregated_data"])
+    log("report", f"Report saved: {report_id}")
+    return {"report_id": report_id}
 
 
 def create_workflow() -> CompiledStateGraph:
     workflow = StateGraph(AgentState)
     
-    workflow.add_node("master", master_node)
-    workflow.add_node("iqvia", iqvia_node)
-    workflow.add_node("exim", exim_node)
-    workflow.add_node("patent", patent_node)
-    workflow.add_node("clinical_trials", clinical_trials_node)
-    workflow.add_node("internal_knowledge", internal_knowledge_node)
-    workflow.add_node("web_intelligence", web_intelligence_node)
-    workflow.add_node("aggregator", aggregator_node)
-    workflow.add_node("gemini", gemini_node)
-    workflow.add_node("pdf_generator", pdf_generator_node)
+    workflow.add_node("master", with_events("master", master_node))
+    for name, node in WORKER_NODES.items():
+        workflow.add_node(name, with_events(name, node))
+    workflow.add_node("aggregator", with_events("aggregator", aggregator_node))
+    workflow.add_node("gemini", with_events("gemini", gemini_node))
+    workflow.add_node("report", with_events("report", report_node))
     
     workflow.set_entry_point("master")
     
-    workflow.add_edge("master", "iqvia")
-    workflow.add_edge("iqvia", "exim")
-    workflow.add_edge("exim", "patent")
-    workflow.add_edge("patent", "clinical_trials")
-    workflow.add_edge("clinical_trials", "internal_knowledge")
-    workflow.add_edge("internal_knowledge", "web_intelligence")
-    workflow.add_edge("web_intelligence", "aggregator")
+    # master -> selected workers (run concurrently) -> aggregator
+    workflow.add_conditional_edges(
+        "master",
+        dispatch_agents,
+        [*WORKER_NODES, "aggregator"]
+    )
+    for name in WORKER_NODES:
+        workflow.add_edge(name, "aggregator")
     workflow.add_edge("aggregator", "gemini")
-    workflow.add_edge("gemini", "pdf_generator")
-    workflow.add_edge("pdf_generator", END)
+    workflow.add_edge("gemini", "report")
+    workflow.add_edge("report", END)
     
     return workflow.compile()
 
 
-def run_workflow(query: str) -> Dict[str, Any]:
-    workflow = create_workflow()
+workflow_registry = WorkflowRegistry(create_workflow)
+
+
+def get_workflow() -> CompiledStateGraph:
+    """Return the process-wide compiled workflow, compiling it on first use."""
+    return workflow_registry.get()
+
+
+def reload_workflow() -> CompiledStateGraph:
+    """Recompile the workflow, e.g. after changing the node wiring."""
+    return workflow_registry.reload()
+
+
+def run_workflow(
+    query: str,
+    cancel_event: Optional[threading.Event] = None,
+    event_sink: Optional[EventSink] = None
+) -> Dict[str, Any]:
+    """Run the workflow and return its final state.
+
+    Node events (start/finish with timings and partial results) are streamed
+    from the graph and passed to ``event_sink``, which defaults to printing
+    them. If ``cancel_event`` gets set the run stops at the next event and
+    raises ``JobCancelled``.
+    """
+    workflow = get_workflow()
+    sink = event_sink or print_sink
     
     initial_state: AgentState = {
         "user_query": query,
         "query_context": {},
         "selected_agents": [],
         "worker_results": {},
-        "aggregated_data": {},
+        "aggregated_data": None,
         "summary": "",
-        "pdf_path": "",
+        "summary_fallback": False,
+        "report_id": "",
         "error": None
     }
     
-    result = workflow.invoke(initial_state)
+    result = initial_state
+    for mode, chunk in workflow.stream(initial_state, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            sink(chunk)
+        else:
+            result = chunk
+        if cancel_event is not None and cancel_event.is_set():
+            sink(make_event(LOG, "workflow", "Workflow", message="Cancelled"))
+            raise JobCancelled(query)
     
     return result
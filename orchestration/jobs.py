@@ -0,0 +1,194 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telemetry import get_trace_id, reset_trace_id, set_trace_id
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFullError(Exception):
+    """Raised by ``JobManager.submit`` when no more jobs can be queued."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation has been requested."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    trace_id: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+    events: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    _listeners: List[Callable[[], None]] = field(default_factory=list, repr=False)
+    _events_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record a progress event and wake anyone following the job."""
+        with self._events_lock:
+            self.events.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def events_since(self, cursor: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Events recorded after ``cursor`` and whether the final event is among them."""
+        with self._events_lock:
+            done = bool(self.events) and self.events[-1].get("type") == "job_end"
+            return self.events[cursor:], done
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """``listener`` is called (from the worker thread) after each new event."""
+        with self._events_lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        with self._events_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "traceId": self.trace_id,
+        }
+
+
+class JobManager:
+    """Runs jobs on a fixed-size thread pool with a bounded backlog.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more wait
+    for a slot; ``submit`` raises ``QueueFullError`` beyond that so callers can
+    push back instead of piling up work. Finished jobs are kept for ``retention_seconds``.
+
+    A job function receives its ``Job``: ``job.cancel_event`` is set when the
+    job is cancelled and should be checked at safe points, and
+    ``job.publish`` records progress events for streaming to clients. A final
+    ``job_end`` event is published when the job finishes.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32, retention_seconds: float = 3600):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mednexa-job")
+        self._jobs: Dict[str, Job] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Job], Any], kind: str = "analyze") -> Job:
+        with self._lock:
+            self._prune()
+            if self._active >= self.max_workers + self.max_queue:
+                raise QueueFullError(f"Job queue is full ({self._active} jobs pending)")
+            # The job runs on a worker thread; carry the submitting request's trace id there
+            job = Job(id=uuid.uuid4().hex, kind=kind, trace_id=get_trace_id())
+            self._jobs[job.id] = job
+            self._active += 1
+        job.future = self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation. Queued jobs never start; running jobs stop at
+        their next cancellation check."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Never started, so _run won't release its slot
+            self._finish(job, CANCELLED, error="Cancelled before start")
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                "active": self._active,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                **counts,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        for job in list(self._jobs.values()):
+            if job.status not in FINISHED:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED, error="Cancelled before start")
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        token = set_trace_id(job.trace_id)
+        try:
+            result = fn(job)
+        except JobCancelled:
+            self._finish(job, CANCELLED, error="Cancelled")
+        except Exception as e:
+            print(f"[JobManager] Job {job.id} failed (trace {job.trace_id}): {e}")
+            self._finish(job, FAILED, error=str(e))
+        else:
+            self._finish(job, SUCCEEDED, result=result)
+        finally:
+            reset_trace_id(token)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            if job.status in FINISHED:
+                return
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.status = status
+            self._active -= 1
+        job.publish({
+            "type": "job_end",
+            "jobId": job.id,
+            "status": status,
+            "result": result,
+            "error": error,
+            "ts": job.finished_at,
+        })
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINISHED and (job.finished_at or 0) < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,187 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+# Query-string drug name shapes: "Drug X" and common INN suffixes. Matched
+# against the lower-cased query, so they are written in lower case. "DrugX"
+# is accepted but not the plural "drugs" (as in "compare drugs ...").
+DRUG_PATTERNS = [
+    r"drug(?:\s+[a-z]|[a-rt-z])",
+    r"[a-z][a-z]+(?:mab|nib|lib|tib|zumab|tinib)",
+    r"[a-z][a-z]+(?:cept|vir|pril|sartan)",
+]
+
+YEAR_PATTERN = r"20\d{2}"
+
+AGENT = "agent"
+AREA = "area"
+REGION = "region"
+DRUG = "drug"
+
+# Kinds of term that also match with a plural "s"/"es" ("patents", "trials").
+# Region and drug names must match exactly, so "uses" is not the region "US".
+PLURAL_KINDS = frozenset({AGENT, AREA})
+
+
+@dataclass
+class QueryMatch:
+    """Everything the router and master agent need from one query, in the
+    order each item first appears in the text (duplicates removed)."""
+
+    agents: List[str] = field(default_factory=list)
+    areas: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+    drugs: List[str] = field(default_factory=list)
+    years: List[str] = field(default_factory=list)
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.casefold().split())
+
+
+class QueryMatcher:
+    """Single-pass keyword and entity matcher.
+
+    Every keyword (agent keywords, therapeutic areas, region names, drug names
+    and synonyms) is compiled into one trie-shaped regex alternation together
+    with the drug-name patterns and a year pattern. Matches are anchored on
+    word boundaries, so "ip" no longer matches inside "pipeline" and "rd" no
+    longer matches inside "word"; a trailing plural "s"/"es" is allowed for
+    agent keywords and areas only (``PLURAL_KINDS``).
+    Matching a query is one ``finditer`` over the lower-cased text regardless
+    of how many keywords are loaded; a case-sensitive regex over lower-cased
+    text is about twice as fast as ``re.IGNORECASE``.
+    """
+
+    def __init__(
+        self,
+        terms: Mapping[str, Iterable[Tuple[str, str]]],
+        drug_patterns: Iterable[str] = DRUG_PATTERNS,
+    ):
+        # normalized term -> [(kind, value), ...]
+        self._terms: Dict[str, List[Tuple[str, str]]] = {}
+        for term, targets in terms.items():
+            key = normalize_term(term)
+            if not key:
+                continue
+            entries = self._terms.setdefault(key, [])
+            for target in targets:
+                if target not in entries:
+                    entries.append(target)
+
+        alternatives = []
+        if self._terms:
+            alternatives.append(rf"(?P<term>{trie_regex(self._terms)})(?P<plural>e?s)?\b")
+        patterns = "|".join(f"(?:{p})" for p in drug_patterns)
+        if patterns:
+            alternatives.append(rf"(?P<drug>{patterns})\b")
+        alternatives.append(rf"(?P<year>{YEAR_PATTERN})\b")
+        self.regex = re.compile(r"\b(?:" + "|".join(alternatives) + ")")
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def match(self, text: str) -> QueryMatch:
+        found: Dict[str, Dict[str, None]] = {AGENT: {}, AREA: {}, REGION: {}, DRUG: {}, "year": {}}
+        folded = text.lower()
+        # Report drug names as typed unless lower-casing changed the length
+        original = text if len(folded) == len(text) else folded
+        for m in self.regex.finditer(folded):
+            kind = m.lastgroup
+            if kind == "term":
+                plural = m.group("plural") is not None
+                for target_kind, value in self._terms.get(normalize_term(m.group("term")), ()):
+                    if not plural or target_kind in PLURAL_KINDS:
+                        found[target_kind][value] = None
+            elif kind == "drug":
+                start, end = m.span("drug")
+                found[DRUG][" ".join(original[start:end].split())] = None
+            elif kind == "year":
+                found["year"][m.group("year")] = None
+        return QueryMatch(
+            agents=list(found[AGENT]),
+            areas=list(found[AREA]),
+            regions=list(found[REGION]),
+            drugs=list(found[DRUG]),
+            years=list(found["year"]),
+        )
+
+
+def trie_regex(terms: Iterable[str]) -> str:
+    """Regex matching any of ``terms`` (already normalized), built as a trie
+    so shared prefixes are tested once and longer terms win over their
+    prefixes. Whitespace inside a term matches any whitespace run."""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for token in re.findall(r"\s+|.", term):
+            node = node.setdefault(" " if token.isspace() else token, {})
+        node[""] = {}
+    return _trie_to_regex(trie)
+
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    branches = []
+    for token, child in sorted(node.items()):
+        if token == "":
+            continue
+        head = r"\s+" if token == " " else re.escape(token)
+        branches.append(head + _trie_to_regex(child))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A term ends here; try the longer continuations first
+        return f"(?:{body})?"
+    return body
+
+
+_matcher: Optional[QueryMatcher] = None
+_matcher_version = None
+_matcher_checked_at = 0.0
+_matcher_lock = threading.Lock()
+
+
+def build_matcher() -> QueryMatcher:
+    """Matcher over the router keywords, master agent tables and the drug
+    catalogue (names and synonyms) from data/."""
+    from orchestration.router import AGENT_KEYWORDS
+    from agents.master_agent import THERAPEUTIC_AREAS, REGIONS
+    from datastore import get_drug_catalogue
+
+    terms: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add(term: str, kind: str, value: str) -> None:
+        terms.setdefault(term, []).append((kind, value))
+
+    for agent, keywords in AGENT_KEYWORDS.items():
+        for keyword in keywords:
+            add(keyword, AGENT, agent)
+    for area in THERAPEUTIC_AREAS:
+        add(area, AREA, area)
+    for keyword, region in REGIONS.items():
+        add(keyword, REGION, region)
+    for name, canonical in get_drug_catalogue().items():
+        add(name, DRUG, canonical)
+    return QueryMatcher(terms)
+
+
+def get_matcher() -> QueryMatcher:
+    """Process-wide matcher, rebuilt when a dataset (and so the drug
+    catalogue) changes."""
+    global _matcher, _matcher_version, _matcher_checked_at
+    from datastore import get_store, DATA_CHECK_INTERVAL
+
+    matcher = _matcher
+    if matcher is not None and time.monotonic() - _matcher_checked_at < DATA_CHECK_INTERVAL:
+        return matcher
+    with _matcher_lock:
+        version = tuple(sorted(get_store().versions().items()))
+        _matcher_checked_at = time.monotonic()
+        if _matcher is None or version != _matcher_version:
+            _matcher = build_matcher()
+            _matcher_version = version
+        return _matcher
@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+from langgraph.graph.state import CompiledStateGraph
+
+
+class WorkflowRegistry:
+    """Process-level holder for a compiled LangGraph workflow.
+
+    The graph is compiled once on first use (or at startup via ``warm``) and the
+    same compiled object is handed to every caller. A compiled graph without a
+    checkpointer keeps no per-run state, so it is safe to ``invoke`` from many
+    threads at once. ``reload`` rebuilds it when the node wiring changes.
+    """
+
+    def __init__(self, builder: Callable[[], CompiledStateGraph]):
+        self._builder = builder
+        self._lock = threading.Lock()
+        self._workflow: Optional[CompiledStateGraph] = None
+        self.compile_count = 0
+        self.last_compile_seconds = 0.0
+
+    def get(self) -> CompiledStateGraph:
+        workflow = self._workflow
+        if workflow is not None:
+            return workflow
+        with self._lock:
+            if self._workflow is None:
+                self._compile()
+            return self._workflow
+
+    def warm(self) -> CompiledStateGraph:
+        return self.get()
+
+    def reload(self) -> CompiledStateGraph:
+        with self._lock:
+            self._compile()
+            return self._workflow
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compiled": self._workflow is not None,
+            "compile_count": self.compile_count,
+            "last_compile_seconds": self.last_compile_seconds,
+        }
+
+    def _compile(self) -> None:
+        start = time.perf_counter()
+        workflow = self._builder()
+        self.last_compile_seconds = time.perf_counter() - start
+        self.compile_count += 1
+        self._workflow = workflow
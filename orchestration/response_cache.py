@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agents.cube import CUBE_DATASET
+from agents.master_agent import parse_query
+from contracts.fingerprint import content_hash
+from datastore import get_store
+from orchestration.graph import demo_summary
+from orchestration.jobs import JobCancelled
+
+
+# Response cache: set MEDNEXA_RESPONSE_CACHE=0 to run the workflow for every query
+RESPONSE_CACHE_ENABLED = os.environ.get("MEDNEXA_RESPONSE_CACHE", "1") != "0"
+
+# How a response was obtained, as returned by ``ResponseCache.get_or_run``
+MISS = "miss"
+HIT = "hit"
+COALESCED = "coalesced"
+
+# How often a caller waiting on another caller's run checks its own cancel_event
+WAIT_POLL_SECONDS = 0.1
+
+
+class ResponseCache:
+    """In-memory LRU of whole workflow responses, keyed on the parsed query
+    context rather than its wording, so differently phrased questions that
+    ask for the same thing share one run.
+
+    Concurrent misses for the same key are coalesced: the first caller runs
+    the workflow and the others wait for its result. Entries expire after
+    ``ttl_seconds``; beyond ``max_entries`` the least recently used go.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "coalesced": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    @staticmethod
+    def make_key(query_context: Dict[str, Any], dataset_version: Any = None, demo: bool = False) -> str:
+        """Key for a ``parse_query`` result. The original wording is left out;
+        everything the workflow's output depends on goes in."""
+        return content_hash({
+            "entities": query_context["extracted_entities"],
+            "agents": query_context["required_agents"],
+            "datasets": dataset_version,
+            "demo": demo,
+        })
+
+    def get_or_run(
+        self,
+        key: str,
+        run: Callable[[], Tuple[Dict[str, Any], bool]],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[Dict[str, Any], str]:
+        """Return the response for ``key`` and how it was obtained (``HIT``,
+        ``COALESCED`` or ``MISS``).
+
+        On a miss ``run`` is called and returns the response and whether it
+        may be cached. Callers arriving while it runs wait for that response
+        instead, stopping with ``JobCancelled`` if their own ``cancel_event``
+        is set. If the running caller is cancelled, one waiting caller takes
+        over; any other error is raised to every waiting caller.
+        """
+        while True:
+            now = time.time()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    created_at, value = entry
+                    if now - created_at <= self.ttl_seconds:
+                        self._entries.move_to_end(key)
+                        self._counters["hits"] += 1
+                        return value, HIT
+                    del self._entries[key]
+                    self._counters["expired"] += 1
+                future = self._inflight.get(key)
+                if future is None:
+                    future = self._inflight[key] = Future()
+                    self._counters["misses"] += 1
+                    leader = True
+                else:
+                    self._counters["coalesced"] += 1
+                    leader = False
+
+            if leader:
+                return self._run(key, future, run), MISS
+            try:
+                return self._wait(future, cancel_event), COALESCED
+            except JobCancelled:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise
+                # The caller we were waiting on was cancelled; try again
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+            counters["inflight"] = len(self._inflight)
+        lookups = counters["hits"] + counters["coalesced"] + counters["misses"]
+        counters["hit_rate"] = (counters["hits"] + counters["coalesced"]) / lookups if lookups else 0.0
+        return counters
+
+    def _run(self, key: str, future: Future, run: Callable[[], Tuple[Dict[str, Any], bool]]) -> Dict[str, Any]:
+        try:
+            value, cacheable = run()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if cacheable:
+                self._counters["stores"] += 1
+                self._entries[key] = (time.time(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters["evictions"] += 1
+        future.set_result(value)
+        return value
+
+    @staticmethod
+    def _wait(future: Future, cancel_event: Optional[threading.Event]) -> Dict[str, Any]:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelled("waiting for a coalesced response")
+            try:
+                return future.result(timeout=WAIT_POLL_SECONDS if cancel_event is not None else None)
+            except FutureTimeout:
+                continue
+
+
+def query_key(query: str) -> str:
+    """Response cache key of ``query``: its parsed context, the dataset
+    versions and whether it gets the demo summary."""
+    # The cube is derived from the datasets and only registered on first use
+    versions = {name: version for name, version in get_store().versions().items() if name != CUBE_DATASET}
+    return ResponseCache.make_key(parse_query(query), versions, demo_summary(query) is not None)
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("MEDNEXA_RESPONSE_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.environ.get("MEDNEXA_RESPONSE_CACHE_TTL", "300")),
+)
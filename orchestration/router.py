@@ -1,5 +1,7 @@
 from typing import List
 
+from orchestration.matcher import get_matcher
+
 
 IQVIA_KEYWORDS = ["market", "sales", "revenue", "prescription", "prescriptions", "market size", "growth"]
 EXIM_KEYWORDS = ["import", "export", "trade", "tariff", "tariffs", "trading", "exim"]
@@ -10,30 +12,25 @@ WEB_KEYWORDS = ["news", "sentiment", "regulatory", "competitor", "competitors",
 
 ALL_AGENTS = ["iqvia", "exim", "patent", "clinical_trials", "internal_knowledge", "web_intelligence"]
 
+AGENT_KEYWORDS = {
+    "iqvia": IQVIA_KEYWORDS,
+    "exim": EXIM_KEYWORDS,
+    "patent": PATENT_KEYWORDS,
+    "clinical_trials": CLINICAL_KEYWORDS,
+    "internal_knowledge": INTERNAL_KEYWORDS,
+    "web_intelligence": WEB_KEYWORDS,
+}
 
-def route_query(query: str) -> List[str]:
-    query_lower = query.lower()
-    selected_agents = []
-    
-    if any(keyword in query_lower for keyword in IQVIA_KEYWORDS):
-        selected_agents.append("iqvia")
-    
-    if any(keyword in query_lower for keyword in EXIM_KEYWORDS):
-        selected_agents.append("exim")
-    
-    if any(keyword in query_lower for keyword in PATENT_KEYWORDS):
-        selected_agents.append("patent")
-    
-    if any(keyword in query_lower for keyword in CLINICAL_KEYWORDS):
-        selected_agents.append("clinical_trials")
-    
-    if any(keyword in query_lower for keyword in INTERNAL_KEYWORDS):
-        selected_agents.append("internal_knowledge")
-    
-    if any(keyword in query_lower for keyword in WEB_KEYWORDS):
-        selected_agents.append("web_intelligence")
+
+def select_agents(matched_agents: List[str]) -> List[str]:
+    """Matched agents in canonical order, or every agent if none matched."""
+    selected_agents = [agent for agent in ALL_AGENTS if agent in matched_agents]
     
     if not selected_agents:
         return ALL_AGENTS
     
     return selected_agents
+
+
+def route_query(query: str) -> List[str]:
+    return select_agents(get_matcher().match(query).agents)
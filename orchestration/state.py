@@ -1,12 +1,25 @@
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Annotated
+
+from contracts.results import AgentResult, AggregatedData
+
+
+def merge_worker_results(left: Dict[str, AgentResult], right: Dict[str, AgentResult]) -> Dict[str, AgentResult]:
+    """Reducer for ``worker_results`` so parallel worker nodes can each add
+    their own entry without overwriting the others."""
+    if not left:
+        return dict(right or {})
+    if not right:
+        return left
+    return {**left, **right}
 
 
 class AgentState(TypedDict):
     user_query: str
     query_context: Dict[str, Any]
     selected_agents: List[str]
-    worker_results: Dict[str, Any]
-    aggregated_data: Dict[str, Any]
+    worker_results: Annotated[Dict[str, AgentResult], merge_worker_results]
+    aggregated_data: Optional[AggregatedData]
     summary: str
-    pdf_path: str
+    summary_fallback: bool
+    report_id: str
     error: Optional[str]
@@ -0,0 +1,122 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from telemetry import instrument
+
+
+# Worker processes for PDF rendering; 0 renders inline on the calling thread
+PDF_WORKERS = int(os.environ.get("MEDNEXA_PDF_WORKERS", str(os.cpu_count() or 1)))
+# Seconds to wait for one report before giving up
+PDF_TIMEOUT = float(os.environ.get("MEDNEXA_PDF_TIMEOUT", "60"))
+
+
+def _render(payload: str, path: str) -> str:
+    """Runs in a worker process: decode the serialized report and lay it out."""
+    from reports.generator import render_pdf
+
+    data = json.loads(payload)
+    render_pdf(data["summary"], data["aggregated_data"], path)
+    return path
+
+
+class PdfPool:
+    """Renders PDFs in a process pool so reportlab's CPU-bound layout neither
+    holds the GIL of the serving process nor blocks other requests.
+
+    Workers receive only the JSON-serialized summary and aggregated data and
+    write the file themselves. The pool is started on first use (or at
+    startup via ``warm``) with the ``spawn`` start method, which is safe in a
+    process that already runs threads. A pool broken by a crashed worker is
+    replaced on the next call. A render that outlives ``timeout`` has its
+    workers terminated before ``TimeoutError`` is raised, so it can't write
+    the file late or keep a worker busy.
+    """
+
+    def __init__(self, max_workers: int = PDF_WORKERS, timeout: float = PDF_TIMEOUT):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.rendered = 0
+        self.total_seconds = 0.0
+
+    @instrument("report", "render_pdf")
+    def render(self, summary: str, aggregated_data: Dict[str, Any], path: str) -> str:
+        payload = json.dumps({"summary": summary, "aggregated_data": aggregated_data}, default=str)
+        start = time.perf_counter()
+        if self.max_workers <= 0:
+            _render(payload, path)
+        else:
+            executor = self._get_executor()
+            try:
+                executor.submit(_render, payload, path).result(timeout=self.timeout)
+            except FutureTimeout:
+                self._reset(executor, terminate=True)
+                raise
+            except BrokenProcessPool:
+                self._reset(executor)
+                raise
+        with self._lock:
+            self.rendered += 1
+            self.total_seconds += time.perf_counter() - start
+        return path
+
+    def warm(self) -> None:
+        """Start the worker processes and import reportlab in each of them."""
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(_warm) for _ in range(self.max_workers)]:
+            future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "started": self._executor is not None,
+                "rendered": self.rendered,
+                "avg_seconds": self.total_seconds / self.rendered if self.rendered else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor, terminate: bool = False) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # shutdown() leaves running tasks alone; a hung render needs its worker killed
+        processes = list((executor._processes or {}).values()) if terminate else []
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _warm() -> None:
+    import reports.generator  # noqa: F401
+
+
+pdf_pool = PdfPool()
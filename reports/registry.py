@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    data_path TEXT NOT NULL,
+    data_bytes INTEGER NOT NULL,
+    pdf_path TEXT,
+    pdf_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_last_access ON reports (last_access);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+"""
+
+
+@dataclass
+class ReportRecord:
+    id: str
+    data_path: str
+    data_bytes: int
+    pdf_path: Optional[str]
+    pdf_bytes: int
+    created_at: float
+    last_access: float
+
+    @property
+    def total_bytes(self) -> int:
+        return self.data_bytes + self.pdf_bytes
+
+
+class ReportRegistry:
+    """SQLite index of stored reports: id -> data and PDF file names, sizes,
+    creation and last-access times.
+
+    Lookups are primary-key reads, so finding a report never lists the
+    output directory. One connection is shared behind a lock; the database
+    runs in WAL mode so readers in other processes are not blocked. The
+    total size is kept as a running sum, updated by this process's writes;
+    ``refresh_total`` recounts it to pick up other processes' writes.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._total_bytes = 0
+        self.refresh_total()
+
+    def add(self, report_id: str, data_path: str, data_bytes: int, created_at: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO reports (id, data_path, data_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (report_id, data_path, data_bytes, created_at or now, now),
+            )
+            if cursor.rowcount:
+                self._total_bytes += data_bytes
+
+    def get(self, report_id: str) -> Optional[ReportRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, data_path, data_bytes, pdf_path, pdf_bytes, created_at, last_access "
+                "FROM reports WHERE id = ?",
+                (report_id,),
+            ).fetchone()
+        return ReportRecord(*row) if row else None
+
+    def set_pdf(self, report_id: str, pdf_path: Optional[str], pdf_bytes: int = 0) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT pdf_bytes FROM reports WHERE id = ?", (report_id,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute(
+                "UPDATE reports SET pdf_path = ?, pdf_bytes = ? WHERE id = ?",
+                (pdf_path, pdf_bytes, report_id),
+            )
+            self._total_bytes += pdf_bytes - row[0]
+
+    def touch(self, report_id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE reports SET last_access = ? WHERE id = ?", (time.time(), report_id))
+
+    def remove(self, report_id: str) -> None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data_bytes + pdf_bytes FROM reports WHERE id = ?", (report_id,)
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+            self._total_bytes -= row[0]
+
+    def older_than(self, cutoff: float) -> List[ReportRecord]:
+        return self._select("WHERE created_at < ? ORDER BY created_at", (cutoff,))
+
+    def least_recently_used(self, with_pdf: bool = False) -> List[ReportRecord]:
+        where = "WHERE pdf_path IS NOT NULL " if with_pdf else ""
+        return self._select(where + "ORDER BY last_access", ())
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def refresh_total(self) -> int:
+        """Recount the total size from the table (a full scan)."""
+        with self._lock:
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(data_bytes + pdf_bytes), 0) FROM reports"
+            ).fetchone()[0]
+            return self._total_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, pdfs, total = self._conn.execute(
+                "SELECT COUNT(*), COUNT(pdf_path), COALESCE(SUM(data_bytes + pdf_bytes), 0) FROM reports"
+            ).fetchone()
+        return {"reports": count, "pdfs": pdfs, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _select(self, clause: str, params: tuple) -> List[ReportRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data_path, data_bytes, pdf_path, pdf_bytes, created_at, last_access "
+                f"FROM reports {clause}",
+                params,
+            ).fetchall()
+        return [ReportRecord(*row) for row in rows]
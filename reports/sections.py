@@ -0,0 +1,249 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from reportlab.lib.styles import StyleSheet1
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph, Spacer
+
+from contracts.results import compared_drugs
+from reports.templates import create_data_table, format_currency, format_percentage
+
+
+# A section renderer turns one agent's ``data`` into the flowables of its
+# report section.
+SectionRenderer = Callable[[Dict[str, Any], StyleSheet1], List[Flowable]]
+
+# Headline metrics of one drug's ``data`` as [label, value] rows; shared by
+# the single-drug section and the side-by-side comparison table.
+MetricRows = Callable[[Dict[str, Any]], List[List[str]]]
+
+# agent name -> renderer, in the order sections appear in the report
+SECTIONS: Dict[str, SectionRenderer] = {}
+
+# agent name -> (section title, metric rows)
+METRICS: Dict[str, Tuple[str, MetricRows]] = {}
+
+METRIC_COLUMNS = [2.5 * inch, 2.5 * inch]
+
+# Comparison tables: a metric column, then the drugs sharing the rest
+COMPARISON_WIDTH = 6.5 * inch
+COMPARISON_METRIC_COLUMN = 1.9 * inch
+MISSING = "\u2014"
+
+
+def register_section(agent: str) -> Callable[[SectionRenderer], SectionRenderer]:
+    """Register the report section for ``agent``'s results. Agents without a
+    registered section get a generic metric table (``render_generic``)."""
+
+    def decorator(renderer: SectionRenderer) -> SectionRenderer:
+        SECTIONS[agent] = renderer
+        return renderer
+
+    return decorator
+
+
+def register_metrics(agent: str, title: str) -> Callable[[MetricRows], MetricRows]:
+    """Register the headline metrics of ``agent``'s section, titled
+    ``title``. Comparisons show them with a column per drug."""
+
+    def decorator(rows: MetricRows) -> MetricRows:
+        METRICS[agent] = (title, rows)
+        return rows
+
+    return decorator
+
+
+def metric_table(title: str, rows: List[List[str]], styles: StyleSheet1) -> List[Flowable]:
+    return [
+        Paragraph(title, styles['SectionHeader']),
+        create_data_table([["Metric", "Value"], *rows], METRIC_COLUMNS),
+    ]
+
+
+def metric_section(agent: str, data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    title, rows = METRICS[agent]
+    return metric_table(title, rows(data), styles)
+
+
+@register_metrics("iqvia", "Market Intelligence (IQVIA)")
+def iqvia_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["Market Size", format_currency(data.get("market_size_usd", 0))],
+        ["Growth Rate (CAGR)", format_percentage(data.get("growth_rate_cagr", 0))],
+    ]
+
+
+@register_metrics("patent", "Patent Landscape")
+def patent_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["Active Patents", str(data.get("active_patents", 0))],
+        ["Competitor Filings", str(data.get("competitor_filings", 0))],
+        ["Exclusivity Window", f"{data.get('exclusivity_window_years', 0)} years"],
+    ]
+
+
+@register_metrics("clinical_trials", "Clinical Trials Overview")
+def clinical_trials_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["Total Trials", str(data.get("total_trials", 0))],
+        ["Completion Rate", format_percentage(data.get("completion_rate", 0))],
+        ["Competitive Trials", str(data.get("competitive_trials", 0))],
+    ]
+
+
+@register_metrics("exim", "Trade & EXIM Analysis")
+def exim_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["Import Volume", f"{data.get('import_volume_kg', 0):,} kg"],
+        ["Export Volume", f"{data.get('export_volume_kg', 0):,} kg"],
+        ["Tariff Impact", format_percentage(data.get("tariff_impact_pct", 0))],
+    ]
+
+
+@register_metrics("internal_knowledge", "Internal Analysis")
+def internal_knowledge_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["R&D Budget", format_currency(data.get("rd_budget_usd", 0))],
+        ["Manufacturing Capacity", f"{data.get('manufacturing_capacity_units_per_year', 0):,} units/year"],
+        ["2025 Revenue Forecast", format_currency(data.get("forecast_revenue_2025_usd", 0))],
+        ["Strategic Priority", data.get("strategic_priority", "N/A").upper()],
+    ]
+
+
+@register_metrics("web_intelligence", "Market Intelligence")
+def web_intelligence_metrics(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        ["Sentiment Score", f"{data.get('sentiment_score', 0):.2f}"],
+        ["News Mentions", str(data.get("news_mentions", 0))],
+    ]
+
+
+@register_section("iqvia")
+def render_iqvia(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    elements = metric_section("iqvia", data, styles)
+    elements.append(Spacer(1, 0.15 * inch))
+
+    competitors = data.get("competitor_share", {})
+    if competitors:
+        comp_data = [["Competitor", "Market Share"]]
+        for comp, share in competitors.items():
+            comp_data.append([comp, format_percentage(share)])
+        elements.append(create_data_table(comp_data, METRIC_COLUMNS))
+    elements.append(Spacer(1, 0.15 * inch))
+    return elements
+
+
+@register_section("patent")
+def render_patent(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    return metric_section("patent", data, styles) + [Spacer(1, 0.15 * inch)]
+
+
+@register_section("clinical_trials")
+def render_clinical_trials(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    elements = metric_section("clinical_trials", data, styles)
+    elements.append(Spacer(1, 0.1 * inch))
+
+    phase_dist = data.get("phase_distribution", {})
+    phase_data = [
+        ["Phase 1", "Phase 2", "Phase 3", "Phase 4"],
+        [
+            str(phase_dist.get("phase_1", 0)),
+            str(phase_dist.get("phase_2", 0)),
+            str(phase_dist.get("phase_3", 0)),
+            str(phase_dist.get("phase_4", 0))
+        ]
+    ]
+    elements.append(create_data_table(phase_data, [1.25 * inch] * 4))
+    elements.append(Spacer(1, 0.15 * inch))
+    return elements
+
+
+@register_section("exim")
+def render_exim(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    return metric_section("exim", data, styles) + [Spacer(1, 0.15 * inch)]
+
+
+@register_section("internal_knowledge")
+def render_internal_knowledge(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    return metric_section("internal_knowledge", data, styles) + [Spacer(1, 0.15 * inch)]
+
+
+@register_section("web_intelligence")
+def render_web_intelligence(data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    elements = metric_section("web_intelligence", data, styles)
+    elements.append(Spacer(1, 0.1 * inch))
+
+    regulatory = data.get("regulatory_updates", [])
+    if regulatory:
+        elements.append(Paragraph("Regulatory Updates:", styles['SubHeader']))
+        for update in regulatory:
+            elements.append(Paragraph(f"• {update}", styles['BulletText']))
+    elements.append(Spacer(1, 0.15 * inch))
+    return elements
+
+
+def scalar_rows(data: Dict[str, Any]) -> List[List[str]]:
+    return [
+        [key.replace("_", " ").title(), f"{value:,}" if isinstance(value, int) else str(value)]
+        for key, value in data.items()
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool)
+    ]
+
+
+def render_generic(agent: str, data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    """Fallback for agents without a registered section: their scalar fields
+    as a metric table."""
+    rows = scalar_rows(data)
+    if not rows:
+        return []
+    title = agent.replace("_", " ").title()
+    return metric_table(title, rows, styles) + [Spacer(1, 0.15 * inch)]
+
+
+def render_comparison(
+    agent: str,
+    drugs: Dict[str, Optional[Dict[str, Any]]],
+    styles: StyleSheet1,
+) -> List[Flowable]:
+    """One table for several drugs: a row per metric, a column per drug, and
+    a dash where the agent had nothing for a drug. Uses the agent's
+    registered metrics, or its scalar fields if it has none."""
+    title, rows = METRICS.get(agent, (agent.replace("_", " ").title(), scalar_rows))
+    columns: Dict[str, Dict[str, str]] = {
+        drug: dict((label, value) for label, value in rows(data))
+        for drug, data in drugs.items() if data is not None
+    }
+    labels: List[str] = []
+    for values in columns.values():
+        labels.extend(label for label in values if label not in labels)
+    if not labels:
+        return []
+    table = [["Metric", *drugs]]
+    for label in labels:
+        table.append([label, *(columns.get(drug, {}).get(label, MISSING) for drug in drugs)])
+    drug_column = (COMPARISON_WIDTH - COMPARISON_METRIC_COLUMN) / len(drugs)
+    return [
+        Paragraph(title, styles['SectionHeader']),
+        create_data_table(table, [COMPARISON_METRIC_COLUMN] + [drug_column] * len(drugs)),
+        Spacer(1, 0.15 * inch),
+    ]
+
+
+def render_agent(agent: str, data: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    drugs = compared_drugs(data)
+    if drugs is not None:
+        return render_comparison(agent, drugs, styles)
+    if agent in SECTIONS:
+        return SECTIONS[agent](data, styles)
+    return render_generic(agent, data, styles)
+
+
+def render_sections(worker_results: Dict[str, Any], styles: StyleSheet1) -> List[Flowable]:
+    """Sections for every agent in ``worker_results``: registered sections in
+    registry order, then any other agents. Results covering several drugs
+    are rendered as comparison tables."""
+    elements: List[Flowable] = []
+    order = [agent for agent in SECTIONS if agent in worker_results]
+    order += [agent for agent in worker_results if agent not in SECTIONS]
+    for agent in order:
+        elements.extend(render_agent(agent, worker_results[agent].get("data", {}), styles))
+    return elements
@@ -0,0 +1,273 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from contracts.fingerprint import content_hash, strip_volatile
+from contracts.results import AggregatedData, as_dict
+from reports.pool import pdf_pool
+from reports.registry import ReportRecord, ReportRegistry
+from telemetry import instrument
+
+
+OUTPUT_DIR = Path(__file__).parent.parent / "outputs"
+REPORTS_DIR = Path(os.environ.get("MEDNEXA_REPORTS_DIR", OUTPUT_DIR / "reports"))
+
+# Retention for outputs/reports: total size budget and maximum age (0 disables either)
+REPORTS_MAX_MB = float(os.environ.get("MEDNEXA_REPORTS_MAX_MB", "1024"))
+REPORTS_MAX_AGE_DAYS = float(os.environ.get("MEDNEXA_REPORTS_MAX_AGE_DAYS", "30"))
+# Seconds between sweeps for reports past their age (the size limit is checked on every write)
+REPORTS_SWEEP_INTERVAL = float(os.environ.get("MEDNEXA_REPORTS_SWEEP_INTERVAL", "60"))
+
+REPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ReportNotFoundError(KeyError):
+    """Raised when a report id is unknown (or malformed)."""
+
+
+class ReportStore:
+    """Reports saved by content hash and rendered to PDF on first download.
+
+    ``save`` writes the summary and aggregated data as JSON under the SHA-256
+    of their canonical encoding (timestamps ignored) and returns that hash as
+    the report id, so the same content always resolves to the same report and
+    the same PDF. ``render`` produces the PDF through the PDF process pool the
+    first time it is asked for and serves the file from then on; concurrent
+    first requests for one report render it once.
+
+    Every report is indexed in a ``ReportRegistry`` (SQLite, next to the
+    files), so lookups never list the directory. After each write the
+    retention policy runs: at most every ``sweep_interval`` seconds, reports
+    older than ``max_age_seconds`` are deleted; then, while the registry's
+    running total exceeds ``max_bytes``, least recently used PDFs are
+    dropped (they can be rendered again) and finally least recently used
+    reports.
+    """
+
+    def __init__(
+        self,
+        root: Path = REPORTS_DIR,
+        max_bytes: int = int(REPORTS_MAX_MB * 1024 * 1024),
+        max_age_seconds: float = REPORTS_MAX_AGE_DAYS * 86400,
+        sweep_interval: float = REPORTS_SWEEP_INTERVAL,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.sweep_interval = sweep_interval
+        self._swept_at = float("-inf")
+        self._lock = threading.Lock()
+        self._render_locks: Dict[str, threading.Lock] = {}
+        self._registry: Optional[ReportRegistry] = None
+        self.saved = 0
+        self.deduplicated = 0
+        self.rendered = 0
+        self.served_cached = 0
+        self.evicted = 0
+        self.evicted_pdfs = 0
+
+    @property
+    def registry(self) -> ReportRegistry:
+        registry = self._registry
+        if registry is not None:
+            return registry
+        with self._lock:
+            if self._registry is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                registry = ReportRegistry(self.root / "registry.sqlite3")
+                if registry.count() == 0:
+                    _reindex(registry, self.root)
+                self._registry = registry
+            return self._registry
+
+    @instrument("report", "save")
+    def save(self, summary: str, aggregated_data: Union[AggregatedData, Dict[str, Any]]) -> str:
+        content = {"summary": summary, "aggregated_data": strip_volatile(as_dict(aggregated_data))}
+        report_id = content_hash(content)
+        record = self.registry.get(report_id)
+        if record is not None and self._file(record.data_path).exists():
+            self.registry.touch(report_id)
+            with self._lock:
+                self.deduplicated += 1
+            return report_id
+        created_at = time.time()
+        data = json.dumps({**content, "created_at": created_at}, default=str).encode("utf-8")
+        path = self.data_path(report_id)
+        _write_atomic(path, data)
+        self.registry.add(report_id, path.name, len(data), created_at)
+        with self._lock:
+            self.saved += 1
+        self.enforce_retention(keep=report_id)
+        return report_id
+
+    def get(self, report_id: str) -> ReportRecord:
+        record = self.registry.get(_check_id(report_id))
+        if record is None:
+            raise ReportNotFoundError(report_id)
+        return record
+
+    def load(self, report_id: str) -> Dict[str, Any]:
+        record = self.get(report_id)
+        try:
+            with open(self._file(record.data_path), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Deleted behind our back; forget it
+            self.registry.remove(report_id)
+            raise ReportNotFoundError(report_id) from None
+
+    @instrument("report", "render")
+    def render(self, report_id: str) -> Path:
+        """Path of the report's PDF, rendering it first if needed."""
+        record = self.get(report_id)
+        if record.pdf_path and self._file(record.pdf_path).exists():
+            self.registry.touch(report_id)
+            with self._lock:
+                self.served_cached += 1
+            return self._file(record.pdf_path)
+        lock = self._render_lock(report_id)
+        try:
+            with lock:
+                record = self.get(report_id)
+                if record.pdf_path and self._file(record.pdf_path).exists():
+                    return self._file(record.pdf_path)
+                report = self.load(report_id)
+                pdf = self.pdf_path(report_id)
+                tmp = pdf.with_name(f"{pdf.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+                try:
+                    pdf_pool.render(report["summary"], report["aggregated_data"], str(tmp))
+                    os.replace(tmp, pdf)
+                finally:
+                    tmp.unlink(missing_ok=True)
+                self.registry.set_pdf(report_id, pdf.name, pdf.stat().st_size)
+                self.registry.touch(report_id)
+                with self._lock:
+                    self.rendered += 1
+                print(f"[ReportStore] Rendered {pdf.name}")
+        finally:
+            with self._lock:
+                if self._render_locks.get(report_id) is lock and not lock.locked():
+                    del self._render_locks[report_id]
+        self.enforce_retention(keep=report_id)
+        return pdf
+
+    def created_at(self, report_id: str) -> Optional[float]:
+        try:
+            return self.get(report_id).created_at
+        except ReportNotFoundError:
+            return None
+
+    def enforce_retention(self, keep: Optional[str] = None) -> List[str]:
+        """Apply the age and size limits; returns the ids of deleted reports.
+        ``keep`` (the report just saved or about to be served) is never evicted."""
+        registry = self.registry
+        evicted: List[str] = []
+        now = time.monotonic()
+        with self._lock:
+            sweep = now - self._swept_at >= self.sweep_interval
+            if sweep:
+                self._swept_at = now
+        if sweep:
+            # Also picks up reports other processes saved or deleted
+            registry.refresh_total()
+        if sweep and self.max_age_seconds > 0:
+            for record in registry.older_than(time.time() - self.max_age_seconds):
+                if record.id != keep:
+                    self._delete(record)
+                    evicted.append(record.id)
+        if self.max_bytes > 0:
+            total = registry.total_bytes()
+            if total > self.max_bytes:
+                for record in registry.least_recently_used(with_pdf=True):
+                    if total <= self.max_bytes:
+                        break
+                    if record.id == keep:
+                        continue
+                    self._unlink(record.pdf_path)
+                    registry.set_pdf(record.id, None)
+                    total -= record.pdf_bytes
+                    with self._lock:
+                        self.evicted_pdfs += 1
+            if total > self.max_bytes:
+                for record in registry.least_recently_used():
+                    if total <= self.max_bytes:
+                        break
+                    if record.id == keep:
+                        continue
+                    self._delete(record)
+                    evicted.append(record.id)
+                    total -= record.data_bytes
+        if evicted:
+            print(f"[ReportStore] Evicted {len(evicted)} reports")
+        return evicted
+
+    def data_path(self, report_id: str) -> Path:
+        return self.root / f"{_check_id(report_id)}.json"
+
+    def pdf_path(self, report_id: str) -> Path:
+        return self.root / f"{_check_id(report_id)}.pdf"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "saved": self.saved,
+                "deduplicated": self.deduplicated,
+                "rendered": self.rendered,
+                "served_cached": self.served_cached,
+                "evicted": self.evicted,
+                "evicted_pdfs": self.evicted_pdfs,
+            }
+        return {**counters, **self.registry.stats(), "max_bytes": self.max_bytes}
+
+    def _delete(self, record: ReportRecord) -> None:
+        self._unlink(record.pdf_path)
+        self._unlink(record.data_path)
+        self.registry.remove(record.id)
+        with self._lock:
+            self.evicted += 1
+
+    def _file(self, name: str) -> Path:
+        # The registry stores file names relative to the reports directory
+        return self.root / name
+
+    def _unlink(self, name: Optional[str]) -> None:
+        if name:
+            self._file(name).unlink(missing_ok=True)
+
+    def _render_lock(self, report_id: str) -> threading.Lock:
+        with self._lock:
+            return self._render_locks.setdefault(report_id, threading.Lock())
+
+
+def _check_id(report_id: str) -> str:
+    # Ids become file names, so nothing but a hash gets through
+    if not REPORT_ID_PATTERN.match(report_id or ""):
+        raise ReportNotFoundError(report_id)
+    return report_id
+
+
+def _reindex(registry: ReportRegistry, root: Path) -> None:
+    """Register reports already on disk (e.g. saved before the registry
+    existed). Runs once, when the registry is new."""
+    for path in root.glob("*.json"):
+        if not REPORT_ID_PATTERN.match(path.stem):
+            continue
+        st = path.stat()
+        registry.add(path.stem, path.name, st.st_size, st.st_mtime)
+        pdf = path.with_suffix(".pdf")
+        if pdf.exists():
+            registry.set_pdf(path.stem, pdf.name, pdf.stat().st_size)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+report_store = ReportStore()
@@ -1,10 +1,18 @@
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import functools
+from typing import List, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import Table, TableStyle
 
 
-def get_styles():
+@functools.lru_cache(maxsize=None)
+def get_styles() -> StyleSheet1:
+    """The report's paragraph styles, built once per process and shared by
+    every report (styles are only read while rendering)."""
     styles = getSampleStyleSheet()
-    
+
     styles.add(ParagraphStyle(
         name='ReportTitle',
         parent=styles['Heading1'],
@@ -13,7 +21,7 @@ def get_styles():
         alignment=TA_CENTER,
         textColor='#1a365d'
     ))
-    
+
     styles.add(ParagraphStyle(
         name='SectionHeader',
         parent=styles['Heading2'],
@@ -22,7 +30,7 @@ def get_styles():
         spaceAfter=10,
         textColor='#2c5282'
     ))
-    
+
     styles.add(ParagraphStyle(
         name='SubHeader',
         parent=styles['Heading3'],
@@ -31,7 +39,7 @@ def get_styles():
         spaceAfter=8,
         textColor='#4a5568'
     ))
-    
+
     styles.add(ParagraphStyle(
         name='ReportBody',
         parent=styles['Normal'],
@@ -40,7 +48,7 @@ def get_styles():
         alignment=TA_JUSTIFY,
         leading=14
     ))
-    
+
     styles.add(ParagraphStyle(
         name='BulletText',
         parent=styles['Normal'],
@@ -49,7 +57,7 @@ def get_styles():
         spaceAfter=4,
         leading=14
     ))
-    
+
     styles.add(ParagraphStyle(
         name='MetaInfo',
         parent=styles['Normal'],
@@ -57,5 +65,47 @@ def get_styles():
         textColor='#718096',
         alignment=TA_CENTER
     ))
-    
+
     return styles
+
+
+@functools.lru_cache(maxsize=None)
+def get_table_style() -> TableStyle:
+    """Style of every data table: a header row over striped body rows. Built
+    once; ``Table.setStyle`` copies the commands, so sharing it is safe."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f7fafc')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#1a202c')),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ])
+
+
+def create_data_table(data: list, col_widths: Optional[List[float]] = None) -> Table:
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(get_table_style())
+    return table
+
+
+def format_currency(value: int) -> str:
+    if value >= 1_000_000_000:
+        return f"${value / 1_000_000_000:.2f}B"
+    elif value >= 1_000_000:
+        return f"${value / 1_000_000:.2f}M"
+    else:
+        return f"${value:,}"
+
+
+def format_percentage(value: float) -> str:
+    return f"{value * 100:.1f}%"
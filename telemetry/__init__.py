@@ -0,0 +1,39 @@
+# Telemetry package
+from telemetry.metrics import (
+    METRICS_ENABLED,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    Sample,
+    instrument,
+    metrics,
+    track,
+)
+from telemetry.trace import (
+    TRACE_HEADER,
+    accept_trace_id,
+    get_trace_id,
+    new_trace_id,
+    reset_trace_id,
+    set_trace_id,
+)
+
+
+__all__ = [
+    "METRICS_ENABLED",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "Sample",
+    "instrument",
+    "metrics",
+    "track",
+    "TRACE_HEADER",
+    "accept_trace_id",
+    "get_trace_id",
+    "new_trace_id",
+    "reset_trace_id",
+    "set_trace_id",
+]
@@ -0,0 +1,67 @@
+from typing import Iterator
+
+from telemetry.metrics import Sample, metrics
+
+
+# Collectors read the statistics components already keep, at scrape time
+# only, so caches and stores pay nothing extra for being observable.
+
+
+def dataset_samples() -> Iterator[Sample]:
+    from datastore import get_store
+
+    for name, stats in get_store().stats().items():
+        labels = {"dataset": name}
+        yield Sample("mednexa_dataset_cache_hits_total", "counter", "Dataset reads served from memory.", labels, stats["hits"])
+        yield Sample("mednexa_dataset_cache_misses_total", "counter", "Dataset reads that had to (re)load the file.", labels, stats["misses"])
+        yield Sample("mednexa_dataset_load_seconds_total", "counter", "Time spent loading the dataset file.", labels, stats["load_seconds_total"])
+        yield Sample("mednexa_dataset_resident_bytes", "gauge", "Estimated memory held by the parsed dataset.", labels, stats["size_bytes"])
+
+
+def summary_cache_samples() -> Iterator[Sample]:
+    from llm import summary_cache
+    from llm.prompt import prompt_stats
+
+    stats = summary_cache.stats()
+    for tier in ("memory", "disk"):
+        yield Sample("mednexa_summary_cache_hits_total", "counter", "Summaries served from the cache.", {"tier": tier}, stats[f"{tier}_hits"])
+    yield Sample("mednexa_summary_cache_misses_total", "counter", "Summary cache lookups that missed.", {}, stats["misses"])
+    yield Sample("mednexa_summary_cache_entries", "gauge", "Summaries held in memory.", {}, stats["entries"])
+    yield Sample("mednexa_summary_cache_disk_entries", "gauge", "Summary files on disk as of the last sweep plus writes since.", {}, stats["disk_entries"])
+    yield Sample("mednexa_summary_cache_disk_evictions_total", "counter", "Expired or excess summary files deleted from disk.", {}, stats["disk_evictions"])
+
+    prompts = prompt_stats.snapshot()
+    yield Sample("mednexa_prompts_total", "counter", "Prompts built for the LLM.", {}, prompts["count"])
+    yield Sample("mednexa_prompt_tokens_estimated_total", "counter", "Estimated tokens across all prompts.", {}, prompts["total_tokens_est"])
+
+
+def response_cache_samples() -> Iterator[Sample]:
+    from orchestration.response_cache import response_cache
+
+    stats = response_cache.stats()
+    yield Sample("mednexa_response_cache_hits_total", "counter", "Queries answered from a cached response.", {}, stats["hits"])
+    yield Sample("mednexa_response_cache_coalesced_total", "counter", "Queries that waited for an identical query already running.", {}, stats["coalesced"])
+    yield Sample("mednexa_response_cache_misses_total", "counter", "Queries that ran the workflow.", {}, stats["misses"])
+    yield Sample("mednexa_response_cache_evictions_total", "counter", "Responses evicted to stay within the size bound.", {}, stats["evictions"])
+    yield Sample("mednexa_response_cache_entries", "gauge", "Responses held in the cache.", {}, stats["entries"])
+
+
+def report_samples() -> Iterator[Sample]:
+    from reports.pool import pdf_pool
+    from reports.store import report_store
+
+    stats = report_store.stats()
+    yield Sample("mednexa_reports_saved_total", "counter", "Reports written to the report store.", {}, stats["saved"])
+    yield Sample("mednexa_reports_deduplicated_total", "counter", "Saves that matched an existing report.", {}, stats["deduplicated"])
+    yield Sample("mednexa_report_pdfs_rendered_total", "counter", "Report PDFs rendered.", {}, stats["rendered"])
+    yield Sample("mednexa_report_pdfs_served_cached_total", "counter", "PDF downloads served from an already rendered file.", {}, stats["served_cached"])
+    yield Sample("mednexa_reports_stored", "gauge", "Reports in the report store.", {}, stats["reports"])
+    yield Sample("mednexa_reports_stored_bytes", "gauge", "Disk used by saved reports and PDFs.", {}, stats["bytes"])
+
+    pool = pdf_pool.stats()
+    yield Sample("mednexa_pdf_pool_workers", "gauge", "PDF render processes (0 renders inline).", {}, pool["workers"])
+
+
+def register_default_collectors() -> None:
+    for collector in (dataset_samples, summary_cache_samples, response_cache_samples, report_samples):
+        metrics.register_collector(collector)
@@ -0,0 +1,63 @@
+import time
+
+from telemetry.metrics import METRICS_ENABLED, metrics
+from telemetry.trace import TRACE_HEADER, accept_trace_id, reset_trace_id, set_trace_id
+
+
+HTTP_SECONDS = metrics.histogram(
+    "mednexa_http_request_seconds",
+    "HTTP request latency until the response body is complete, by route template.",
+    ("method", "route", "status"),
+)
+
+_TRACE_HEADER_BYTES = TRACE_HEADER.lower().encode("latin-1")
+
+
+class TraceMiddleware:
+    """ASGI middleware giving every request a trace id and timing it.
+
+    A well-formed incoming ``X-Trace-Id`` is kept, otherwise a new id is
+    generated; either way it is the current trace id while the request is
+    handled (and in any job it submits) and is returned in the response's
+    ``X-Trace-Id`` header. Requests are timed by route template, not raw
+    path, so ids in URLs don't create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == _TRACE_HEADER_BYTES:
+                incoming = value.decode("latin-1")
+                break
+        trace_id = accept_trace_id(incoming)
+        trace_header = (_TRACE_HEADER_BYTES, trace_id.encode("latin-1"))
+        status = 500
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", ()), trace_header]
+            await send(message)
+
+        token = set_trace_id(trace_id)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            reset_trace_id(token)
+            if METRICS_ENABLED:
+                route = scope.get("route")
+                HTTP_SECONDS.observe(
+                    time.perf_counter() - start,
+                    method=scope["method"],
+                    route=getattr(route, "path", "unmatched"),
+                    status=status,
+                )
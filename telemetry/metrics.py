@@ -0,0 +1,391 @@
+import bisect
+import contextlib
+import functools
+import inspect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# Set MEDNEXA_METRICS=0 to skip instrumentation entirely (wrappers are not installed)
+METRICS_ENABLED = os.environ.get("MEDNEXA_METRICS", "1") != "0"
+
+# Latency buckets in seconds: sub-millisecond lookups up to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class Sample(NamedTuple):
+    """One value produced by a collector at scrape time."""
+    name: str
+    kind: str  # "counter" or "gauge"
+    help: str
+    labels: Dict[str, str]
+    value: float
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: Any) -> Any:
+        """The series for these label values. Hot paths bind it once and
+        update it directly, skipping the label lookup."""
+        return self._get(labels)
+
+    def shared_series(self, lock: threading.Lock, **labels: Any) -> Any:
+        """The series for these label values, guarded by ``lock`` instead of
+        a lock of its own, for callers updating series of several metrics in
+        one critical section. The series must not exist yet, or must have
+        been created with the same ``lock``."""
+        series = self._get(labels, lock)
+        if series._lock is not lock:
+            raise ValueError(f"{self.name} series {labels} already has its own lock")
+        return series
+
+    def _get(self, labels: Dict[str, Any], lock: Optional[threading.Lock] = None) -> Any:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = self._new_series(lock)
+        return series
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def _items(self) -> List[Tuple[LabelValues, Any]]:
+        with self._lock:
+            return sorted(self._series.items(), key=lambda item: item[0])
+
+    def _new_series(self, lock: Optional[threading.Lock] = None) -> Any:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: Optional[threading.Lock] = None):
+        self.value = 0.0
+        self._lock = lock or threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self.labels(**labels).inc(amount)
+
+    def value(self, **labels: Any) -> float:
+        return self.labels(**labels).value
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(series.value)}" for key, series in self._items()
+        ]
+
+    def _new_series(self, lock: Optional[threading.Lock] = None) -> _Value:
+        return _Value(lock)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self.labels(**labels).set(value)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.labels(**labels).dec(amount)
+
+
+class _HistogramSeries:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: Optional[threading.Lock] = None):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # +Inf last
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock or threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self.labels(**labels).observe(value)
+
+    def count(self, **labels: Any) -> int:
+        return self.labels(**labels).count
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bucket_names = self.labelnames + ("le",)
+        bounds = self.buckets + (float("inf"),)
+        for key, series in self._items():
+            counts, total, count = series.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(bucket_names, key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def _new_series(self, lock: Optional[threading.Lock] = None) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets, lock)
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors and renders them in the
+    Prometheus text exposition format.
+
+    Recording is an in-memory update under a per-metric lock; all formatting
+    happens in ``render``, so nothing is paid for metrics until they are
+    scraped. Collectors are callables returning ``Sample``s, for numbers that
+    components already keep (cache and store statistics) and that would be
+    wasteful to count twice.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        # Group collected samples by metric name so each gets one HELP/TYPE
+        collected: Dict[str, List[Sample]] = {}
+        for collector in collectors:
+            try:
+                for sample in collector():
+                    collected.setdefault(sample.name, []).append(sample)
+            except Exception as e:
+                print(f"[Metrics] Collector {getattr(collector, '__name__', collector)} failed: {e}")
+        for name, samples in collected.items():
+            lines.append(f"# HELP {name} {samples[0].help}")
+            lines.append(f"# TYPE {name} {samples[0].kind}")
+            for sample in samples:
+                labelnames = tuple(sample.labels)
+                lines.append(f"{name}{_labels(labelnames, tuple(sample.labels.values()))} {_number(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+OPERATION_SECONDS = metrics.histogram(
+    "mednexa_operation_seconds",
+    "Latency of instrumented operations (graph nodes, agents, LLM, reports).",
+    ("kind", "name"),
+)
+OPERATION_ERRORS = metrics.counter(
+    "mednexa_operation_errors_total",
+    "Instrumented operations that raised.",
+    ("kind", "name"),
+)
+IN_FLIGHT = metrics.gauge(
+    "mednexa_operations_in_flight",
+    "Instrumented operations currently running.",
+    ("kind", "name"),
+)
+
+
+class _Operation:
+    """The series of one ``kind``/``name`` operation, bound once and created
+    with one shared lock so a call costs two lock round-trips: one to enter,
+    one to record the outcome. Get it from ``_operation``, which keeps one
+    per ``kind``/``name``."""
+    __slots__ = ("seconds", "errors", "in_flight", "lock")
+
+    def __init__(self, kind: str, name: str):
+        self.lock = threading.Lock()
+        self.seconds = OPERATION_SECONDS.shared_series(self.lock, kind=kind, name=name)
+        self.errors = OPERATION_ERRORS.shared_series(self.lock, kind=kind, name=name)
+        self.in_flight = IN_FLIGHT.shared_series(self.lock, kind=kind, name=name)
+
+    def enter(self) -> None:
+        with self.lock:
+            self.in_flight.value += 1
+
+    def exit(self, elapsed: float, failed: bool) -> None:
+        seconds = self.seconds
+        index = bisect.bisect_left(seconds.buckets, elapsed)
+        with self.lock:
+            seconds.counts[index] += 1
+            seconds.sum += elapsed
+            seconds.count += 1
+            self.in_flight.value -= 1
+            if failed:
+                self.errors.value += 1
+
+
+_operations: Dict[Tuple[str, str], _Operation] = {}
+_operations_lock = threading.Lock()
+
+
+def _operation(kind: str, name: str) -> _Operation:
+    op = _operations.get((kind, name))
+    if op is None:
+        with _operations_lock:
+            op = _operations.get((kind, name))
+            if op is None:
+                op = _operations[(kind, name)] = _Operation(kind, name)
+    return op
+
+
+@contextlib.contextmanager
+def track(kind: str, name: str) -> Iterator[None]:
+    """Time a block as one ``kind``/``name`` operation."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    op = _operation(kind, name)
+    op.enter()
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        op.exit(time.perf_counter() - start, failed)
+
+
+def instrument(kind: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording latency, errors and in-flight count of every call.
+
+    Generator functions are timed from the first ``next`` until they finish,
+    so a streamed summary counts as one operation; coroutine functions from
+    when the coroutine starts until it returns. With metrics disabled the
+    function is returned unwrapped.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return fn
+        op = _operation(kind, name or fn.__name__)
+        perf_counter = time.perf_counter
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                op.enter()
+                start = perf_counter()
+                failed = True
+                try:
+                    result = yield from fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    op.exit(perf_counter() - start, failed)
+            return generator_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def coroutine_wrapper(*args, **kwargs):
+                op.enter()
+                start = perf_counter()
+                failed = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    op.exit(perf_counter() - start, failed)
+            return coroutine_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            op.enter()
+            start = perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                op.exit(perf_counter() - start, failed)
+        return wrapper
+
+    return decorator
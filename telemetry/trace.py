@@ -0,0 +1,36 @@
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+
+TRACE_HEADER = "X-Trace-Id"
+
+# Incoming ids are echoed back in headers and logs, so only simple tokens are accepted
+TRACE_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("mednexa_trace_id", default=None)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def accept_trace_id(value: Optional[str]) -> str:
+    """The caller's trace id if it is well-formed, else a new one."""
+    if value and TRACE_ID_PATTERN.match(value):
+        return value
+    return new_trace_id()
+
+
+def get_trace_id() -> Optional[str]:
+    return _trace_id.get()
+
+
+def set_trace_id(trace_id: Optional[str]):
+    """Set the current trace id; returns a token for ``reset_trace_id``."""
+    return _trace_id.set(trace_id)
+
+
+def reset_trace_id(token) -> None:
+    _trace_id.reset(token)